@@ -5,13 +5,13 @@ from dotenv import load_dotenv
 import os
 from difflib import SequenceMatcher
 from rapidfuzz import fuzz
-from sentence_transformers import SentenceTransformer, util
+from backend.utils.model_registry import get_sentence_transformer
+from backend.utils import circuit_breaker, http_client
 
 # Load environment variables
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 ENV_PATH = os.path.join(BASE_DIR, ".env")
 load_dotenv(ENV_PATH)
-model = SentenceTransformer('all-MiniLM-L6-v2')
 
 # Get your SerpAPI key from https://serpapi.com/dashboard
 SERPAPI_KEY = os.getenv("SERPAPI_KEY")
@@ -27,8 +27,12 @@ REQUEST_HEADERS = {
                   "Chrome/91.0.4472.124 Safari/537.36"
 }
 
+def _as_soup(html):
+    # Accept either raw HTML or an already parsed tree (e.g. PageDocument.soup)
+    return html if isinstance(html, BeautifulSoup) else BeautifulSoup(html, "html.parser")
+
 def get_page_title(html):
-    soup = BeautifulSoup(html, "html.parser")
+    soup = _as_soup(html)
     og_title = soup.find("meta", property="og:title")
     if og_title and og_title.get("content"):
         return og_title["content"]
@@ -39,6 +43,8 @@ def get_page_title(html):
 
 def titles_similar(title1, title2):
     # Semantic similarity
+    from sentence_transformers import util
+    model = get_sentence_transformer('all-MiniLM-L6-v2')
     emb1 = model.encode(title1, convert_to_tensor=True)
     emb2 = model.encode(title2, convert_to_tensor=True)
     semantic_score = util.cos_sim(emb1, emb2).item()  # 0–1
@@ -52,16 +58,14 @@ def titles_similar(title1, title2):
 
 def download_page(url):
     try:
-        response = requests.get(url, headers=REQUEST_HEADERS, timeout=10)
-        response.raise_for_status()
-        return response.text
+        return http_client.fetch_page(url, headers=REQUEST_HEADERS, timeout=10).text
     except Exception as e:
         print(f"❌ Error downloading page: {e}")
         return None
 
 
 def extract_images(html, base_url):
-    soup = BeautifulSoup(html, "html.parser")
+    soup = _as_soup(html)
     
     # 1. Check og:image first (most reliable for news)
     og_img = soup.find("meta", property="og:image")
@@ -95,7 +99,7 @@ def true_reverse_image_search(image_url):
             'api_key': SERPAPI_KEY
         }
         print("⏳ Waiting for reverse search results...")
-        response = requests.get(api_url, params=params, timeout=30)
+        response = http_client.get(api_url, params=params, timeout=30, provider="serpapi", operation="reverse_image")
         response.raise_for_status()
         results = response.json()
         search_results = []
@@ -200,13 +204,21 @@ def analyze_results(results, original_title, threshold=0.4):
 #         print(f"\n🖼️ Running reverse search for image {idx}/{len(images)}: {image_url}")
 #         results = true_reverse_image_search(image_url)
 #         analyze_results(results, original_title)
-def verify_news(url):
+def verify_news(url, document=None):
+    """
+    Reverse-image-search the article's main images. Pass a PageDocument to
+    reuse the page already downloaded and parsed by the caller.
+    """
     print(f"🔍 Verifying news with TRUE reverse image search")
     print(f"📄 Article URL: {url}")
     print("-" * 60)
-    html = download_page(url)
-    if not html:
-        return {"status": "error", "reason": "Failed to download page"}
+    if document is not None:
+        html = document.soup
+    else:
+        html = download_page(url)
+        if not html:
+            return {"status": "error", "reason": "Failed to download page"}
+        html = _as_soup(html)
 
     images = extract_images(html, url)
     if not images:
@@ -223,9 +235,11 @@ def verify_news(url):
         print(f"\n🖼️ Running reverse search for image {idx}/{len(images)}: {image_url}")
         results = true_reverse_image_search(image_url)
         if not results:
+            # An empty list from an unconfigured or tripped SerpAPI says nothing about the image
+            degraded = not SERPAPI_KEY or circuit_breaker.is_open("serpapi")
             all_results.append({
                 "image_url": image_url,
-                "status": "no_matches"
+                "status": "degraded" if degraded else "no_matches"
             })
             continue
 
@@ -750,7 +750,6 @@
 import os
 import re
 import json
-import requests
 from urllib.parse import quote
 import whois
 import tldextract
@@ -760,6 +759,8 @@ from dotenv import load_dotenv
 from typing import Optional
 import logging
 from backend.agents.domain_age import calculate_domain_credibility
+from backend.utils import http_client
+from backend.utils.circuit_breaker import CircuitOpen
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 ENV_PATH = os.path.join(BASE_DIR, ".env")
@@ -855,7 +856,7 @@ def _gnews_presence(domain: str):
     try:
         API_KEY = os.getenv("SERPER_API_KEY")
         if not API_KEY:
-            return {"ok": False, "error": "SERPER_API_KEY not set"}
+            return {"ok": False, "error": "SERPER_API_KEY not set", "degraded": True}
             
         headers = {
             'X-API-KEY': API_KEY,
@@ -867,11 +868,12 @@ def _gnews_presence(domain: str):
             "num": 10
         }
         
-        resp = requests.post(
+        resp = http_client.post(
             "https://google.serper.dev/search",
             headers=headers,
             json=data,
-            timeout=10
+            timeout=10,
+            provider="serper", operation="search"
         )
         
         if resp.status_code != 200:
@@ -881,7 +883,7 @@ def _gnews_presence(domain: str):
         present = len(results) > 0
         return {"ok": True, "present": present, "results_count": len(results)}
     except Exception as e:
-        return {"ok": False, "error": str(e)}
+        return {"ok": False, "error": str(e), "degraded": isinstance(e, CircuitOpen)}
 
 # -------------------------------
 # 2. NewsData.io presence
@@ -890,14 +892,15 @@ def _newsdata_presence(domain: str):
     try:
         API_KEY = os.getenv("NEWSDATA_API_KEY")
         if not API_KEY:
-            return {"ok": False, "error": "NEWSDATA_API_KEY not set"}
+            return {"ok": False, "error": "NEWSDATA_API_KEY not set", "degraded": True}
             
         # Clean the domain
         clean_domain = domain.replace("https://", "").replace("http://", "").split("/")[0]
         
-        resp = requests.get(
+        resp = http_client.get(
             f"https://newsdata.io/api/1/news?apikey={API_KEY}&domain={clean_domain}&size=10",
-            timeout=10
+            timeout=10,
+            provider="newsdata", operation="domain_news"
         )
         
         if resp.status_code != 200:
@@ -907,7 +910,7 @@ def _newsdata_presence(domain: str):
         present = len(results) > 0
         return {"ok": True, "present": present, "articles_found": len(results)}
     except Exception as e:
-        return {"ok": False, "error": str(e)}
+        return {"ok": False, "error": str(e), "degraded": isinstance(e, CircuitOpen)}
 
 # -------------------------------
 # 3. Google Fact Check
@@ -916,7 +919,7 @@ def _google_fact_check_presence(query: str):
     try:
         API_KEY = os.getenv("GOOGLE_FC_API_KEY")
         if not API_KEY:
-            return {"ok": False, "error": "GOOGLE_FC_API_KEY not set"}
+            return {"ok": False, "error": "GOOGLE_FC_API_KEY not set", "degraded": True}
 
         all_claims = []
         page_token = None
@@ -927,7 +930,7 @@ def _google_fact_check_presence(query: str):
             if page_token:
                 url += f"&pageToken={page_token}"
 
-            resp = requests.get(url, timeout=10)
+            resp = http_client.get(url, timeout=10, provider="google_factcheck", operation="claims_search")
             if resp.status_code != 200:
                 return {"ok": False, "error": resp.text}
 
@@ -959,7 +962,7 @@ def _google_fact_check_presence(query: str):
         return {"ok": True, "found": len(all_claims) > 0, "claims": all_claims}
 
     except Exception as e:
-        return {"ok": False, "error": str(e)}
+        return {"ok": False, "error": str(e), "degraded": isinstance(e, CircuitOpen)}
 
 # -------------------------------
 # Improved Fact Check Analysis
@@ -5,8 +5,8 @@ import json
 import logging
 from typing import Dict, List, Any, Tuple
 
-import google.generativeai as genai
 from google.api_core import exceptions as google_exceptions
+from backend.utils import llm_gateway
 from rich.table import Table
 
 # Use the central configuration from the project
@@ -27,7 +27,6 @@ class BiasAnalysisAgent:
         # API key check is now centralized in main.py
         self.content = content
         self.source_url = source_url
-        self.model = genai.GenerativeModel(LLM_FAST_MODEL)
         
         # --- SINGLE SOURCE OF TRUTH ---
         # This dictionary now defines the exact category names and their weights.
@@ -79,15 +78,13 @@ class BiasAnalysisAgent:
     def _call_llm(self, prompt: str) -> str | None:
         """Calls the Gemini API and handles potential errors gracefully."""
         try:
-            # Configure the model generation settings for Gemini
-            generation_config = genai.types.GenerationConfig(
-                temperature=0.1,
-                response_mime_type="application/json",
-            )
             # Generate content using the Gemini model
-            completion = self.model.generate_content(
+            completion = llm_gateway.generate(
                 prompt,
-                generation_config=generation_config
+                LLM_FAST_MODEL,
+                operation="bias.analysis",
+                temperature=0.1,
+                response_mime_type="application/json",
             )
             return completion.text
         except (google_exceptions.GoogleAPICallError, ValueError) as e:
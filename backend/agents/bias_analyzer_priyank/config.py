@@ -56,6 +56,8 @@ LLM_SMART_MODEL = 'models/gemini-2.5-pro'   # More capable for complex reasoning
 EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
 CHROMA_DB_PATH = "neutral_knowledge_base"
 COLLECTION_NAME = "neutral_articles"
+# The knowledge base persists across jobs in Chroma; "memory" keeps one per job instead
+VECTOR_STORE_BACKEND = os.getenv("BIAS_KB_VECTOR_STORE", "chroma")
 
 # --- Search Settings ---
 # These are new and required by the updated fetcher
@@ -1,20 +1,22 @@
 # agents/bias_analyzer_priyank/content_extractor.py
-import trafilatura
+from backend.utils import http_client
+from backend.utils.extraction import extract_text
 from .config import CONSOLE
 
 # The get_google_urls function has been removed from this file.
 
 def extract_content_from_url(url: str) -> str | None:
-    """Extracts the main text content from a URL using trafilatura."""
+    """Extracts the main text content from a URL using the shared extraction engine."""
     CONSOLE.print(f"--> [cyan]Extracting content from:[/cyan] {url}")
-    downloaded = trafilatura.fetch_url(url)
+    try:
+        downloaded = http_client.fetch_page(url).text
+    except Exception:
+        downloaded = None
     if downloaded is None:
         CONSOLE.print("[red]    Error: Could not retrieve webpage.[/red]")
         return None
     
-    text = trafilatura.extract(
-        downloaded, include_comments=False, include_tables=False, no_fallback=True
-    )
+    text = extract_text(downloaded, url)
     if text:
         CONSOLE.print("[green]    --> Successfully extracted content.[/green]")
         return text
@@ -1,14 +1,13 @@
 # agents/bias_analyzer_priyank/fact_checker.py
 import json
 from typing import List
-import google.generativeai as genai
 from google.api_core import exceptions as google_exceptions
+from backend.utils import llm_gateway
 from .config import CONSOLE, LLM_FAST_MODEL, LLM_SMART_MODEL
 
 def generate_misconceptions(biased_content: str) -> List[str]:
     """Uses an LLM to generate leading questions from biased content."""
     CONSOLE.print("[yellow]    Generating misconceptions from biased content...[/yellow]")
-    model = genai.GenerativeModel(LLM_FAST_MODEL)
     prompt = f"""
     You are a naive reader who trusts everything and reacts emotionally.
     After reading the following biased article, generate 2-3 leading questions or common misconceptions
@@ -20,11 +19,10 @@ def generate_misconceptions(biased_content: str) -> List[str]:
     ---
     """
     try:
-        generation_config = genai.types.GenerationConfig(
-            temperature=0.7,
-            response_mime_type="application/json",
+        completion = llm_gateway.generate(
+            prompt, LLM_FAST_MODEL, operation="bias.misconceptions",
+            temperature=0.7, response_mime_type="application/json",
         )
-        completion = model.generate_content(prompt, generation_config=generation_config)
         response = json.loads(completion.text)
         misconceptions = response.get("misconceptions", [])
         for q in misconceptions:
@@ -41,7 +39,6 @@ def generate_fact_check_report(misconception: str, neutral_chunks: List[str], so
         CONSOLE.print("[yellow]Warning: No neutral reporting available to fact-check this claim.[/yellow]")
         return
 
-    model = genai.GenerativeModel(LLM_SMART_MODEL)
     context = "\n\n---\n\n".join(neutral_chunks)
     prompt = f"""
     You are a fact-checker. Use the "Neutral Evidence" to address the "Misconception Question".
@@ -60,11 +57,10 @@ def generate_fact_check_report(misconception: str, neutral_chunks: List[str], so
     3.  "balanced_summary": A summary acknowledging complexity but stating what sources confirm.
     """
     try:
-        generation_config = genai.types.GenerationConfig(
-            temperature=0.2,
-            response_mime_type="application/json",
+        completion = llm_gateway.generate(
+            prompt, LLM_SMART_MODEL, operation="bias.fact_check_report",
+            temperature=0.2, response_mime_type="application/json",
         )
-        completion = model.generate_content(prompt, generation_config=generation_config)
         report = json.loads(completion.text)
 
         # Display User-Facing Output
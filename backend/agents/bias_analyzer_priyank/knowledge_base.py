@@ -1,19 +1,19 @@
 # agents/bias_analyzer_priyank/knowledge_base.py
 import hashlib
 from typing import List
-import chromadb
-from sentence_transformers import SentenceTransformer
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from .config import CONSOLE, CHROMA_DB_PATH, COLLECTION_NAME, EMBEDDING_MODEL_NAME
+from backend.utils.model_registry import get_sentence_transformer
+from backend.utils.vector_store import open_store
+from .config import CONSOLE, CHROMA_DB_PATH, COLLECTION_NAME, EMBEDDING_MODEL_NAME, VECTOR_STORE_BACKEND
 
 class KnowledgeBase:
-    """Manages the ChromaDB vector store for neutral articles."""
+    """Manages the vector store (ChromaDB or in-memory) for neutral articles."""
     def __init__(self):
-        self.client = chromadb.PersistentClient(path=CHROMA_DB_PATH)
-        self.collection = self.client.get_or_create_collection(name=COLLECTION_NAME)
+        self.collection = open_store(COLLECTION_NAME, VECTOR_STORE_BACKEND, path=CHROMA_DB_PATH)
         self.text_splitter = RecursiveCharacterTextSplitter(chunk_size=700, chunk_overlap=70)
-        self.embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
-        CONSOLE.print(f"[green]✅ Knowledge Base initialized at '{CHROMA_DB_PATH}'.[/green]")
+        self.embedding_model = get_sentence_transformer(EMBEDDING_MODEL_NAME)
+        location = CHROMA_DB_PATH if VECTOR_STORE_BACKEND == "chroma" else "memory"
+        CONSOLE.print(f"[green]✅ Knowledge Base initialized at '{location}'.[/green]")
 
     def add_document(self, content: str, source_url: str):
         """Chunks, embeds, and adds a neutral document to the collection."""
@@ -100,6 +100,7 @@ import time
 import re
 from typing import List, Optional
 from urllib.parse import quote
+from backend.utils import http_client
 from .config import CONSOLE, GNEWS_API_KEY, SERPER_API_KEY
 
 def get_urls_from_google_search(query: str, num_results: int = 5) -> List[str]:
@@ -153,7 +154,7 @@ def _search_serper_api(query: str, num_results: int) -> List[str]:
         'Content-Type': 'application/json'
     }
     
-    response = requests.post(url, json=payload, headers=headers, timeout=10)
+    response = http_client.post(url, json=payload, headers=headers, timeout=10, provider="serper", operation="search")
     response.raise_for_status()
     
     data = response.json()
@@ -183,7 +184,6 @@ def _search_google_direct(query: str, num_results: int) -> List[str]:
 
 def _search_duckduckgo(query: str, num_results: int) -> List[str]:
     """DuckDuckGo search as fallback."""
-    import requests
     from bs4 import BeautifulSoup
     
     headers = {
@@ -192,7 +192,7 @@ def _search_duckduckgo(query: str, num_results: int) -> List[str]:
     
     # Use DuckDuckGo Lite for simpler parsing
     url = f"https://lite.duckduckgo.com/lite/?q={quote(query)}"
-    response = requests.get(url, headers=headers, timeout=15)
+    response = http_client.get(url, headers=headers, timeout=15)
     response.raise_for_status()
     
     soup = BeautifulSoup(response.text, 'html.parser')
@@ -233,7 +233,7 @@ def get_urls_from_gnews(query: str, max_results: int = 5) -> List[str]:
         }
         
         CONSOLE.print(f"[blue]Searching GNews for: {clean_query}[/blue]")
-        response = requests.get(url, params=params, timeout=15)
+        response = http_client.get(url, params=params, timeout=15, provider="gnews", operation="search")
         
         if response.status_code != 200:
             error_msg = response.text
@@ -1,7 +1,7 @@
 # agents/bias_analyzer_priyank/query_enhancer.py
 import json
-import google.generativeai as genai
 from google.api_core import exceptions as google_exceptions
+from backend.utils import llm_gateway
 from .config import CONSOLE, LLM_FAST_MODEL
 
 def enhance_query(topic: str) -> str:
@@ -11,8 +11,6 @@ def enhance_query(topic: str) -> str:
     CONSOLE.print(f"\n[yellow]✨ Enhancing search query for:[/yellow] '{topic}'")
     
     # API key check is now centralized in main.py
-    model = genai.GenerativeModel(LLM_FAST_MODEL)
-    
     prompt = f"""
     You are a search engine expert. Your task is to convert a user's topic into an effective Google search query.
     The query should be neutral, specific, and aimed at finding high-quality news articles.
@@ -30,11 +28,10 @@ def enhance_query(topic: str) -> str:
     """
     
     try:
-        generation_config = genai.types.GenerationConfig(
-            temperature=0.2,
-            response_mime_type="application/json",
+        completion = llm_gateway.generate(
+            prompt, LLM_FAST_MODEL, operation="bias.query_enhancer",
+            temperature=0.2, response_mime_type="application/json",
         )
-        completion = model.generate_content(prompt, generation_config=generation_config)
         response = json.loads(completion.text)
         enhanced_query = response.get("search_query", topic)
         
@@ -1,9 +1,7 @@
 
 import json
-import google.generativeai as genai
 from typing import List, Dict, Any
-from datetime import datetime
-import requests
+from datetime import date, datetime
 from bs4 import BeautifulSoup
 import re
 import time
@@ -14,19 +12,29 @@ from backend.agents.bias_analyzer_priyank.news_fetcher import get_urls_from_goog
 from backend.agents.bias_analyzer_priyank.news_fetcher import enhanced_web_search
 
 from backend.agents.bias_analyzer_priyank.knowledge_base import KnowledgeBase
-from backend.agents.bias_analyzer_priyank.config import CONSOLE, GEMINI_API_KEY, LLM_FAST_MODEL, LLM_SMART_MODEL
+from backend.agents.bias_analyzer_priyank.config import CONSOLE, LLM_FAST_MODEL, LLM_SMART_MODEL
+from backend.utils.metrics import track_stage
+from backend.utils import llm_gateway
+from backend.utils import http_client
+from backend.utils import cassette
+from backend.utils.extraction import extract_text
 # requires: pip install diskcache
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import diskcache as dc
 CACHE = dc.Cache("./.cache_fetch", size_limit=2e9)  # 2 GB
 
+def _use_disk_cache() -> bool:
+    """Off while a cassette records or replays, so every download goes through it."""
+    return cassette.active() is None
+
+# parse_cached_html_to_text keeps 6000 characters, so stop downloading well past that
+ENOUGH_ARTICLE_TEXT = 12000
+
 def _fetch_one(url, timeout=8):
-    import requests
     try:
         headers = {"User-Agent":"FactSphereBot/1.0"}
-        r = requests.get(url, timeout=timeout, headers=headers)
-        r.raise_for_status()
-        return r.text
+        return http_client.fetch_page(url, headers=headers, timeout=timeout,
+                                      enough_text=ENOUGH_ARTICLE_TEXT).text
     except Exception as e:
         return None
 
@@ -41,12 +49,14 @@ def fetch_articles_parallel(urls: List[str], max_workers=8) -> Dict[str, str]:
                 results[url] = ""
                 continue
             # cache by url
-            key = "html::" + url
-            CACHE.set(key, html, expire=60*60*24)  # 24h
+            if _use_disk_cache():
+                CACHE.set("html::" + url, html, expire=60*60*24)  # 24h
             results[url] = html
     return results
 
 def get_cached_html(url):
+    if not _use_disk_cache():
+        return _fetch_one(url)
     key = "html::" + url
     html = CACHE.get(key)
     if html:
@@ -60,24 +70,14 @@ def parse_cached_html_to_text(html: str) -> str:
     Convert cached HTML into cleaned readable article text.
     """
     try:
-        soup = BeautifulSoup(html, "html.parser")
-
-        for tag in soup(["script", "style", "header", "footer", "nav", "aside"]):
-            tag.decompose()
-
-        paragraphs = [p.get_text().strip() for p in soup.find_all(["p", "div"])]
-        text = "\n".join([p for p in paragraphs if len(p) > 50])
+        # Same content hash -> same cached extraction, whichever agent asks first
+        text = extract_text(html)
 
         text = re.sub(r"\s+", " ", text).strip()
 
         return text[:6000]
     except:
         return ""
-# ============================
-# INIT GEMINI API
-# ============================
-genai.configure(api_key=GEMINI_API_KEY)
-
 # ============================
 # Enhanced Web Search Utilities
 # ============================
@@ -128,7 +128,7 @@ def search_duckduckgo(query: str, num_results: int = 5) -> List[str]:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         url = f"https://html.duckduckgo.com/html/?q={quote(query)}"
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url, headers=headers, timeout=10)
         soup = BeautifulSoup(response.text, 'html.parser')
         
         urls = []
@@ -182,57 +182,9 @@ def fetch_article_text(url: str) -> str:
             'Upgrade-Insecure-Requests': '1',
         }
         
-        response = requests.get(url, timeout=10, headers=headers)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        # Remove unwanted elements
-        for element in soup(["script", "style", "nav", "header", "footer", "aside", "form", "button"]):
-            element.decompose()
-            
-        # Try multiple content selectors in order of priority
-        content_selectors = [
-            "article",
-            ".article-content",
-            ".post-content", 
-            ".story-content",
-            ".entry-content",
-            "main",
-            "[role='main']",
-            ".content",
-            ".story__content",
-            ".article-body",
-            ".post-body",
-            "#content",
-            ".main-content",
-            ".news-content",
-            ".text-content"
-        ]
-        
-        content = None
-        for selector in content_selectors:
-            content_elements = soup.select(selector)
-            if content_elements:
-                # Take the largest content block
-                content = max(content_elements, key=lambda x: len(x.get_text()))
-                break
-                
-        if not content:
-            # Fallback: look for the largest text container
-            content = soup.find('body') or soup
-            
-        # Extract text from paragraphs and divs
-        text_elements = content.find_all(["p", "div", "section", "article"])
-        text_parts = []
-        
-        for element in text_elements:
-            text = element.get_text().strip()
-            # Filter out short, non-content text
-            if len(text) > 50 and not any(bad in text.lower() for bad in ['cookie', 'privacy', 'terms', 'login', 'sign up']):
-                text_parts.append(text)
+        page = http_client.fetch_page(url, headers=headers, timeout=10, enough_text=ENOUGH_ARTICLE_TEXT)
         
-        full_text = "\n".join(text_parts)
+        full_text = extract_text(page.text, page.url)
         
         # Clean up
         full_text = re.sub(r'\n+', '\n', full_text)
@@ -253,8 +205,8 @@ def extract_all_claims(input_text: str) -> Dict:
     """
     Extract ALL factual claims from the message, not just one.
     """
-    model = genai.GenerativeModel(LLM_FAST_MODEL)
-    current_date=datetime.now()
+    # Day resolution keeps the prompt (and its LLM cache/cassette key) stable; recordings pin the day
+    current_date = cassette.recorded_call("today", [], lambda: date.today().isoformat())
     prompt = f"""
     Extract ALL verifiable factual claims from this WhatsApp message.
     Analyze this WhatsApp message comprehensively and identify ALL factual claims that can be verified.CURRENT DATE IS {current_date}
@@ -286,7 +238,7 @@ def extract_all_claims(input_text: str) -> Dict:
     """
 
     try:
-        response = model.generate_content(prompt)
+        response = llm_gateway.generate(prompt, LLM_FAST_MODEL, operation="fact_check.extract_claims")
         return extract_json_from_text(response.text)
     except Exception as e:
         CONSOLE.print(f"[red]Claim extraction failed: {e}[/red]")
@@ -322,7 +274,6 @@ def agent_researcher(all_claims_data: Dict) -> List[Dict[str, Any]]:
     - Cached article content
     - LLM-based multi-claim evaluation
     """
-    model = genai.GenerativeModel(LLM_FAST_MODEL)
     
     individual_claims = all_claims_data.get("individual_claims", [])
 
@@ -402,7 +353,7 @@ def agent_researcher(all_claims_data: Dict) -> List[Dict[str, Any]]:
         """
 
         try:
-            res = model.generate_content(prompt)
+            res = llm_gateway.generate(prompt, LLM_FAST_MODEL, operation="fact_check.research")
             data = extract_json_from_text(res.text)
 
             # keep only useful evidence
@@ -435,7 +386,6 @@ def agent_skeptic(all_claims_data: Dict) -> List[Dict[str, Any]]:
     - Parallel article fetching + cache
     - Multi-claim LLM verification
     """
-    model = genai.GenerativeModel(LLM_FAST_MODEL)
 
     individual_claims = all_claims_data.get("individual_claims", [])
 
@@ -536,7 +486,7 @@ def agent_skeptic(all_claims_data: Dict) -> List[Dict[str, Any]]:
         """
 
         try:
-            res = model.generate_content(prompt)
+            res = llm_gateway.generate(prompt, LLM_FAST_MODEL, operation="fact_check.skeptic")
             data = extract_json_from_text(res.text)
 
             # Keep only articles with valid fact-checks
@@ -566,7 +516,6 @@ def agent_judge(all_claims_data: Dict, research: List[Dict], factchecks: List[Di
     """
     Smart judge that provides detailed, evidence-based analysis.
     """
-    model = genai.GenerativeModel(LLM_SMART_MODEL)
 
     prompt = f"""
     You are a professional fact-checker. Provide a COMPREHENSIVE analysis based on ALL evidence.
@@ -610,7 +559,7 @@ def agent_judge(all_claims_data: Dict, research: List[Dict], factchecks: List[Di
     """
 
     try:
-        response = model.generate_content(prompt)
+        response = llm_gateway.generate(prompt, LLM_SMART_MODEL, operation="fact_check.judge")
         return extract_json_from_text(response.text)
     except Exception as e:
         CONSOLE.print(f"[red]Judge analysis failed: {e}[/red]")
@@ -683,7 +632,8 @@ def fact_check_pipeline(raw_text: str) -> Dict:
 
     # Step 1 — Extract ALL claims
     CONSOLE.print("[blue]🔍 Step 1: Extracting ALL factual claims...[/blue]")
-    all_claims_data = extract_all_claims(raw_text)
+    with track_stage("fact_check", "extract_claims"):
+        all_claims_data = extract_all_claims(raw_text)
     individual_claims = all_claims_data.get("individual_claims", [])
     CONSOLE.print(f"[green]Found {len(individual_claims)} verifiable claims[/green]")
     for claim in individual_claims:
@@ -691,17 +641,20 @@ def fact_check_pipeline(raw_text: str) -> Dict:
 
     # Step 2 — Research ALL claims
     CONSOLE.print("\n[blue]🔍 Step 2: Researching ALL claims...[/blue]")
-    research = agent_researcher(all_claims_data)
+    with track_stage("fact_check", "research"):
+        research = agent_researcher(all_claims_data)
     CONSOLE.print(f"[green]Research complete: {len(research)} evidence items[/green]\n")
 
     # Step 3 — Fact-check ALL claims  
     CONSOLE.print("[blue]🔍 Step 3: Fact-checking ALL claims...[/blue]")
-    factchecks = agent_skeptic(all_claims_data)
+    with track_stage("fact_check", "skeptic"):
+        factchecks = agent_skeptic(all_claims_data)
     CONSOLE.print(f"[green]Fact-check complete: {len(factchecks)} items[/green]\n")
 
     # Step 4 — Comprehensive judge
     CONSOLE.print("[blue]⚖️ Step 4: Comprehensive analysis...[/blue]")
-    judge_result = agent_judge(all_claims_data, research, factchecks)
+    with track_stage("fact_check", "judge"):
+        judge_result = agent_judge(all_claims_data, research, factchecks)
 
     # Enhanced output display
     CONSOLE.print(f"\n[bold green]🎯 COMPREHENSIVE VERDICT: {judge_result.get('overall_verdict', 'UNKNOWN')}[/bold green]")
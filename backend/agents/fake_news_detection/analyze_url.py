@@ -3,19 +3,21 @@ import os
 import sys
 from urllib.parse import urlparse
 import requests
-from newspaper import Article
-import spacy
 from datetime import datetime, timedelta
 import time
 import numpy as np
 from collections import Counter
 import re
+from backend.utils.model_registry import get_spacy_model
+from backend.utils import http_client
+from backend.utils.extraction import extract
 
 # from text_utils import extract_claim_features, extract_contextual_keywords
 # from evidence_evaluator import EvidenceEvaluator, decide_label_with_confidence
 
-# Load spaCy model
-nlp = spacy.load("en_core_web_sm")
+# spaCy model is loaded lazily through the shared model registry
+def nlp(text):
+    return get_spacy_model("en_core_web_sm")(text)
 
 ALLOWLISTED_DOMAINS = [
     "nasa.gov", "who.int", "un.org", "dhs.gov", "reuters.com", "bbc.com", "bbc.co.uk",
@@ -41,8 +43,9 @@ class MultiLayerNewsVerifier:
     def load_models(self):
         """Load required models for analysis"""
         try:
-            from sentence_transformers import SentenceTransformer, util
-            self.sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
+            from sentence_transformers import util
+            from backend.utils.model_registry import get_sentence_transformer
+            self.sentence_model = get_sentence_transformer('all-MiniLM-L6-v2')
             self.util = util
             print("[INFO] Loaded sentence transformer model")
         except Exception as e:
@@ -259,7 +262,7 @@ class MultiLayerNewsVerifier:
         }
         
         try:
-            response = requests.get(self.base_url, params=params, timeout=15)
+            response = http_client.get(self.base_url, params=params, timeout=15, provider="gnews", operation="search")
             
             # Debug the actual URL being called
             print(f"[DEBUG] API URL: {response.url}")
@@ -269,7 +272,7 @@ class MultiLayerNewsVerifier:
                 # Try with a simpler query
                 simple_query = query.split()[0] if query else "news"
                 params["q"] = simple_query
-                response = requests.get(self.base_url, params=params, timeout=15)
+                response = http_client.get(self.base_url, params=params, timeout=15, provider="gnews", operation="search")
             
             response.raise_for_status()
             data = response.json()
@@ -314,7 +317,7 @@ class MultiLayerNewsVerifier:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            response = requests.get(search_url, params=params, headers=headers, timeout=15)
+            response = http_client.get(search_url, params=params, headers=headers, timeout=15)
             
             if response.status_code == 200:
                 from bs4 import BeautifulSoup
@@ -602,116 +605,43 @@ class MultiLayerNewsVerifier:
                 return True
         return False
 
-def extract_article_from_url(url):
-    """Extract article content from URL with better error handling"""
+def extract_article_from_url(url, document=None):
+    """
+    Extract article content from URL with better error handling.
+    If a PageDocument is given, its downloaded HTML and extraction are reused.
+    """
     print(f"[INFO] Attempting to extract content from: {url}")
     
-    # Method 1: Try newspaper3k
     try:
-        article = Article(url)
-        if hasattr(article, 'config'):
-            article.config.request_timeout = 20
-            article.config.browser_user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        
-        article.download()
-        
-        if article.html and len(article.html) > 1000:
-            article.parse()
-            
-            if article.title and article.text and len(article.text) > 100:
-                print(f"[SUCCESS] Extracted via newspaper3k: {len(article.text)} characters")
-                return {
-                    "title": article.title.strip(),
-                    "content": article.text.strip(),
-                    "authors": article.authors or [],
-                    "publish_date": str(article.publish_date) if article.publish_date else "",
-                    "url": url,
-                    "source": urlparse(url).netloc.lower(),
-                    "extraction_method": "newspaper3k"
-                }
+        if document is not None:
+            result = document.content
+        else:
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.9',
+            }
+            page = http_client.fetch_page(url, headers=headers, timeout=20)
+            # Shared engine: fastest backend first, newspaper3k/trafilatura only if that falls short
+            result = extract(page.text, page.url)
     except Exception as e:
-        print(f"[WARN] newspaper3k failed: {e}")
+        print(f"[WARN] Could not fetch article: {e}")
+        return None
     
-    # Method 2: BeautifulSoup fallback
-    try:
-        print("[INFO] Trying direct HTTP request with enhanced headers...")
-        
-        session = requests.Session()
-        session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Connection': 'keep-alive',
-        })
-        
-        response = session.get(url, timeout=20)
-        response.raise_for_status()
-        
-        if response.status_code == 200 and len(response.content) > 1000:
-            try:
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Remove unwanted elements
-                for element in soup(["script", "style", "nav", "footer", "header", "aside"]):
-                    element.decompose()
-                
-                # Extract title
-                title = ""
-                title_selectors = [
-                    'h1[data-testid="headline"]', 'h1.story-headline', 'h1', 
-                    '.headline', '.article-title', 'title'
-                ]
-                for selector in title_selectors:
-                    title_elem = soup.select_one(selector)
-                    if title_elem and title_elem.get_text().strip():
-                        title = title_elem.get_text().strip()
-                        break
-                
-                # Extract content
-                content = ""
-                content_selectors = [
-                    '[data-component="text-block"]', '[data-testid="ArticleBody"]',
-                    'article', '.article-body', '.story-body', '.post-content', 
-                    '.entry-content', '.content', 'main'
-                ]
-                
-                for selector in content_selectors:
-                    content_divs = soup.select(selector)
-                    if content_divs:
-                        content_texts = []
-                        for div in content_divs:
-                            text = div.get_text().strip()
-                            if text and len(text) > 20:
-                                content_texts.append(text)
-                        content = ' '.join(content_texts)
-                        if len(content) > 200:
-                            break
-                
-                # Fallback to paragraphs
-                if not content or len(content) < 200:
-                    paragraphs = soup.find_all('p')
-                    content = ' '.join([p.get_text().strip() for p in paragraphs 
-                                      if len(p.get_text().strip()) > 20])
-                
-                if title and content and len(content) > 200:
-                    print(f"[SUCCESS] Extracted via BeautifulSoup: {len(content)} characters")
-                    return {
-                        "title": title[:300],
-                        "content": content[:8000],
-                        "authors": [],
-                        "publish_date": "",
-                        "url": url,
-                        "source": urlparse(url).netloc.lower(),
-                        "extraction_method": "beautifulsoup"
-                    }
-                    
-            except ImportError:
-                print("[WARN] BeautifulSoup not available")
-                
-    except Exception as e:
-        print(f"[WARN] Direct request failed: {e}")
+    text = result.get("text", "")
+    if result.get("title") and len(text) > 100:
+        print(f"[SUCCESS] Extracted via {result.get('backend')}: {len(text)} characters")
+        return {
+            "title": result["title"][:300],
+            "content": text,
+            "authors": result.get("authors", []),
+            "publish_date": result.get("publish_date", ""),
+            "url": url,
+            "source": urlparse(url).netloc.lower(),
+            "extraction_method": result.get("backend", "")
+        }
     
+    print("[WARN] No usable article content extracted")
     return None
 
 # def cross_verify_news(url):
@@ -890,7 +820,7 @@ def extract_article_from_url(url):
 #         for contra in consensus_analysis['contradictions'][:2]:
 #             print(f"  • {contra['source']}: {contra['title'][:60]}...")
 
-def cross_verify_news(url):
+def cross_verify_news(url, document=None):
     result_log = []  # store all messages instead of printing
     
     try:
@@ -904,7 +834,7 @@ def cross_verify_news(url):
     verifier = MultiLayerNewsVerifier()
 
     # Step 1: Extract article
-    original_article = extract_article_from_url(url)
+    original_article = extract_article_from_url(url, document=document)
     if not original_article:
         return {"error": "Failed to extract article content."}
     
@@ -1,14 +1,12 @@
 import numpy as np
-from transformers import pipeline
-from sentence_transformers import SentenceTransformer, util
-import spacy
+from sentence_transformers import util
+from backend.utils.model_registry import get_sentence_transformer, get_hf_pipeline, get_spacy_model
 
 class EvidenceEvaluator:
     def __init__(self):
-        self.nli_model = pipeline("zero-shot-classification", 
-                                 model="facebook/bart-large-mnli")
-        self.sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.nlp = spacy.load("en_core_web_sm")
+        self.nli_model = get_hf_pipeline("zero-shot-classification", "facebook/bart-large-mnli")
+        self.sentence_model = get_sentence_transformer('all-MiniLM-L6-v2')
+        self.nlp = get_spacy_model("en_core_web_sm")
         
     def evaluate_claim_evidence_pair(self, claim, evidence_sentence, evidence_url="", evidence_source=""):
         """Comprehensive evaluation of claim against evidence"""
@@ -306,16 +306,18 @@
 
 
 
-import requests
 import os
 from dotenv import load_dotenv
-from newspaper import Article # newspaper3k
 import difflib
+from backend.utils import http_client
+from backend.utils.extraction import extract_text
 
 load_dotenv()
 
 GNEWS_API_KEY = os.getenv("GNEWS_API_KEY")
 BASE_URL = "https://gnews.io/api/v4/search"
+# Stop downloading a related article once this much paragraph text has arrived
+ENOUGH_ARTICLE_TEXT = 20000
 
 
 def _safe(val, default=""):
@@ -324,15 +326,13 @@ def _safe(val, default=""):
 
 def _fetch_full_text(url, timeout=10):
     """
-    Try to download and parse full article text using newspaper3k.
+    Try to download and extract full article text with the shared extraction engine.
     If it fails, return empty string.
     """
     try:
-        art = Article(url)
-        art.download()
-        art.parse()
-        text = art.text or ""
-        return text.strip()
+        # Streamed and size-capped through the shared client
+        page = http_client.fetch_page(url, timeout=timeout, enough_text=ENOUGH_ARTICLE_TEXT)
+        return extract_text(page.text, page.url)
     except Exception:
         # silent fail - return empty string, caller can use headline/description fallback
         return ""
@@ -396,7 +396,7 @@ def fetch_news_for_claim(keywords, title=None, input_url=None, max_results=50, t
         }
         print(f"[INFO] Fetching news for query: {q}")
         try:
-            resp = requests.get(BASE_URL, params=params, timeout=12)
+            resp = http_client.get(BASE_URL, params=params, timeout=12, provider="gnews", operation="search")
             resp.raise_for_status()
             data = resp.json()
             articles = data.get("articles", []) or []
@@ -2,18 +2,30 @@
 #agents/fake-news-detection/similarity_checker.py
 import re
 import math
-from sentence_transformers import SentenceTransformer, CrossEncoder, util
-from transformers import pipeline
+from sentence_transformers import util
+from backend.utils.metrics import EVIDENCE_CASCADE
+from backend.utils.model_registry import get_sentence_transformer, get_cross_encoder, get_hf_pipeline
 
 # Models
 BI_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 CROSS_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"  # compact and effective
 
-embed_model = SentenceTransformer(BI_MODEL)
-cross_encoder = CrossEncoder(CROSS_MODEL)
+NLI_MODEL = "roberta-large-mnli"
 
-# NLI pipeline (robust unwrap)
-nli_pipeline = pipeline("text-classification", model="roberta-large-mnli", truncation=True, top_k=None)
+# Cascade: the cross-encoder sees the bi-encoder candidates within CROSS_BI_MARGIN of the best
+# one, at least CROSS_MIN_CANDIDATES and at most CROSS_MAX_CANDIDATES of them
+CROSS_MAX_CANDIDATES = 60
+CROSS_MIN_CANDIDATES = 16
+CROSS_BI_MARGIN = 0.25
+NLI_BATCH_SIZE = 8
+
+# Weights of the normalized signals in the combined evidence score
+W_CROSS, W_BI, W_NLI = 0.6, 0.25, 0.15
+
+
+def _nli_pipeline():
+    # NLI pipeline (robust unwrap), shared through the model registry
+    return get_hf_pipeline("text-classification", NLI_MODEL, truncation=True, top_k=None)
 
 
 def _sigmoid(x):
@@ -39,8 +51,7 @@ def _normalize_entail(entail):
         return 0.5
 
 
-def _nli_support_score(claim, sentence):
-    outputs = nli_pipeline({"text": sentence, "text_pair": claim})
+def _entail_minus_contra(outputs):
     # unwrap nested lists
     if isinstance(outputs, list) and outputs and isinstance(outputs[0], list):
         outputs = outputs[0]
@@ -60,10 +71,21 @@ def _nli_support_score(claim, sentence):
         return 0.0
 
 
+def _nli_support_score(claim, sentence):
+    return _entail_minus_contra(_nli_pipeline()({"text": sentence, "text_pair": claim}))
+
+
+def _nli_support_scores(claim, sentences):
+    """_nli_support_score for several sentences in one forward pass."""
+    outputs = _nli_pipeline()([{"text": s, "text_pair": claim} for s in sentences], batch_size=len(sentences))
+    return [_entail_minus_contra(o) for o in outputs]
+
+
 def rerank_claim_sentence_pairs(claim, candidate_sentences, top_k=20, prefilter_keywords=None):
     """
     1) Filter candidate_sentences by length and keyword overlap (prefilter_keywords)
-    2) Use bi-encoder to get similarity, keep top N (60)
+    2) Use bi-encoder to get similarity, keep the candidates within CROSS_BI_MARGIN of the
+       best one (CROSS_MIN_CANDIDATES..CROSS_MAX_CANDIDATES)
     3) Use cross-encoder to rerank the top candidates
     Returns list of tuples (sentence, bi_sim, cross_score)
     """
@@ -80,24 +102,31 @@ def rerank_claim_sentence_pairs(claim, candidate_sentences, top_k=20, prefilter_
             if not any(kw in s_low for kw in prefilter_keywords):
                 continue
         filtered.append(s)
+    EVIDENCE_CASCADE.inc(len(candidate_sentences) - len(filtered), stage="prefilter", outcome="pruned")
     if not filtered:
         return []
 
     # Bi-encoder sims
+    embed_model = get_sentence_transformer(BI_MODEL)
     claim_emb = embed_model.encode(claim, convert_to_tensor=True, normalize_embeddings=True)
     sent_embs = embed_model.encode(filtered, convert_to_tensor=True, normalize_embeddings=True)
     bi_sims = util.cos_sim(claim_emb, sent_embs)[0].cpu().tolist()
 
-    # keep top M by bi-sim to limit cross-encoder calls
-    M = min(len(bi_sims), 60)
-    top_idx = sorted(range(len(bi_sims)), key=lambda i: bi_sims[i], reverse=True)[:M]
+    # keep top M by bi-sim to limit cross-encoder calls; a clear leader leaves fewer close contenders
+    order = sorted(range(len(bi_sims)), key=lambda i: bi_sims[i], reverse=True)
+    close = sum(1 for i in order if bi_sims[i] >= bi_sims[order[0]] - CROSS_BI_MARGIN)
+    M = min(len(order), CROSS_MAX_CANDIDATES, max(close, CROSS_MIN_CANDIDATES))
+    top_idx = order[:M]
+    EVIDENCE_CASCADE.inc(len(filtered), stage="bi_encoder", outcome="scored")
+    EVIDENCE_CASCADE.inc(M, stage="cross_encoder", outcome="scored")
+    EVIDENCE_CASCADE.inc(len(filtered) - M, stage="cross_encoder", outcome="pruned")
 
     pairs = [(filtered[i], bi_sims[i]) for i in top_idx]
     cross_inputs = [(claim, s) for s, _ in pairs]
 
     # Cross-encoder scores (higher = more relevant)
     try:
-        cross_scores = cross_encoder.predict(cross_inputs, convert_to_numpy=True).tolist()
+        cross_scores = get_cross_encoder(CROSS_MODEL).predict(cross_inputs, convert_to_numpy=True).tolist()
     except Exception:
         # If cross-encoder fails for any reason, fall back to bi scores
         cross_scores = [float(b) for _, b in pairs]
@@ -116,6 +145,10 @@ def best_evidence_for_claim(claim, articles, per_article_topk=2, global_topk=6):
     For each article, split into sentences, accumulate candidates across articles,
     rerank with cross-encoder, compute NLI, normalize signals and return top evidences.
 
+    NLI only moves a combined score by up to W_NLI, so it runs in batches on the
+    candidates whose best case can still reach the top global_topk, best first,
+    and stops once no remaining candidate can; the result matches scoring all of them.
+
     Returns list of tuples:
       (combined_norm, bi_sim, cross_score, entail_score, sentence, url, source)
     where combined_norm is in [0,1].
@@ -140,6 +173,9 @@ def best_evidence_for_claim(claim, articles, per_article_topk=2, global_topk=6):
         return []
 
     sentences = [t[0] for t in article_sentences]
+    first_index = {}
+    for i, s in enumerate(sentences):
+        first_index.setdefault(s, i)
 
     # Rerank claim vs sentences (bi -> cross)
     reranked = rerank_claim_sentence_pairs(
@@ -152,28 +188,40 @@ def best_evidence_for_claim(claim, articles, per_article_topk=2, global_topk=6):
     if not reranked:
         return []
 
-    evidences = []
-    # For top reranked sentences, compute NLI and normalized features
+    # Score without NLI first: the combined score of each candidate lies in [base, base + W_NLI]
+    candidates = []
     for s, bi, cross in reranked:
         # find original article metadata
-        try:
-            idx = sentences.index(s)
-        except ValueError:
-            idx = None
+        idx = first_index.get(s)
         url = article_sentences[idx][1] if idx is not None else ""
         source = article_sentences[idx][2] if idx is not None else ""
 
-        entail = _nli_support_score(claim, s)
-
         # normalize signals
         cross_sig = _sigmoid(cross)               # (0,1)
         bi_norm = _normalize_bi(bi)              # (0,1)
-        ent_norm = _normalize_entail(entail)     # (0,1)
-
-        # Weighted combine (normalized space)
-        combined = 0.6 * cross_sig + 0.25 * bi_norm + 0.15 * ent_norm
+        base = W_CROSS * cross_sig + W_BI * bi_norm
+        candidates.append((base, bi, cross, s, url, source))
+    candidates.sort(key=lambda c: c[0], reverse=True)
 
-        evidences.append((float(combined), float(bi), float(cross), float(entail), s, url, source))
+    evidences = []
+    pending = candidates
+    while pending:
+        # The global_topk-th best exact score so far; candidates that can't reach it are pruned
+        exact = sorted((e[0] for e in evidences), reverse=True)
+        floor = exact[global_topk - 1] if len(exact) >= global_topk else float("-inf")
+        pending = [c for c in pending if c[0] + W_NLI >= floor]
+        batch, pending = pending[:NLI_BATCH_SIZE], pending[NLI_BATCH_SIZE:]
+        if not batch:
+            break
+        entails = _nli_support_scores(claim, [c[3] for c in batch])
+        for (base, bi, cross, s, url, source), entail in zip(batch, entails):
+            ent_norm = _normalize_entail(entail)     # (0,1)
+            # Weighted combine (normalized space)
+            combined = base + W_NLI * ent_norm
+            evidences.append((float(combined), float(bi), float(cross), float(entail), s, url, source))
+
+    EVIDENCE_CASCADE.inc(len(evidences), stage="nli", outcome="scored")
+    EVIDENCE_CASCADE.inc(len(candidates) - len(evidences), stage="nli", outcome="pruned")
 
     # sort by combined descending and return top global_topk
     evidences.sort(key=lambda x: x[0], reverse=True)
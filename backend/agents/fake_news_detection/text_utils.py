@@ -2,12 +2,13 @@
 #agents/fake-news-detection/text_utils.py
 import re
 from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
-import spacy
 from textstat import flesch_reading_ease
-from transformers import pipeline
+from backend.utils.model_registry import get_hf_pipeline, get_spacy_model
 
-nlp = spacy.load("en_core_web_sm")
-sentiment_analyzer = pipeline("sentiment-analysis", model="cardiffnlp/twitter-roberta-base-sentiment")
+def nlp(text):
+    return get_spacy_model("en_core_web_sm")(text)
+
+SENTIMENT_MODEL = "cardiffnlp/twitter-roberta-base-sentiment"
 
 def preprocess_text(text):
     text = (text or "").lower()
@@ -57,7 +58,7 @@ def extract_claim_features(text):
     
     # Sentiment analysis
     try:
-        sentiment_result = sentiment_analyzer(text[:512])  # Limit for model
+        sentiment_result = get_hf_pipeline("sentiment-analysis", SENTIMENT_MODEL)(text[:512])  # Limit for model
         features["sentiment"] = sentiment_result[0]
     except:
         features["sentiment"] = {"label": "NEUTRAL", "score": 0.5}
@@ -60,6 +60,7 @@ except ImportError:
 try:
     from transformers import pipeline
     from huggingface_hub import login
+    from ..utils.model_registry import get_hf_pipeline
     TRANSFORMERS_AVAILABLE = True
     
     # Initialize Hugging Face API token
@@ -79,8 +80,8 @@ class MisinformationAnalysisTool:
     """Tool for analyzing content for potential misinformation."""
     
     def __init__(self):
-        self.sentiment_analyzer = pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
-        self.zero_shot_classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
+        self.sentiment_analyzer = get_hf_pipeline("sentiment-analysis", "distilbert-base-uncased-finetuned-sst-2-english")
+        self.zero_shot_classifier = get_hf_pipeline("zero-shot-classification", "facebook/bart-large-mnli")
         
     def extract_article_content(self, url: str) -> str:
         """Extract the content of an article from its URL using newspaper3k."""
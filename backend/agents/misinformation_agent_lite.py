@@ -13,14 +13,13 @@ from datetime import datetime
 import json
 import random
 import re
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 import urllib.parse
 import hashlib
 import difflib
 import itertools
+import threading
 from collections import defaultdict
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.schema import HumanMessage
 import json
 import re
 from typing import List, Dict, Any
@@ -49,6 +48,9 @@ logger.info(f"Current working directory: {os.getcwd()}")
 from utils.trends import get_trending_topics
 HAS_TRENDS_IMPORT = True
 logger.info("Successfully imported get_trending_topics")
+from utils.background_job import BackgroundJob
+# Absolute import so LLM metrics land in the same registry /metrics renders
+from backend.utils import llm_gateway
 
 # Try to import ML libraries
 try:
@@ -57,15 +59,6 @@ try:
     from sklearn.ensemble import RandomForestClassifier
     import nltk
     HAS_NLTK = True
-    
-    # Download minimal NLTK data
-    try:
-        nltk.download('punkt', quiet=True)
-        nltk.download('stopwords', quiet=True)
-        nltk.download('wordnet', quiet=True)
-    except Exception as e:
-        logger.warning(f"Could not download NLTK data: {str(e)}")
-        
 except ImportError:
     logger.warning("Could not import scikit-learn or NLTK. Using rule-based fallback mode.")
     HAS_NLTK = False
@@ -78,6 +71,21 @@ if HAS_GEMINI_API:
 else:
     logger.info("Gemini API integration is not available - using lightweight analysis only")
 
+_nltk_data_ready = False
+
+def ensure_nltk_data():
+    """Download the minimal NLTK data on first use instead of at import time."""
+    global _nltk_data_ready
+    if _nltk_data_ready or not HAS_NLTK:
+        return
+    try:
+        nltk.download('punkt', quiet=True)
+        nltk.download('stopwords', quiet=True)
+        nltk.download('wordnet', quiet=True)
+    except Exception as e:
+        logger.warning(f"Could not download NLTK data: {str(e)}")
+    _nltk_data_ready = True
+
 # Enhanced misinformation indicators with categories
 MISINFORMATION_INDICATORS = {
     "claim_language": [
@@ -155,13 +163,30 @@ class LightweightMisinformationAgent:
         self.latest_results = None
         self.model = None
         self.vectorizer = None
-        
-        if HAS_NLTK:
-            # Use TF-IDF instead of simple counts for better feature representation
-            self.vectorizer = TfidfVectorizer(max_features=5000, stop_words='english')
-            # RandomForest tends to be more accurate than NB for text classification
-            self.model = RandomForestClassifier(n_estimators=50, random_state=42) if HAS_NLTK else MultinomialNB()
-            self._train_simple_model()
+        # The classifier is trained lazily on first use so importing this module stays cheap
+        self._model_lock = threading.Lock()
+        self._model_ready = False
+    
+    def _ensure_model(self):
+        """Train the classifier the first time it is needed."""
+        if self._model_ready:
+            return
+        with self._model_lock:
+            if self._model_ready:
+                return
+            if HAS_NLTK:
+                ensure_nltk_data()
+                # Use TF-IDF instead of simple counts for better feature representation
+                self.vectorizer = TfidfVectorizer(max_features=5000, stop_words='english')
+                # RandomForest tends to be more accurate than NB for text classification
+                self.model = RandomForestClassifier(n_estimators=50, random_state=42) if HAS_NLTK else MultinomialNB()
+                self._train_simple_model()
+            self._model_ready = True
+    
+    def warm_up(self):
+        """Prepare the classifier ahead of the first request."""
+        self._ensure_model()
+        return self._model_ready
     
     def _train_simple_model(self):
         """Train a simple model for misinformation detection with an expanded dataset."""
@@ -331,6 +356,7 @@ class LightweightMisinformationAgent:
             
             # 4. ML model analysis if available
             ml_score = None
+            self._ensure_model()
             if HAS_NLTK and self.model and self.vectorizer:
                 try:
                     X = self.vectorizer.transform([text])
@@ -417,16 +443,6 @@ class LightweightMisinformationAgent:
     def _analyze_with_gemini(self, text: str, sources: List[str] = None, contradiction_data: Dict = None) -> Dict[str, Any]:
         """Use Gemini API for enhanced analysis with cross-verification and contradiction detection."""
         try:
-            # Initialize the LangChain Gemini model
-            llm = ChatGoogleGenerativeAI(
-                model="gemini-2.5-flash",
-                google_api_key=GEMINI_API_KEY,
-                temperature=0.2,
-                top_p=0.8,
-                top_k=40,
-                max_output_tokens=2048
-            )
-            
             # Truncate text if too long
             if len(text) > 2000:
                 text = text[:1997] + "..."
@@ -477,12 +493,19 @@ class LightweightMisinformationAgent:
             Your analysis should be thorough, unbiased, and focused on helping readers determine the reliability of this information.
             """
             
-            # Make the API call using LangChain
-            message = HumanMessage(content=prompt)
-            response = llm.invoke([message])
+            # Make the API call through the shared gateway (cached, quota-paced)
+            response = llm_gateway.generate(
+                prompt,
+                "gemini-2.5-flash",
+                operation="agent.analyze_text",
+                temperature=0.2,
+                top_p=0.8,
+                top_k=40,
+                max_output_tokens=2048
+            )
             
             # Extract the text from the response
-            text_response = response.content
+            text_response = response.text
             
             # Extract the JSON part from the response
             json_str = re.search(r'```json\s*(.*?)\s*```', text_response, re.DOTALL)
@@ -639,24 +662,32 @@ class LightweightMisinformationAgent:
                 "contradictions": {}
             }
 
-    def analyze_trends(self) -> Dict[str, Any]:
-        """Analyze current global trends for misinformation with cross-verification and expanded Gemini analysis."""
+    def analyze_trends(self, progress: Optional[Callable[[float, str], None]] = None) -> Dict[str, Any]:
+        """Analyze current global trends for misinformation with cross-verification and expanded Gemini analysis.
+
+        `progress(fraction, message)` is called as the run advances, for status reporting.
+        """
+        progress = progress or (lambda fraction, message: None)
         try:
             logger.info("Starting comprehensive worldwide misinformation analysis")
+            progress(0.0, "Fetching trending topics")
             
             # Get trends data - focus on GLOBAL trends
             trends_data = get_trending_topics()
             source_type = "real" if HAS_TRENDS_IMPORT else "mock"
             logger.info(f"Analyzing {len(trends_data)} global trends (using {source_type} data)")
+            progress(0.1, f"Analyzing {len(trends_data)} trends")
             
             # Process each trend with enhanced analysis
             analyzed_trends = []
             overall_risk_score = 0
             total_contradictions = 0
             
-            for trend in trends_data:
+            for trend_index, trend in enumerate(trends_data):
                 topic = trend.get('topic', '')
                 articles = trend.get('articles', [])
+                # Trends account for 10%-95% of the run; Gemini calls dominate each one
+                progress(0.1 + 0.85 * trend_index / len(trends_data), f"Analyzing trend {trend_index + 1}/{len(trends_data)}: {topic[:60]}")
                 
                 # Skip empty trends
                 if not topic and not articles:
@@ -804,6 +835,8 @@ class LightweightMisinformationAgent:
                 analyzed_trends.append(analyzed_trend)
                 overall_risk_score += analysis["misinformation_score"]
             
+            progress(0.95, "Summarizing results")
+            
             # Calculate overall statistics
             if analyzed_trends:
                 overall_risk_score /= len(analyzed_trends)
@@ -944,6 +977,9 @@ class LightweightMisinformationAgent:
 # Create a singleton instance
 agent_service = LightweightMisinformationAgent()
 
+# The only way API handlers should start a trend analysis: one run at a time, off the request thread
+analysis_job = BackgroundJob("agent-analysis", agent_service.analyze_trends)
+
 # Provide main function for testing
 if __name__ == "__main__":
     print("Testing enhanced lightweight misinformation agent...")
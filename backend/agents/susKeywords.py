@@ -837,9 +837,10 @@ import re
 import json
 import time
 from rapidfuzz import fuzz, process
-from groq import Groq
 from dotenv import load_dotenv
 
+from backend.utils import llm_gateway
+
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 ENV_PATH = os.path.join(BASE_DIR, ".env")
 load_dotenv(ENV_PATH)
@@ -910,7 +911,6 @@ class LLMClient:
             print("💡 Make sure to set GROQ_API_KEY in your .env file")
             raise RuntimeError("GROQ_API_KEY not set")
         
-        self.client = Groq(api_key=api_key)
         self.model = os.getenv("MISINFO_MODEL", "llama-3.1-8b-instant")
         print(f"🤖 Using model: {self.model}")
 
@@ -953,15 +953,19 @@ If no concerning phrases are found, return: {{"triggers": []}}
             try:
                 print(f"🔄 LLM Request (attempt {attempt + 1})...")
                 
-                completion = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": user_prompt}],
+                # Retries must reach the model again rather than the cached first answer
+                completion = llm_gateway.generate(
+                    user_prompt,
+                    self.model,
+                    provider="groq",
+                    operation="chat_completion",
+                    cache=attempt == 0,
                     temperature=0.1,
-                    max_tokens=800,
+                    max_output_tokens=800,
                     timeout=30
                 )
 
-                response = completion.choices[0].message.content.strip()
+                response = completion.text
                 print("----- LLM RAW OUTPUT -----")
                 print(response[:500] + "..." if len(response) > 500 else response)
                 print("--------------------------")
@@ -977,7 +981,6 @@ If no concerning phrases are found, return: {{"triggers": []}}
                     print("⚠️ LLM returned empty triggers list")
                     if attempt < max_retries:
                         print("🔄 Retrying with different parameters...")
-                        time.sleep(1)
                         continue
                     return parsed
                 
@@ -20,6 +20,8 @@ EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
 CHROMA_DB_PATH = "./chroma_db"
 COLLECTION_NAME = "news_articles"
 DISTANCE_THRESHOLD = 0.1 
+# "memory" keeps each job's chunks in process; "chroma" writes them to CHROMA_DB_PATH
+VECTOR_STORE_BACKEND = os.getenv("TIMELINE_VECTOR_STORE", "memory")
 
 # --- Agent Loop Settings ---
 MAX_ITERATIONS = 2          # How many "curiosity loops" to run
@@ -2,7 +2,6 @@
 import json
 import os
 import shutil
-import time
 from .config import CONSOLE, CHROMA_DB_PATH, MAX_ITERATIONS, MAX_ARTICLES_PER_STEP
 from .o0_query_refiner import refine_initial_query
 from .o1_retrieval import get_urls_from_duckduckgo, extract_content_from_url
@@ -108,8 +107,6 @@ def main(topic: str):
             else:
                 CONSOLE.print("[red]   - No new data found in this loop. Stopping curiosity.[/red]")
                 break
-        
-        time.sleep(2)
 
     # --- STEP 4: FINAL NARRATIVE ---
     CONSOLE.print("\n[yellow]✨ All iterations complete. Generating final report...[/yellow]")
@@ -1,17 +1,12 @@
 # agents/timeline/o0_query_refiner.py
-import google.generativeai as genai
-from .config import CONSOLE, LLM_SMART_MODEL, GEMINI_API_KEY
-
-# Ensure robust connection
-genai.configure(api_key=GEMINI_API_KEY, transport="rest")
+from backend.utils import llm_gateway
+from .config import CONSOLE, LLM_SMART_MODEL
 
 def refine_initial_query(topic: str) -> str:
     """
     Refines a raw user topic into a specific DuckDuckGo search query.
     """
     CONSOLE.print(f"\n[yellow]🧠 Refining topic:[/yellow] '{topic}'")
-    model = genai.GenerativeModel(LLM_SMART_MODEL)
-    
     prompt = f"""
     You are a Search Engine Optimization expert for investigative journalism.
     Convert the user's topic into a precise DuckDuckGo search query.
@@ -26,7 +21,7 @@ def refine_initial_query(topic: str) -> str:
     """
 
     try:
-        response = model.generate_content(prompt)
+        response = llm_gateway.generate(prompt, LLM_SMART_MODEL, operation="timeline.query_refiner")
         # basic cleaning to ensure we just get the query text
         refined_query = response.text.strip().strip('"').strip("'")
         
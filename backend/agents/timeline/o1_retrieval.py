@@ -1,6 +1,7 @@
 # agents/timeline/o1_retrieval.py
-import trafilatura
 from typing import List, Dict, Optional
+from backend.utils import cassette, http_client
+from backend.utils.extraction import extract
 from .config import CONSOLE
 import dateparser
 from duckduckgo_search import DDGS
@@ -12,23 +13,26 @@ def get_urls_from_duckduckgo(topic: str, max_results: int = 10) -> List[Dict[str
     results = []
     try:
         # DDGS provides a simple interface to search
-        with DDGS() as ddgs:
-            # We use ddgs.news() specifically for news articles
-            # region='wt-wt' searches globally (no specific region)
-            ddg_news = ddgs.news(keywords=topic, max_results=max_results)
-            
-            if not ddg_news:
-                CONSOLE.print("[yellow]DuckDuckGo returned no results.[/yellow]")
-                return []
+        def search():
+            with DDGS() as ddgs:
+                # We use ddgs.news() specifically for news articles
+                # region='wt-wt' searches globally (no specific region)
+                return ddgs.news(keywords=topic, max_results=max_results)
+
+        ddg_news = cassette.recorded_call("ddgs.news", [topic, max_results], search)
+        
+        if not ddg_news:
+            CONSOLE.print("[yellow]DuckDuckGo returned no results.[/yellow]")
+            return []
 
-            # Normalize data to match the format expected by main.py
-            for result in ddg_news:
-                results.append({
-                    "url": result['url'],
-                    # DDG returns 'date' (e.g., "2024-01-01T..."), we map it to 'published_at'
-                    "published_at": result.get('date', '') 
-                })
-                
+        # Normalize data to match the format expected by main.py
+        for result in ddg_news:
+            results.append({
+                "url": result['url'],
+                # DDG returns 'date' (e.g., "2024-01-01T..."), we map it to 'published_at'
+                "published_at": result.get('date', '') 
+            })
+            
         CONSOLE.print(f"[green]   --> Found {len(results)} articles.[/green]")
         return results
 
@@ -41,14 +45,14 @@ def extract_content_from_url(url: str, published_at: str) -> Optional[Dict]:
     CONSOLE.print(f"--> [cyan]Extracting content from:[/cyan] {url}")
     
     try:
-        downloaded = trafilatura.fetch_url(url)
-        if downloaded is None:
+        try:
+            downloaded = http_client.fetch_page(url).text
+        except Exception:
             CONSOLE.print("[red]    Error: Could not retrieve webpage.[/red]")
             return None
 
-        content = trafilatura.extract(
-            downloaded, include_comments=False, include_tables=False, no_fallback=True
-        )
+        article = extract(downloaded, url)
+        content = article["text"]
 
         if content:
             # Parse the date provided by DDG or try to find it in metadata
@@ -57,9 +61,9 @@ def extract_content_from_url(url: str, published_at: str) -> Optional[Dict]:
             
             metadata = {
                 "url": url,
-                "title": trafilatura.extract_metadata(downloaded).title,
+                "title": article["title"],
                 "published_date": formatted_date,
-                "source": trafilatura.extract_metadata(downloaded).sitename,
+                "source": article["sitename"],
                 "content": content
             }
             CONSOLE.print("[green]    --> Successfully extracted content and metadata.[/green]")
@@ -111,38 +111,36 @@
 #     return all_chunks
 
 # agents/timeline/o2_vector_store.py
-import chromadb
 import numpy as np
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from sentence_transformers import SentenceTransformer
 from typing import List, Dict
-from .config import CONSOLE, CHROMA_DB_PATH, COLLECTION_NAME, EMBEDDING_MODEL_NAME, DISTANCE_THRESHOLD
+from backend.utils.model_registry import get_sentence_transformer
+from backend.utils.vector_store import open_store
+from .config import CONSOLE, CHROMA_DB_PATH, COLLECTION_NAME, EMBEDDING_MODEL_NAME, DISTANCE_THRESHOLD, VECTOR_STORE_BACKEND
 
 # --- Lazy Initialization ---
 _client = None
 _collection = None
-embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
 
 def get_collection():
     """
-    Initializes a persistent ChromaDB client if it hasn't been already.
+    Opens the job's vector store (in memory, or ChromaDB at CHROMA_DB_PATH) if it hasn't been already.
     """
-    global _client, _collection
+    global _collection
     if _collection is None:
-        CONSOLE.print("[grey50]   - Initializing ChromaDB client for the first time...[/grey50]")
-        _client = chromadb.PersistentClient(path=CHROMA_DB_PATH)
-        _collection = _client.get_or_create_collection(name=COLLECTION_NAME)
+        CONSOLE.print(f"[grey50]   - Initializing {VECTOR_STORE_BACKEND} vector store for the first time...[/grey50]")
+        _collection = open_store(COLLECTION_NAME, VECTOR_STORE_BACKEND, path=CHROMA_DB_PATH)
     return _collection
 
 def reset_db_client():
     """
-    Resets the global ChromaDB client. 
-    Must be called before deleting the database directory to release file locks.
+    Drops the job's vector store, so the next get_collection() starts empty.
+    With the Chroma backend, must be called before deleting the database directory to release file locks.
     """
     global _client, _collection
     _client = None
     _collection = None
-    CONSOLE.print("[grey50]   - ChromaDB client connection reset.[/grey50]")
+    CONSOLE.print("[grey50]   - Vector store reset.[/grey50]")
 
 def chunk_text(article: Dict) -> List[Dict]:
     """Chunks the article content and attaches metadata to each chunk."""
@@ -176,23 +174,25 @@ def chunk_text(article: Dict) -> List[Dict]:
 
 def add_chunks_to_db(chunks: List[Dict]):
     """
-    Computes embeddings, checks for similarity, and adds unique chunks to ChromaDB.
+    Computes embeddings, checks for similarity, and adds unique chunks to the vector store.
     """
     collection = get_collection()
 
     CONSOLE.print(f"\n[yellow]📚 Processing {len(chunks)} chunks for Vector DB...[/yellow]")
+    if not chunks:
+        return
     chunks_to_add = []
-    
-    for chunk in chunks:
-        query_embedding = embedding_model.encode(chunk['text']).tolist()
-        
-        results = collection.query(
-            query_embeddings=[query_embedding],
-            n_results=1
-        )
-
-        distances_for_first_query = results['distances'][0]
+    embeddings_to_add = []
+    embedding_model = get_sentence_transformer(EMBEDDING_MODEL_NAME)
+
+    # One encode and one query for the whole article; chunks are only compared with what was stored before
+    embeddings = embedding_model.encode([chunk['text'] for chunk in chunks]).tolist()
+    results = collection.query(
+        query_embeddings=embeddings,
+        n_results=1
+    )
 
+    for chunk, embedding, distances_for_first_query in zip(chunks, embeddings, results['distances']):
         if distances_for_first_query:
             closest_distance = distances_for_first_query[0]
             
@@ -201,17 +201,19 @@ def add_chunks_to_db(chunks: List[Dict]):
                 continue
         
         chunks_to_add.append(chunk)
+        embeddings_to_add.append(embedding)
 
     if not chunks_to_add:
         CONSOLE.print("[green]   --> No new unique chunks to add.[/green]")
         return
 
     collection.add(
+        embeddings=embeddings_to_add,
         documents=[chunk['text'] for chunk in chunks_to_add],
         metadatas=[chunk['metadata'] for chunk in chunks_to_add],
         ids=[chunk['metadata']['chunk_id'] for chunk in chunks_to_add]
     )
-    CONSOLE.print(f"[green]   --> Added {len(chunks_to_add)} new unique chunks to ChromaDB.[/green]")
+    CONSOLE.print(f"[green]   --> Added {len(chunks_to_add)} new unique chunks to the vector store.[/green]")
 
 def get_all_chunks_from_db() -> List[Dict]:
     """Retrieves all documents and their metadata from the collection."""
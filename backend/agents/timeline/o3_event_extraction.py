@@ -1,19 +1,13 @@
 # agents/timeline/03_event_extraction.py
 import json
-import google.generativeai as genai
 from typing import List, Dict, Optional
-from .config import CONSOLE, LLM_SMART_MODEL, GEMINI_API_KEY
-import time
-
-# Configure the Gemini API client
-genai.configure(api_key=GEMINI_API_KEY, transport="rest")
+from backend.utils import llm_gateway
+from .config import CONSOLE, LLM_SMART_MODEL
 
 def extract_events_from_chunk(chunk: Dict) -> Optional[List[Dict]]:
     """
     Uses Gemini to extract structured events from a text chunk.
     """
-    model = genai.GenerativeModel(LLM_SMART_MODEL)
-    
     prompt = f"""
     You are an expert data analyst. From the following text chunk, extract key factual events.
     For each event, provide a short title, a concise description, the explicit date if mentioned,
@@ -31,12 +25,11 @@ def extract_events_from_chunk(chunk: Dict) -> Optional[List[Dict]]:
     """
 
     try:
-        generation_config = genai.types.GenerationConfig(
-            temperature=0.1,
-            response_mime_type="application/json",
+        # Free-tier pacing is handled by the gateway's per-model quota
+        response = llm_gateway.generate(
+            prompt, LLM_SMART_MODEL, operation="timeline.event_extraction",
+            temperature=0.1, response_mime_type="application/json",
         )
-        response = model.generate_content(prompt, generation_config=generation_config)
-        time.sleep(2) # Wait for 2 seconds to stay within free tier limits
         extracted_data = json.loads(response.text)
         
         # Add source URL and inferred date to each event
@@ -48,5 +41,4 @@ def extract_events_from_chunk(chunk: Dict) -> Optional[List[Dict]]:
 
     except (Exception) as e:
         CONSOLE.print(f"[bold red]LLM Event Extraction Error: {e}[/bold red]")
-        time.sleep(5) # Wait longer after an error
         return None
\ No newline at end of file
@@ -1,17 +1,13 @@
 # agents/timeline/05_narrative_generator.py
 import json
-import google.generativeai as genai
 from typing import List, Dict
-from .config import CONSOLE, LLM_SMART_MODEL, GEMINI_API_KEY
-
-genai.configure(api_key=GEMINI_API_KEY, transport="rest")
+from backend.utils import llm_gateway
+from .config import CONSOLE, LLM_SMART_MODEL
 
 def generate_narrative(sorted_events: List[Dict]) -> Dict:
     """
     Uses the Gemini model to generate background, timeline, and conclusion.
     """
-    model = genai.GenerativeModel(LLM_SMART_MODEL)
-    
     # Format the events into a string for the prompt
     event_list_str = "\n".join(
         [f"- {event['date']}: {event['title']} - {event['description']}" for event in sorted_events]
@@ -36,11 +32,10 @@ def generate_narrative(sorted_events: List[Dict]) -> Dict:
 
     try:
         CONSOLE.print("\n[yellow]✍️ Generating final narrative with LLM...[/yellow]")
-        generation_config = genai.types.GenerationConfig(
-            temperature=0.5,
-            response_mime_type="application/json",
+        response = llm_gateway.generate(
+            prompt, LLM_SMART_MODEL, operation="timeline.narrative",
+            temperature=0.5, response_mime_type="application/json",
         )
-        response = model.generate_content(prompt, generation_config=generation_config)
         narrative = json.loads(response.text)
         CONSOLE.print("[green]   --> Narrative generation complete.[/green]")
         return narrative
@@ -1,13 +1,10 @@
 # agents/timeline/o6_curiosity_agent.py
 import json
-import google.generativeai as genai
 from typing import List, Dict
-from .config import CONSOLE, LLM_SMART_MODEL, GEMINI_API_KEY
+from backend.utils import llm_gateway
+from .config import CONSOLE, LLM_SMART_MODEL
 from .o4_graph_builder import Neo4jGraph
 
-# Ensure robust connection
-genai.configure(api_key=GEMINI_API_KEY, transport="rest")
-
 def generate_curiosity_queries(graph_instance: Neo4jGraph, current_iteration: int) -> List[str]:
     """
     Analyzes the current graph state to generate deep-dive queries.
@@ -52,10 +49,9 @@ def generate_curiosity_queries(graph_instance: Neo4jGraph, current_iteration: in
     """
 
     try:
-        model = genai.GenerativeModel(LLM_SMART_MODEL)
-        response = model.generate_content(
-            prompt, 
-            generation_config=genai.types.GenerationConfig(response_mime_type="application/json")
+        response = llm_gateway.generate(
+            prompt, LLM_SMART_MODEL, operation="timeline.curiosity",
+            response_mime_type="application/json",
         )
         
         queries = json.loads(response.text)
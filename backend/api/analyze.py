@@ -1,24 +1,35 @@
 
 import os
-import requests
-import tempfile
+import asyncio
 import json
-from urllib.parse import urljoin, urlparse
 from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional
 
 # ---- Local imports ----
 from backend.agents.langDetection import process_text
 from backend.agents.susKeywords import analyze_text_for_triggers
 from backend.utils.fetch_content import fetch_content
+from backend.utils.document import PageDocument
 from backend.agents.Source_credibility_keshav import publication_reputation_check
 from backend.agents.ReverseImg import verify_news
 from backend.agents.fake_news_detection.analyze_url import cross_verify_news
+from backend.utils.stage_graph import Stage, run_stage_graph
+from backend.utils.result_cache import SingleFlightCache
+from backend.utils.urls import canonicalize_url, text_fingerprint
+from backend.utils.metrics import track_stage
 
 # Supported languages
 SUPPORTED_LANGS = ["en"]
 
+# Stages whose results are part of the report (and streamed as SSE events)
+REPORT_STAGES = ("trigger_report", "source_credibility", "reverse_img", "cross_verify")
+
+# on_event(name, data) receives partial results while a report is being built
+EventCallback = Callable[[str, Any], None]
+
 def calculate_final_verdict(report_data):
     """
     Calculate final risk assessment and verdict based on all analysis components
@@ -235,18 +246,40 @@ def create_final_risk_assessment(report_data):
     }
 
 # -------------------- COMMON PIPELINE --------------------
-def run_pipeline(text: str, url: str = None, title: str = "", images=None, videos=None):
+def build_pipeline_stages(text: str, url: str = None, title: str = "", document=None):
+    """
+    Stage graph for one analysis. None of these stages depend on each other,
+    so they all run concurrently once language detection has accepted the text.
+    `document` is the page already downloaded for this request; stages read it
+    instead of fetching the URL again.
+    """
+    return [
+        Stage("trigger_report", lambda r: analyze_text_for_triggers(title, text),
+              error_message="Trigger analysis failed"),
+        Stage("source_credibility", lambda r: publication_reputation_check(url) if url else {},
+              error_message="Credibility check failed"),
+        Stage("reverse_img", lambda r: verify_news(url, document=document) if url else {},
+              error_message="Reverse Image search check failed"),
+        Stage("cross_verify", lambda r: cross_verify_news(url, document=document) if url else {},
+              error_message="Cross verification failed"),
+    ]
+
+
+def run_pipeline(text: str, url: str = None, title: str = "", images=None, videos=None, document=None,
+                 on_event: Optional[EventCallback] = None):
     if not images:
         images = []
     if not videos:
         videos = []
+    emit = on_event or (lambda name, data: None)
 
-    # Step 1: Language detection
+    # Step 1: Language detection (gates every other stage)
     if not text or len(text) < 20:
         return {"status": "error", "reason": "Insufficient text extracted"}
 
     try:
-        lang_result = process_text(text)   # dict
+        with track_stage("analyze", "language_detection"):
+            lang_result = process_text(text)   # dict
     except Exception as e:
         return {"status": "error", "reason": f"Language detection failed: {e}"}
 
@@ -257,88 +290,97 @@ def run_pipeline(text: str, url: str = None, title: str = "", images=None, video
     if lang not in SUPPORTED_LANGS:
         return {"status": "notvalid", "reason": f"Unsupported language: {lang}"}
 
-    # Step 2: Download images locally (optional)
-    tmp_dir = os.path.join(tempfile.gettempdir(), "url_images")
-    os.makedirs(tmp_dir, exist_ok=True)
-
-    local_image_paths = []
-    for i, img_url in enumerate(images):
-        try:
-            if not bool(urlparse(img_url).netloc):
-                img_url = urljoin(url, img_url)
-
-            resp = requests.get(img_url, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
-            if resp.status_code == 200 and "image" in resp.headers.get("Content-Type", ""):
-                img_path = os.path.join(tmp_dir, f"img_{i}.jpg")
-                with open(img_path, "wb") as f:
-                    f.write(resp.content)
-                local_image_paths.append(img_path)
-        except Exception as e:
-            print(f"Failed to download {img_url}: {e}")
-
-    # Step 3: Trigger analysis
-    trigger_report = {}
-    try:
-        trigger_report = analyze_text_for_triggers(title, text)
-    except Exception as e:
-        trigger_report = {"error": f"Trigger analysis failed: {e}"}
-
-    # Step 4: Source credibility
-    credibility_report = {}
-    try:
-        if url:
-            credibility_report = publication_reputation_check(url)
-    except Exception as e:
-        credibility_report = {"error": f"Credibility check failed: {e}"}
-    
-    #Step 6:reverse image search
-    img_report={}
-    try:
-        if url:
-            img_report=verify_news(url)
-    except Exception as e:
-        img_report = {"error": f"Reverse Image search check failed: {e}"}
-    
-    #Step 7:fadt cross verify
-    cross_verify={}
-    try:
-        if url:
-            cross_verify=cross_verify_news(url)
-    except Exception as e:
-        cross_verify = {"error": f"Reverse Image search check failed: {e}"}
-
-
-    # Step 5: Final report
-    final_report = {
-        "status": "success",
+    content = {
         "url": url,
         "lang": lang,
         "title": title,
         "text": text[:1500] + ("..." if len(text) > 1500 else ""),
         "images": images,
         "videos": videos,
-        "trigger_report": trigger_report,
-        "source_credibility": credibility_report,
-        "reverse_img":img_report,
-        "cross_verify":cross_verify
     }
+    emit("content", content)
+
+    def stage_done(name, value, seconds):
+        if name in REPORT_STAGES:
+            emit(name, value)
+
+    # Steps 2-5: triggers, source credibility, reverse image search and cross
+    # verification are independent, so they run side by side
+    results = run_stage_graph(build_pipeline_stages(text, url=url, title=title, document=document),
+                              on_stage_complete=stage_done, pipeline="analyze")
+
+    # Final report
+    final_report = {"status": "success", **content}
+    for name in REPORT_STAGES:
+        final_report[name] = results[name]
+    final_report["stage_timings"] = results["_timings"]
 
     return final_report
 
 # -------------------- ANALYZE FUNCTIONS --------------------
-def analyze_url(url: str):
-    content = fetch_content(url)
+def load_document(url: str):
+    """Download the page once for the whole pipeline; None if it can't be fetched."""
+    try:
+        with track_stage("analyze", "fetch_document"):
+            return PageDocument.fetch(url)
+    except Exception as e:
+        print(f"Failed to fetch {url}: {e}")
+        return None
+
+
+def analyze_url(url: str, on_event: Optional[EventCallback] = None):
+    document = load_document(url)
+    if document is None:
+        content = {"title": "", "text": "", "images": [], "videos": []}
+    else:
+        content = fetch_content(url, document=document)
     title, text, images, videos = (
         content.get("title") or "",
         content.get("text") or "",
         content.get("images", []),
         content.get("videos", []),
     )
-    return run_pipeline(text, url=url, title=title, images=images, videos=videos)
+    return run_pipeline(text, url=url, title=title, images=images, videos=videos, document=document,
+                        on_event=on_event)
 
 
-def analyze_text(text: str):
-    return run_pipeline(text, url=None, title="User Provided Text", images=[], videos=[])
+def analyze_text(text: str, on_event: Optional[EventCallback] = None):
+    return run_pipeline(text, url=None, title="User Provided Text", images=[], videos=[], on_event=on_event)
+
+
+def build_report(input_type: str, value: str, on_event: Optional[EventCallback] = None):
+    """
+    Run the pipeline for a url/text input and attach the final risk assessment.
+    `on_event(name, data)` is called with each partial result as it becomes available.
+    """
+    if input_type == "url":
+        report = analyze_url(value, on_event=on_event)
+    else:
+        report = analyze_text(value, on_event=on_event)
+    if report.get("status") == "success":
+        with track_stage("analyze", "final_risk_assessment"):
+            report["final_risk_assessment"] = create_final_risk_assessment(report)
+        if on_event:
+            on_event("final_risk_assessment", report["final_risk_assessment"])
+    return report
+
+
+# -------------------- RESULT CACHE --------------------
+# Viral stories get submitted by many users within minutes; identical inputs share
+# one cached report (and one in-flight computation) instead of re-running every upstream API.
+analysis_cache = SingleFlightCache(
+    ttl_seconds=float(os.getenv("ANALYZE_CACHE_TTL", "900")),
+    stale_seconds=float(os.getenv("ANALYZE_CACHE_STALE", "3600")),
+    max_entries=int(os.getenv("ANALYZE_CACHE_MAX_ENTRIES", "512")),
+    should_cache=lambda report: report.get("status") == "success",
+    name="analysis",
+)
+
+
+def analysis_cache_key(input_type: str, value: str):
+    if input_type == "url":
+        return ("url", canonicalize_url(value))
+    return ("text", text_fingerprint(value))
 
 
 # -------------------- FASTAPI ROUTER --------------------
@@ -351,27 +393,138 @@ class AnalyzeRequest(BaseModel):
 @router.post("/analyze")
 async def analyze_endpoint(request: AnalyzeRequest) -> Dict[str, Any]:
     try:
-        if request.type == "url":
-            report = analyze_url(request.input)
-        elif request.type == "text":
-            report = analyze_text(request.input)
-        else:
+        if request.type not in ("url", "text"):
             raise HTTPException(status_code=400, detail="Invalid type. Must be 'url' or 'text'.")
 
+        # The pipeline is blocking; run it off the event loop so other requests keep being served
+        report, cache_info = await run_in_threadpool(
+            analysis_cache.get_or_compute,
+            analysis_cache_key(request.type, request.input),
+            lambda: build_report(request.type, request.input),
+        )
+
         if report.get("status") != "success":
             raise HTTPException(status_code=400, detail=report)
-        
-        final_risk_assessment = create_final_risk_assessment(report)
-        
-        # Include it in the response
-        report["final_risk_assessment"] = final_risk_assessment
 
-        return {"success": True, "report": report}
+        return {"success": True, "report": report, "cache": cache_info}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing input: {str(e)}")
 
 
+def sse_event(name: str, data: Any) -> str:
+    return f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def replay_report_events(report: Dict[str, Any]):
+    """The event sequence for a report that is already complete (cache hit)."""
+    yield "content", {k: report.get(k) for k in ("url", "lang", "title", "text", "images", "videos")}
+    for name in REPORT_STAGES:
+        yield name, report.get(name)
+    yield "final_risk_assessment", report.get("final_risk_assessment")
+
+
+async def stream_report(input_type: str, value: str):
+    """
+    Yield SSE events for one analysis: `content` once the text is accepted,
+    one event per report stage as it finishes, `final_risk_assessment`, then
+    `done` (or `error`). Partial stages reach the client while slower ones
+    such as cross verification are still running.
+
+    Streams share analysis_cache's single-flight with POST /analyze: a stream
+    for a key already being computed waits for that run and replays its report.
+    """
+    key = analysis_cache_key(input_type, value)
+    cached, cache_info, future = analysis_cache.claim(key)
+    if future is None:
+        report = cached
+    elif cache_info["status"] == "shared":
+        try:
+            report = await asyncio.wrap_future(future)
+        except Exception as e:
+            yield sse_event("error", {"status": "error", "reason": f"Error analyzing input: {e}"})
+            return
+        if report.get("status") != "success":
+            yield sse_event("error", report)
+            return
+    else:
+        async for event in stream_computation(key, future, input_type, value):
+            yield event
+        return
+
+    for name, data in replay_report_events(report):
+        yield sse_event(name, data)
+    yield sse_event("done", {"status": "success", "stage_timings": report.get("stage_timings"), "cache": cache_info})
+
+
+async def stream_computation(key, future, input_type: str, value: str):
+    """Run the pipeline for a key claimed in analysis_cache, streaming its stage events."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def on_event(name, data):
+        loop.call_soon_threadsafe(queue.put_nowait, (name, data))
+
+    def compute():
+        # Always completes the claim, even if the client has disconnected, so waiters are released
+        try:
+            report = build_report(input_type, value, on_event=on_event)
+        except Exception as e:
+            analysis_cache.finish(key, future, error=e)
+            raise
+        analysis_cache.finish(key, future, report)
+        return report
+
+    task = asyncio.ensure_future(run_in_threadpool(compute))
+    task.add_done_callback(lambda _: loop.call_soon_threadsafe(queue.put_nowait, None))
+
+    while True:
+        item = await queue.get()
+        if item is None:
+            break
+        yield sse_event(*item)
+
+    try:
+        report = task.result()
+    except Exception as e:
+        yield sse_event("error", {"status": "error", "reason": f"Error analyzing input: {e}"})
+        return
+
+    if report.get("status") != "success":
+        yield sse_event("error", report)
+    else:
+        yield sse_event("done", {"status": "success", "stage_timings": report.get("stage_timings"),
+                                 "cache": {"status": "miss", "age_seconds": 0.0}})
+
+
+def streaming_response(input_type: str, value: str) -> StreamingResponse:
+    if input_type not in ("url", "text"):
+        raise HTTPException(status_code=400, detail="Invalid type. Must be 'url' or 'text'.")
+    return StreamingResponse(
+        stream_report(input_type, value),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/analyze/stream")
+async def analyze_stream_endpoint(request: AnalyzeRequest):
+    """Server-Sent Events variant of /analyze: each stage is sent as soon as it is ready."""
+    return streaming_response(request.type, request.input)
+
+
+@router.get("/analyze/stream")
+async def analyze_stream_get(input: str, type: str = "url"):
+    """Same as POST /analyze/stream, for browser EventSource clients."""
+    return streaming_response(type, input)
+
+
+@router.get("/analyze/cache")
+async def analyze_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters and size of the /analyze result cache."""
+    return analysis_cache.snapshot()
+
+
 # -------------------- RUN DIRECTLY --------------------
 if __name__ == "__main__":
     test_url = "https://www.indiatoday.in/world/us-news/story/trump-aide-peter-navarros-another-bizarre-take-on-india-russia-oil-ties-brahmins-profiteering-2779779-2025-09-01"
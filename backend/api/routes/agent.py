@@ -1,9 +1,8 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException
 from typing import Dict, Any
 import os
 import sys
 import logging
-from datetime import datetime
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -14,7 +13,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 
 # Import the agent service
 try:
-    from agents.misinformation_agent_lite import agent_service
+    from backend.agents.misinformation_agent_lite import agent_service, analysis_job, HAS_GEMINI_API
     HAS_AGENT = True
 except ImportError:
     logger.error("Could not import misinformation agent")
@@ -22,67 +21,59 @@ except ImportError:
 
 router = APIRouter(prefix="/agent", tags=["agent"])
 
-# Track whether analysis is currently running
-is_analysis_running = False
-last_analysis_time = None
-
 @router.get("/status")
 async def get_agent_status() -> Dict[str, Any]:
     """Get the status of the misinformation agent."""
-    global last_analysis_time
+    job = analysis_job.status() if HAS_AGENT else None
     
     return {
         "available": HAS_AGENT,
-        "running": is_analysis_running,
-        "last_run": last_analysis_time,
-        "gemini_api_available": HAS_AGENT and agent_service.HAS_GEMINI_API if HAS_AGENT else False
+        "running": bool(job and job["running"]),
+        "last_run": job["finished_at"] if job and job["completed_runs"] else None,
+        "progress_percent": job["progress_percent"] if job else None,
+        "gemini_api_available": HAS_AGENT and HAS_GEMINI_API
     }
 
 @router.post("/analyze")
-async def start_analysis(background_tasks: BackgroundTasks) -> Dict[str, Any]:
+async def start_analysis() -> Dict[str, Any]:
     """Start a new analysis of global misinformation trends in the background."""
-    global is_analysis_running
-    
     if not HAS_AGENT:
         raise HTTPException(
             status_code=503, 
             detail="Misinformation agent is not available"
         )
     
-    if is_analysis_running:
+    # The job runs on its own thread; a second caller joins the run in flight
+    _, started = analysis_job.start()
+    if not started:
         return {
             "success": False,
-            "message": "Analysis is already running"
+            "message": "Analysis is already running",
+            "job": analysis_job.status()
         }
     
-    # Define the background task
-    def run_analysis():
-        global is_analysis_running, last_analysis_time
-        try:
-            is_analysis_running = True
-            agent_service.analyze_trends()
-            last_analysis_time = datetime.now().isoformat()
-        except Exception as e:
-            logger.error(f"Error running analysis: {str(e)}")
-        finally:
-            is_analysis_running = False
-    
-    # Add the task to be run in the background
-    background_tasks.add_task(run_analysis)
-    
     return {
         "success": True,
-        "message": "Analysis started in the background"
+        "message": "Analysis started in the background",
+        "job": analysis_job.status()
     }
 
 @router.get("/results")
-async def get_analysis_results() -> Dict[str, Any]:
-    """Get the latest analysis results from the misinformation agent."""
+async def get_analysis_results(wait: float = 0) -> Dict[str, Any]:
+    """
+    Get the latest analysis results from the misinformation agent.
+    Pass `wait` (seconds) to await an in-flight run before answering.
+    """
     if not HAS_AGENT:
         raise HTTPException(
             status_code=503, 
             detail="Misinformation agent is not available"
         )
     
+    if wait > 0 and analysis_job.running:
+        await analysis_job.wait(timeout=min(wait, 300.0))
+    
     results = agent_service.get_latest_results()
+    if analysis_job.running:
+        results = dict(results, running=True, job=analysis_job.status())
     return results
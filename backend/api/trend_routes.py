@@ -1,12 +1,18 @@
 #backend/api/trend_routes.py
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
-from backend.utils.trends import get_trending_topics
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from typing import Callable, List, Dict, Any
+from backend.utils.trends import trend_snapshot
+import os
 import random
 from datetime import datetime
 
 router = APIRouter()
 
+# How long browsers/CDNs may reuse a /api/trends response without revalidating
+TRENDS_MAX_AGE = int(os.getenv("TRENDS_MAX_AGE", "60"))
+
 def calculate_risk_level(topic: str, articles: List[Dict]) -> str:
     """
     Calculate misinformation risk level based on topic and articles
@@ -52,57 +58,84 @@ def calculate_sentiment(topic: str, articles: List[Dict]) -> str:
     else:
         return "neutral"
 
+def format_trends(trends_data: List[Dict]) -> Dict[str, Any]:
+    """Shape the raw trend snapshot for the frontend."""
+    formatted_trends = []
+
+    for trend in trends_data or []:
+        topic = trend.get('topic', 'Unknown Topic')
+        articles = trend.get('articles', [])
+
+        # Get volume or estimate mentions
+        mentions = trend.get('volume', random.randint(5000, 50000))
+
+        # Calculate risk level and sentiment
+        risk_level = calculate_risk_level(topic, articles)
+        sentiment = calculate_sentiment(topic, articles)
+
+        # Generate a description from articles if available
+        description = "No description available"
+        if articles and 'snippet' in articles[0]:
+            description = articles[0]['snippet']
+        elif articles and 'title' in articles[0]:
+            description = articles[0]['title']
+
+        # Format timestamp
+        timestamp = "Recently"
+        if 'started' in trend:
+            timestamp = trend['started']
+
+        # Assign platform (in a real app, this would be determined from data source)
+        platform = random.choice(['twitter', 'facebook', 'instagram', 'tiktok'])
+
+        formatted_trend = {
+            "topic": topic,
+            "platform": platform,
+            "mentions": mentions,
+            "sentiment": sentiment,
+            "misinformationRisk": risk_level,
+            "description": description,
+            "timestamp": timestamp
+        }
+
+        formatted_trends.append(formatted_trend)
+
+    return {
+        "success": True,
+        "trends": formatted_trends
+    }
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+async def snapshot_response(request: Request, key: str, format_fn: Callable[[Any], Dict[str, Any]]) -> Response:
+    """
+    Serve `format_fn(trend snapshot)` from memory with ETag/Cache-Control.
+    The formatted payload is built once per snapshot version, so the
+    ETag stays stable until the background refresher publishes new data.
+    """
+    if trend_snapshot.age_seconds() is None:
+        # Only the first request of a fresh process waits for NewsAPI
+        await run_in_threadpool(trend_snapshot.get)
+    payload, etag = trend_snapshot.derive(key, format_fn)
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={TRENDS_MAX_AGE}, stale-while-revalidate={trend_snapshot.interval_seconds}",
+    }
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=payload, headers=headers)
+
 @router.get("/api/trends")
-async def get_trends():
+async def get_trends(request: Request):
     try:
-        # Get trending topics using the function from trends.py
-        trends_data = get_trending_topics()
-        
-        # Format the response for the frontend
-        formatted_trends = []
-        
-        for trend in trends_data:
-            topic = trend.get('topic', 'Unknown Topic')
-            articles = trend.get('articles', [])
-            
-            # Get volume or estimate mentions
-            mentions = trend.get('volume', random.randint(5000, 50000))
-            
-            # Calculate risk level and sentiment
-            risk_level = calculate_risk_level(topic, articles)
-            sentiment = calculate_sentiment(topic, articles)
-            
-            # Generate a description from articles if available
-            description = "No description available"
-            if articles and 'snippet' in articles[0]:
-                description = articles[0]['snippet']
-            elif articles and 'title' in articles[0]:
-                description = articles[0]['title']
-            
-            # Format timestamp
-            timestamp = "Recently"
-            if 'started' in trend:
-                timestamp = trend['started']
-            
-            # Assign platform (in a real app, this would be determined from data source)
-            platform = random.choice(['twitter', 'facebook', 'instagram', 'tiktok'])
-            
-            formatted_trend = {
-                "topic": topic,
-                "platform": platform,
-                "mentions": mentions,
-                "sentiment": sentiment,
-                "misinformationRisk": risk_level,
-                "description": description,
-                "timestamp": timestamp
-            }
-            
-            formatted_trends.append(formatted_trend)
-        
-        return {
-            "success": True,
-            "trends": formatted_trends
-        }
-    
+        return await snapshot_response(request, "trend_routes", format_trends)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching trends: {str(e)}")
+
+@router.get("/api/trends/status")
+async def get_trends_status():
+    """Age and version of the in-memory trend snapshot."""
+    return trend_snapshot.status()
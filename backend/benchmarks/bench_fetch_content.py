@@ -0,0 +1,151 @@
+# backend/benchmarks/bench_fetch_content.py
+"""
+Benchmark main-content extraction in backend.utils.fetch_content.
+
+Compares the single-pass lxml extractor against the previous BeautifulSoup
+implementation (which called get_text() on every article/main/section/div)
+on saved pages from benchmarks/fixtures/html/ plus synthetic, deeply nested
+news pages of increasing size. No network access is needed.
+
+No saved pages are committed, so out of the box only the synthetic pages are
+measured; save real article pages into the fixture directory before quoting
+numbers for real-world HTML. Each row's "source" says which kind it is.
+
+Usage:
+    python -m backend.benchmarks.bench_fetch_content [--repeat 3]
+"""
+import argparse
+import glob
+import html
+import json
+import os
+import re
+import sys
+import time
+import urllib.parse
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from bs4 import BeautifulSoup  # noqa: E402
+from backend.utils.fetch_content import extract_content  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "html")
+
+
+def legacy_extract_content(page_html, url):
+    """The pre-rewrite extractor, kept here only as the benchmark baseline."""
+    soup = BeautifulSoup(page_html, "html.parser")
+    for tag in soup(["script", "style", "noscript", "iframe", "footer", "header", "form", "nav", "aside"]):
+        tag.decompose()
+    title = (soup.title.string or "").strip() if soup.title else ""
+
+    main_block = None
+    max_text_len = 0
+    for c in soup.find_all(["article", "main", "section", "div"], recursive=True):
+        text_len = len(c.get_text(" ", strip=True))
+        if text_len > max_text_len:
+            main_block = c
+            max_text_len = text_len
+
+    if main_block:
+        text = "\n".join(t.get_text(" ", strip=True) for t in main_block.find_all(["p", "li"]))
+    else:
+        text = "\n".join(p.get_text(" ", strip=True) for p in soup.find_all("p"))
+    text = html.unescape(text)
+    text = re.sub(r"\s+\n", "\n", text)
+    text = re.sub(r"\n{2,}", "\n\n", text).strip()
+
+    images = []
+    for img in soup.find_all("img"):
+        src = img.get("src") or img.get("data-src") or img.get("data-original")
+        if src and not src.startswith("data:"):
+            abs_url = urllib.parse.urljoin(url, src)
+            if abs_url not in images:
+                images.append(abs_url)
+    return {"title": title, "text": text, "images": images}
+
+
+def synthetic_news_page(paragraphs, depth):
+    """A news-like page whose article body sits `depth` wrapper divs deep."""
+    nav = "".join(f"<li><a href='/s{i}'>Section {i}</a></li>" for i in range(30))
+    related = "".join(
+        f"<div class='card'><a href='/r{i}'>Related headline number {i} about the story</a></div>"
+        for i in range(40)
+    )
+    body = "".join(
+        f"<div class='para-wrap'><p>Paragraph {i} of the article. Officials said the measure "
+        f"would take effect next week, according to a statement released on Monday. "
+        f"<a href='/ref{i}'>Read more</a></p><figure><img src='/img/{i}.jpg'></figure></div>"
+        for i in range(paragraphs)
+    )
+    article = f"<article><h1>Synthetic headline</h1>{body}</article>"
+    for level in range(depth):
+        article = f"<div class='layout-{level}'><section>{article}</section></div>"
+    return (
+        "<html><head><title>Synthetic story</title>"
+        "<meta property='og:image' content='/img/lead.jpg'></head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header>"
+        f"<main>{article}<div class='related'>{related}</div></main>"
+        "<footer><p>Copyright</p></footer><script>var tracking = true;</script>"
+        "</body></html>"
+    )
+
+
+def load_pages():
+    """(label, source, html) for every saved fixture page, then the synthetic pages."""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            pages.append((os.path.basename(path), "saved", f.read()))
+    if not pages:
+        print(f"No saved pages in {FIXTURE_DIR}; measuring synthetic pages only", file=sys.stderr)
+    for paragraphs, depth in [(20, 10), (80, 40), (200, 80), (400, 150)]:
+        pages.append((f"synthetic_p{paragraphs}_d{depth}", "synthetic", synthetic_news_page(paragraphs, depth)))
+    return pages
+
+
+def time_call(fn, *args, repeat=3):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(repeat=3):
+    rows = []
+    for name, source, page in load_pages():
+        url = "https://example.com/news/story"
+        new_s, new = time_call(extract_content, page, url, repeat=repeat)
+        old_s, old = time_call(legacy_extract_content, page, url, repeat=repeat)
+        rows.append({
+            "page": name,
+            "source": source,
+            "bytes": len(page.encode("utf-8")),
+            "legacy_seconds": round(old_s, 5),
+            "lxml_seconds": round(new_s, 5),
+            "speedup": round(old_s / new_s, 2) if new_s else None,
+            "same_text": new["text"] == old["text"],
+            "legacy_text_chars": len(old["text"]),
+            "lxml_text_chars": len(new["text"]),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = run(repeat=args.repeat)
+    for r in rows:
+        print(f"{r['page']:<28} {r['bytes']:>9,}B  legacy {r['legacy_seconds']:.4f}s  "
+              f"lxml {r['lxml_seconds']:.4f}s  x{r['speedup']}  same_text={r['same_text']}")
+    print(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
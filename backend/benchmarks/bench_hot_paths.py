@@ -0,0 +1,307 @@
+# backend/benchmarks/bench_hot_paths.py
+"""
+Offline micro-benchmarks for the hot analysis paths.
+
+Times, across input sizes:
+  - fetch_content (main-content extraction)
+  - LightweightMisinformationAgent.analyze_text
+  - LightweightMisinformationAgent.cross_verify_sources
+  - get_trending_topics clustering (NewsAPI answered offline)
+  - similarity_checker.best_evidence_for_claim
+  - MultiLayerNewsVerifier.analyze_cross_source_consensus
+  - timeline add_chunks_to_db (throwaway ChromaDB directory)
+
+No network is used: NewsAPI calls are answered from recordings in
+benchmarks/fixtures/api when present, else from synthetic payloads, and pages
+are synthetic too. No recordings are committed, so out of the box every input
+is synthetic; meta.newsapi_payloads in the results says which were used.
+Gemini is disabled, and with --models stub (the default) every NLP model is
+replaced by a deterministic stub from benchmarks/stubs.py.
+A benchmark whose optional dependencies are missing is reported as skipped.
+
+Results are written as JSON (default: benchmarks/results/hot_paths-<commit>.json)
+so runs from two commits can be compared with --compare.
+
+Usage:
+    python -m backend.benchmarks.bench_hot_paths [--repeat 5] [--only analyze_text]
+        [--models stub|real] [--output out.json] [--compare baseline.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from unittest import mock
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.benchmarks import synthetic  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+class Skip(Exception):
+    """Raised by a benchmark setup when its dependencies are unavailable."""
+
+
+# -------------------- BENCHMARK SETUPS --------------------
+# Each setup takes a size and returns a zero-argument callable to time.
+
+def _lite_agent():
+    try:
+        from backend.agents import misinformation_agent_lite as lite
+    except ImportError as e:
+        raise Skip(f"misinformation_agent_lite unavailable: {e}")
+    lite.HAS_GEMINI_API = False      # never call Gemini from a benchmark
+    lite._nltk_data_ready = True     # and never download NLTK data
+    agent = lite.agent_service
+    agent.warm_up()
+    return agent
+
+
+def setup_fetch_content(size):
+    from backend.benchmarks.bench_fetch_content import synthetic_news_page
+    from backend.utils.fetch_content import extract_content
+    page = synthetic_news_page(paragraphs=size, depth=max(10, size // 4))
+    return lambda: extract_content(page, "https://example.com/news/story")
+
+
+def setup_analyze_text(size):
+    agent = _lite_agent()
+    text = synthetic.news_text(size)
+    sources = [a["url"] for a in synthetic.trend_articles(5)]
+    return lambda: agent.analyze_text(text, sources)
+
+
+def setup_cross_verify_sources(size):
+    agent = _lite_agent()
+    articles = synthetic.trend_articles(size)
+    return lambda: agent.cross_verify_sources("benchmark topic", articles)
+
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+        self.status_code = 200
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        pass
+
+
+def setup_get_trending_topics(size):
+    from backend.utils import trends
+    headlines = synthetic.recorded_newsapi_payload("top_headlines") or synthetic.newsapi_payload(size)
+
+    def fake_get(url, params=None, **kwargs):
+        if "top-headlines" in url:
+            return _FakeResponse(headlines)
+        recorded = synthetic.recorded_newsapi_payload("everything")
+        return _FakeResponse(recorded or synthetic.newsapi_payload(10, seed=len((params or {}).get("q", ""))))
+
+    def run():
+        with mock.patch.object(trends.http_client, "get", fake_get), \
+                mock.patch.dict(os.environ, {"NEWS_API_KEY": "offline-benchmark"}):
+            return trends.get_trending_topics(save=False)
+    return run
+
+
+def setup_best_evidence_for_claim(size):
+    try:
+        from backend.agents.fake_news_detection.similarity_checker import best_evidence_for_claim
+    except ImportError as e:
+        raise Skip(f"similarity_checker unavailable: {e}")
+    articles = synthetic.evidence_articles(size)
+    claim = "Officials in Geneva confirmed new restrictions on imports on Monday"
+    return lambda: best_evidence_for_claim(claim, articles)
+
+
+def setup_analyze_cross_source_consensus(size):
+    try:
+        from backend.agents.fake_news_detection.analyze_url import MultiLayerNewsVerifier
+    except ImportError as e:
+        raise Skip(f"analyze_url unavailable: {e}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        verifier = MultiLayerNewsVerifier()
+    original = synthetic.evidence_articles(1, sentences_per_article=12, seed=99)[0]
+    similar = synthetic.evidence_articles(size, sentences_per_article=12)
+    for i, article in enumerate(similar):
+        article["similarity_score"] = 0.5 + (i % 5) / 10
+    return lambda: verifier.analyze_cross_source_consensus(original, similar)
+
+
+def setup_add_chunks_to_db(size):
+    try:
+        import chromadb
+        from backend.agents.timeline import o2_vector_store as store
+    except ImportError as e:
+        raise Skip(f"timeline vector store unavailable: {e}")
+
+    from backend.utils.model_registry import get_sentence_transformer
+    embedder = get_sentence_transformer(store.EMBEDDING_MODEL_NAME)
+
+    class _EmbeddingFunction:
+        # Chroma embeds documents passed to collection.add(); keep that offline too
+        def __call__(self, input):
+            return [list(map(float, v)) for v in embedder.encode(list(input))]
+
+        def name(self):
+            return "benchmark"
+
+    chunks = synthetic.vector_chunks(size)
+
+    def run():
+        db_dir = tempfile.mkdtemp(prefix="bench_chroma_")
+        try:
+            client = chromadb.PersistentClient(path=db_dir)
+            store._client = client
+            store._collection = client.get_or_create_collection(
+                name=store.COLLECTION_NAME, embedding_function=_EmbeddingFunction())
+            store.add_chunks_to_db(chunks)
+        finally:
+            store.reset_db_client()
+            shutil.rmtree(db_dir, ignore_errors=True)
+    return run
+
+
+BENCHMARKS = {
+    # name: (setup, sizes, size unit, needs NLP models)
+    "fetch_content": (setup_fetch_content, [20, 100, 400], "paragraphs", False),
+    "analyze_text": (setup_analyze_text, [1_000, 10_000, 50_000], "chars", False),
+    "cross_verify_sources": (setup_cross_verify_sources, [5, 20, 50], "articles", False),
+    "get_trending_topics": (setup_get_trending_topics, [20, 100], "headlines", False),
+    "best_evidence_for_claim": (setup_best_evidence_for_claim, [3, 10, 30], "articles", True),
+    "analyze_cross_source_consensus": (setup_analyze_cross_source_consensus, [3, 8, 20], "articles", True),
+    "add_chunks_to_db": (setup_add_chunks_to_db, [10, 50, 200], "chunks", True),
+}
+
+
+# -------------------- RUNNER --------------------
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+def time_callable(fn, repeat):
+    """Best/median/mean wall time over `repeat` runs, after one untimed warm-up run."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+    return {
+        "min_seconds": round(min(samples), 6),
+        "median_seconds": round(statistics.median(samples), 6),
+        "mean_seconds": round(statistics.mean(samples), 6),
+    }
+
+
+def run(names=None, repeat=5, models="stub"):
+    stub_error = None
+    if models == "stub":
+        try:
+            from backend.benchmarks.stubs import install_stub_models
+            install_stub_models()
+        except ImportError as e:
+            stub_error = f"stub models unavailable: {e}"
+
+    rows = []
+    for name, (setup, sizes, unit, needs_models) in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        for size in sizes:
+            row = {"benchmark": name, "size": size, "unit": unit, "repeat": repeat}
+            try:
+                if needs_models and stub_error:
+                    raise Skip(stub_error)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    fn = setup(size)
+                row.update(time_callable(fn, repeat))
+                row["status"] = "ok"
+            except (Skip, ImportError) as e:
+                row.update(status="skipped", reason=str(e))
+            except Exception as e:
+                row.update(status="error", reason=f"{type(e).__name__}: {e}")
+            rows.append(row)
+            print(format_row(row), file=sys.stderr)
+    return rows
+
+
+def format_row(row):
+    label = f"{row['benchmark']}[{row['size']} {row['unit']}]"
+    if row["status"] != "ok":
+        return f"{label:<48} {row['status']}: {row.get('reason', '')}"
+    return f"{label:<48} min {row['min_seconds'] * 1000:9.2f}ms  median {row['median_seconds'] * 1000:9.2f}ms"
+
+
+def compare(rows, baseline_path):
+    """Print median-time ratios against a previous results file (>1.0 means slower now)."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["benchmark"], r["size"]): r for r in json.load(f)["results"]}
+    print(f"\nCompared with {baseline_path}:", file=sys.stderr)
+    for row in rows:
+        old = baseline.get((row["benchmark"], row["size"]))
+        if row["status"] != "ok" or not old or old.get("status") != "ok" or not old["median_seconds"]:
+            continue
+        ratio = row["median_seconds"] / old["median_seconds"]
+        row["baseline_median_seconds"] = old["median_seconds"]
+        row["ratio_vs_baseline"] = round(ratio, 3)
+        flag = "  <-- regression" if ratio > 1.2 else ""
+        print(f"  {row['benchmark']}[{row['size']}]: x{ratio:.2f}{flag}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument("--models", choices=["stub", "real"], default="stub")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/hot_paths-<commit>.json)")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args()
+
+    # Keep agent/model logging from drowning the table
+    logging.disable(logging.WARNING)
+
+    rows = run(args.only, repeat=args.repeat, models=args.models)
+    if args.compare:
+        compare(rows, args.compare)
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"hot_paths-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "commit": commit,
+                "timestamp": datetime.now().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "models": args.models,
+                "repeat": args.repeat,
+                "newsapi_payloads": {name: "recorded" if synthetic.recorded_newsapi_payload(name) else "synthetic"
+                                     for name in ("top_headlines", "everything")},
+            },
+            "results": rows,
+        }, f, indent=2)
+    print(f"\nResults written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
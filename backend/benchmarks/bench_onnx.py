@@ -0,0 +1,248 @@
+# backend/benchmarks/bench_onnx.py
+"""
+Accuracy parity, latency and memory of the ONNX/int8 backend against PyTorch.
+
+Each backend runs in its own subprocess (MODEL_BACKEND=torch, then onnx) so
+resident memory is measured without the other backend's weights loaded. Every
+model is loaded through the model registry, as the agents load it, and scored
+on a small labelled set (benchmarks/fixtures/models/onnx_eval.json):
+
+  - minilm:        all-MiniLM-L6-v2, headline pairs (cosine >= 0.5 means similar)
+  - cross_encoder: ms-marco-MiniLM-L-6-v2, pick the relevant passage
+  - nli:           roberta-large-mnli, premise/hypothesis pairs
+  - sentiment:     cardiffnlp/twitter-roberta-base-sentiment, three classes
+  - sst2:          distilbert-base-uncased-finetuned-sst-2-english
+  - zero_shot:     bart-large-mnli zero-shot classification
+
+Per model the report gives, for each backend, accuracy on the set, load time,
+RSS added by loading the model and median latency per input; and across
+backends, the share of identical predictions and the largest absolute score
+difference. The first ONNX run includes the export and quantization in its
+load time; run twice for steady-state numbers.
+
+Usage:
+    python -m backend.benchmarks.bench_onnx [--only nli,sst2] [--repeat 3] [--output out.json]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.benchmarks.bench_hot_paths import RESULTS_DIR, git_commit  # noqa: E402
+from backend.benchmarks.load_test import rss_mb  # noqa: E402
+
+EVAL_SET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "models", "onnx_eval.json")
+BACKENDS = ("torch", "onnx")
+CARDIFF_LABELS = {"LABEL_0": "negative", "LABEL_1": "neutral", "LABEL_2": "positive"}
+
+
+# -------------------- MODELS --------------------
+# name -> (dataset key, load(), predict(model, item) -> (label, scores), gold(item))
+
+def _load_minilm():
+    from backend.utils.model_registry import get_sentence_transformer
+    return get_sentence_transformer("all-MiniLM-L6-v2")
+
+
+def _predict_minilm(model, item):
+    a, b = model.encode([item["a"], item["b"]], normalize_embeddings=True)
+    cosine = float((a * b).sum())
+    return ("similar" if cosine >= 0.5 else "different"), [cosine]
+
+
+def _load_cross_encoder():
+    from backend.utils.model_registry import get_cross_encoder
+    return get_cross_encoder("cross-encoder/ms-marco-MiniLM-L-6-v2")
+
+
+def _predict_cross_encoder(model, item):
+    scores = [float(s) for s in model.predict([[item["query"], p] for p in item["passages"]])]
+    return scores.index(max(scores)), scores
+
+
+def _label_scores(outputs):
+    """{label: score} from a text-classification result in any of its nestings."""
+    while isinstance(outputs, list) and outputs and isinstance(outputs[0], list):
+        outputs = outputs[0]
+    if isinstance(outputs, dict):
+        outputs = [outputs]
+    return {o["label"]: float(o["score"]) for o in outputs}
+
+
+def _load_nli():
+    from backend.utils.model_registry import get_hf_pipeline
+    return get_hf_pipeline("text-classification", "roberta-large-mnli", truncation=True, top_k=None)
+
+
+def _predict_nli(model, item):
+    scores = _label_scores(model({"text": item["premise"], "text_pair": item["hypothesis"]}))
+    labels = sorted(scores)
+    return max(scores, key=scores.get).upper(), [scores[label] for label in labels]
+
+
+def _load_sentiment():
+    from backend.utils.model_registry import get_hf_pipeline
+    return get_hf_pipeline("sentiment-analysis", "cardiffnlp/twitter-roberta-base-sentiment")
+
+
+def _predict_sentiment(model, item):
+    top = model(item["text"])[0]
+    return CARDIFF_LABELS.get(top["label"], top["label"]), [float(top["score"])]
+
+
+def _load_sst2():
+    from backend.utils.model_registry import get_hf_pipeline
+    return get_hf_pipeline("sentiment-analysis", "distilbert-base-uncased-finetuned-sst-2-english")
+
+
+def _predict_sst2(model, item):
+    top = model(item["text"])[0]
+    return top["label"], [float(top["score"])]
+
+
+def _load_zero_shot():
+    from backend.utils.model_registry import get_hf_pipeline
+    return get_hf_pipeline("zero-shot-classification", "facebook/bart-large-mnli")
+
+
+def _predict_zero_shot(model, item):
+    result = model(item["text"], item["labels"])
+    scores = dict(zip(result["labels"], result["scores"]))
+    return result["labels"][0], [float(scores[label]) for label in item["labels"]]
+
+
+MODELS = {
+    "minilm": ("similarity", _load_minilm, _predict_minilm,
+               lambda item: "similar" if item["similar"] else "different"),
+    "cross_encoder": ("rerank", _load_cross_encoder, _predict_cross_encoder, lambda item: item["relevant"]),
+    "nli": ("nli", _load_nli, _predict_nli, lambda item: item["label"]),
+    "sentiment": ("sentiment", _load_sentiment, _predict_sentiment, lambda item: item["label"]),
+    "sst2": ("binary_sentiment", _load_sst2, _predict_sst2, lambda item: item["label"]),
+    "zero_shot": ("zero_shot", _load_zero_shot, _predict_zero_shot, lambda item: item["label"]),
+}
+
+
+# -------------------- WORKER --------------------
+def evaluate(names, repeat):
+    """Load and score each model in this process; returns per-model results."""
+    from backend.utils import onnx_backend
+
+    with open(EVAL_SET, encoding="utf-8") as f:
+        data = json.load(f)
+    results = {}
+    for name in names:
+        key, load, predict, gold = MODELS[name]
+        items = data[key]
+        rss_before = rss_mb(os.getpid())
+        failed_before = len(onnx_backend.failed)
+        start = time.perf_counter()
+        try:
+            model = load()
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+            continue
+        load_seconds = time.perf_counter() - start
+        rss_after = rss_mb(os.getpid())
+
+        predict(model, items[0])  # warm-up
+        labels, scores, samples = [], [], []
+        for item in items:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                label, item_scores = predict(model, item)
+                timings.append(time.perf_counter() - start)
+            samples.append(min(timings))
+            labels.append(label)
+            scores.append(item_scores)
+        results[name] = {
+            "backend": "onnx" if onnx_backend.enabled() and onnx_backend.available()
+            and len(onnx_backend.failed) == failed_before else "torch",
+            "load_seconds": round(load_seconds, 3),
+            "rss_delta_mb": round(rss_after - rss_before, 1) if rss_before is not None else None,
+            "median_seconds": round(statistics.median(samples), 5),
+            "accuracy": round(sum(label == gold(item) for label, item in zip(labels, items)) / len(items), 3),
+            "labels": labels,
+            "scores": scores,
+        }
+    return results
+
+
+def run_backend(backend, names, repeat):
+    env = {**os.environ, "MODEL_BACKEND": backend, "INFERENCE_BATCHING": "0", "PYTHONPATH": PROJECT_ROOT}
+    output = subprocess.run(
+        [sys.executable, "-m", "backend.benchmarks.bench_onnx", "--worker", "--only", ",".join(names),
+         "--repeat", str(repeat)],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True)
+    if output.returncode != 0:
+        raise RuntimeError(f"{backend} worker failed:\n{output.stderr[-2000:]}")
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def compare(torch_row, onnx_row):
+    if "error" in torch_row or "error" in onnx_row:
+        return {}
+    agree = sum(a == b for a, b in zip(torch_row["labels"], onnx_row["labels"]))
+    diff = max((abs(a - b) for ts, os_ in zip(torch_row["scores"], onnx_row["scores"]) for a, b in zip(ts, os_)),
+               default=0.0)
+    return {
+        "label_agreement": round(agree / len(torch_row["labels"]), 3),
+        "max_score_diff": round(diff, 4),
+        "speedup": round(torch_row["median_seconds"] / onnx_row["median_seconds"], 2)
+        if onnx_row["median_seconds"] else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", default=",".join(MODELS), help=f"comma-separated, from: {', '.join(MODELS)}")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per input (the fastest is kept)")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/onnx-<commit>.json)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.only.split(",") if n.strip()]
+    unknown = [n for n in names if n not in MODELS]
+    if unknown:
+        parser.error(f"unknown models: {', '.join(unknown)}")
+
+    if args.worker:
+        print(json.dumps(evaluate(names, args.repeat)))
+        return
+
+    by_backend = {backend: run_backend(backend, names, args.repeat) for backend in BACKENDS}
+    rows = []
+    for name in names:
+        row = {"model": name, **{backend: by_backend[backend][name] for backend in BACKENDS}}
+        row["parity"] = compare(row["torch"], row["onnx"])
+        rows.append(row)
+        summary = {b: {k: row[b].get(k) for k in ("backend", "accuracy", "median_seconds", "rss_delta_mb", "error")
+                       if k in row[b]} for b in BACKENDS}
+        print(f"{name:<14} {json.dumps(summary)} {json.dumps(row['parity'])}", file=sys.stderr)
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"onnx-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "commit": commit,
+                "timestamp": datetime.now().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+            },
+            "results": rows,
+        }, f, indent=2)
+    print(f"\nResults written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+# backend/benchmarks/bench_pipelines.py
+"""
+End-to-end pipeline benchmarks over recorded network and LLM traffic.
+
+Record once (needs network and API keys), then replay anywhere:
+
+    python -m backend.benchmarks.bench_pipelines record fact_check "Claim text ..."
+    python -m backend.benchmarks.bench_pipelines replay fact_check "Claim text ..." \
+        [--latency 0|recorded|<seconds>] [--latency-scale 1.0] [--repeat 3]
+
+Pipelines:
+  - fact_check:   fact_judge_jury.fact_check_pipeline(<claim>)
+  - cross_verify: analyze_url.cross_verify_news(<url>)
+  - timeline:     one timeline search step (timeline.main.process_search_query)
+                  for <topic>; events go to an in-memory list instead of Neo4j,
+                  whose Bolt traffic can't be recorded.
+
+Each pipeline/input pair gets its own cassette in benchmarks/cassettes
+(override with --cassette); see backend/utils/cassette.py for what is
+captured. In replay mode a request missing from the cassette fails like a
+network error, and the count of such misses is reported with the timings.
+
+Results are written as JSON (default: benchmarks/results/pipelines-<commit>.json).
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.benchmarks.bench_hot_paths import RESULTS_DIR, git_commit  # noqa: E402
+from backend.utils import cassette  # noqa: E402
+
+CASSETTE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cassettes")
+
+
+class _EventList:
+    """Stands in for Neo4jGraph in the timeline step: keeps added events in memory."""
+
+    def __init__(self):
+        self.events = []
+
+    def add_event(self, event):
+        self.events.append(event)
+
+
+def run_fact_check(value):
+    from backend.agents.fact_judge_jury import fact_check_pipeline
+    return fact_check_pipeline(value)
+
+
+def run_cross_verify(value):
+    from backend.agents.fake_news_detection.analyze_url import cross_verify_news
+    return cross_verify_news(value)
+
+
+def run_timeline(value):
+    from backend.agents.timeline.main import process_search_query
+    graph = _EventList()
+    process_search_query(value, set(), graph)
+    return {"events": len(graph.events)}
+
+
+PIPELINES = {
+    "fact_check": run_fact_check,
+    "cross_verify": run_cross_verify,
+    "timeline": run_timeline,
+}
+
+
+def default_cassette(pipeline, value):
+    digest = hashlib.sha256(value.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(CASSETTE_DIR, f"{pipeline}-{digest}.jsonl")
+
+
+def clear_caches():
+    """Drop in-process caches so every replay run does the same work as the first."""
+    from backend.utils import api_quota, extraction, llm_gateway
+    llm_gateway._cache.clear()
+    extraction._cache.clear()
+    with api_quota._lock:
+        api_quota._responses.clear()
+
+
+def run(mode, pipeline, value, path, repeat):
+    if mode == "record" and os.path.exists(path):
+        os.remove(path)  # a recording always starts from an empty cassette
+    active = cassette.install(mode, path)
+    fn = PIPELINES[pipeline]
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == "replay":
+            fn(value)  # untimed warm-up: imports and model loading
+        for _ in range(1 if mode == "record" else repeat):
+            active.rewind()
+            clear_caches()
+            start = time.perf_counter()
+            fn(value)
+            samples.append(time.perf_counter() - start)
+    return {
+        "pipeline": pipeline,
+        "mode": mode,
+        "cassette": os.path.relpath(path, PROJECT_ROOT),
+        "runs": len(samples),
+        "min_seconds": round(min(samples), 4),
+        "median_seconds": round(statistics.median(samples), 4),
+        "cassette_stats": dict(active.stats),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("pipeline", choices=sorted(PIPELINES))
+    parser.add_argument("value", help="claim text, article URL or timeline topic")
+    parser.add_argument("--cassette", help="cassette file (default: benchmarks/cassettes/<pipeline>-<hash>.jsonl)")
+    parser.add_argument("--repeat", type=int, default=3, help="replay runs")
+    parser.add_argument("--latency", help="replayed latency: 0, recorded or seconds (overrides CASSETTE_LATENCY)")
+    parser.add_argument("--latency-scale", type=float, help="scale for --latency recorded")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/pipelines-<commit>.json)")
+    args = parser.parse_args()
+
+    if args.latency is not None:
+        cassette.CASSETTE_LATENCY = args.latency
+    if args.latency_scale is not None:
+        cassette.CASSETTE_LATENCY_SCALE = args.latency_scale
+    logging.disable(logging.WARNING)
+
+    path = args.cassette or default_cassette(args.pipeline, args.value)
+    row = run(args.mode, args.pipeline, args.value, path, args.repeat)
+    row["latency"] = cassette.CASSETTE_LATENCY
+    print(json.dumps(row, indent=2), file=sys.stderr)
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"pipelines-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "commit": commit,
+                "timestamp": datetime.now().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+            },
+            "results": [row],
+        }, f, indent=2)
+    print(f"\nResults written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# backend/benchmarks/bench_vector_store.py
+"""
+Add and query latency of the vector store backends (utils/vector_store.py).
+
+For each backend (memory; chroma when installed, in a throwaway directory)
+and store size (100, 1k, 10k vectors by default), times:
+  - add:          inserting all vectors in batches of --batch (one article's chunks)
+  - query:        median single-vector top-5 query
+  - query_where:  the same with a metadata filter matching a tenth of the store
+  - query_batch:  one call with --batch query vectors (add_chunks_to_db's pattern)
+
+Vectors are random unit vectors of MiniLM's 384 dimensions; no model is loaded.
+Results are written as JSON (default: benchmarks/results/vector_store-<commit>.json).
+
+Usage:
+    python -m backend.benchmarks.bench_vector_store [--sizes 100,1000,10000] [--queries 50]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.benchmarks.bench_hot_paths import RESULTS_DIR, git_commit  # noqa: E402
+from backend.utils.vector_store import BACKENDS, open_store  # noqa: E402
+
+DIM = 384
+
+
+def unit_vectors(count, seed):
+    vectors = np.random.default_rng(seed).standard_normal((count, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def median_seconds(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return round(statistics.median(samples), 6)
+
+
+def bench(backend, size, queries, batch):
+    directory = tempfile.mkdtemp(prefix="bench_vectors_")
+    try:
+        store = open_store(f"bench_{size}", backend, path=directory)
+        vectors = unit_vectors(size, seed=size)
+        ids = [f"chunk-{i}" for i in range(size)]
+        metadatas = [{"publisher": f"publisher-{i % 10}", "chunk": i} for i in range(size)]
+        documents = [f"document {i}" for i in range(size)]
+
+        start = time.perf_counter()
+        for offset in range(0, size, batch):
+            end = offset + batch
+            store.add(ids=ids[offset:end], embeddings=vectors[offset:end].tolist(),
+                      documents=documents[offset:end], metadatas=metadatas[offset:end])
+        add_seconds = time.perf_counter() - start
+
+        probes = unit_vectors(queries, seed=size + 1).tolist()
+        probe = iter(probes * 3)
+        return {
+            "backend": backend,
+            "size": size,
+            "add_seconds": round(add_seconds, 4),
+            "add_per_vector_us": round(add_seconds / size * 1e6, 2),
+            "query_seconds": median_seconds(
+                lambda: store.query(query_embeddings=[next(probe)], n_results=5), queries),
+            "query_where_seconds": median_seconds(
+                lambda: store.query(query_embeddings=[next(probe)], n_results=5,
+                                    where={"publisher": "publisher-3"}), queries),
+            "query_batch_seconds": median_seconds(
+                lambda: store.query(query_embeddings=probes[:batch], n_results=1), max(3, queries // 10)),
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="100,1000,10000", help="store sizes (vectors)")
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--queries", type=int, default=50, help="timed queries per measurement")
+    parser.add_argument("--batch", type=int, default=20, help="vectors per add() and per batched query")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/vector_store-<commit>.json)")
+    args = parser.parse_args()
+
+    rows = []
+    for backend in args.backends.split(","):
+        for size in (int(s) for s in args.sizes.split(",")):
+            try:
+                row = bench(backend, size, args.queries, args.batch)
+            except ImportError as e:
+                print(f"{backend:<7} skipped: {e}", file=sys.stderr)
+                break
+            rows.append(row)
+            print(f"{backend:<7} n={size:<6} add {row['add_seconds']:.4f}s  "
+                  f"query {row['query_seconds'] * 1000:.3f}ms  "
+                  f"where {row['query_where_seconds'] * 1000:.3f}ms  "
+                  f"batch({args.batch}) {row['query_batch_seconds'] * 1000:.3f}ms", file=sys.stderr)
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"vector_store-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "commit": commit,
+                "timestamp": datetime.now().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "dim": DIM,
+                "batch": args.batch,
+            },
+            "results": rows,
+        }, f, indent=2)
+    print(f"\nResults written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+# backend/benchmarks/load_test.py
+"""
+End-to-end load test of the API against local stub upstreams.
+
+Starts benchmarks/stub_upstreams.py, then the API (uvicorn backend.direct_api:app)
+with UPSTREAM_REDIRECT_URL pointing at it, dummy API keys and a throwaway
+article store, and drives each scenario at increasing concurrency:
+
+    python -m backend.benchmarks.load_test [--scenarios analyze_url,factcheck]
+        [--concurrency 1,2,4,8,16] [--requests 32]
+        [--latency gemini=1.5] [--error-rate serper=0.05]
+        [--target http://127.0.0.1:8000]   # an API that is already running
+        [--client-limits default]          # keep the free-tier throttles
+
+Scenarios:
+  - analyze_url / analyze_text: POST /api/analyze
+  - factcheck:                  POST /api/factcheck
+  - bias_topic:                 POST /api/bias/analyze-topic, polled to completion
+  - timeline:                   POST /api/timeline/generate, polled to completion.
+                                Needs a reachable Neo4j (Bolt can't be stubbed);
+                                without one every job ends as "failed" and is
+                                counted as an error.
+
+Every request uses a distinct input so the analysis caches don't turn the
+test into a cache benchmark. The spawned API's own client-side throttles (LLM
+rate limits, news/search API quotas, circuit breakers) are lifted by default
+(UNLIMITED_ENV) so the numbers measure the instance, not free-tier budgets or
+breakers tripped by stub errors; --client-limits default keeps them. The
+values used are recorded in the results. Per level the report has p50/p95/p99 latency,
+throughput, error count, the server's peak RSS during the level and its RSS
+afterwards (from /proc, spawned server only), and the stub's per-provider
+request counts.
+
+Results are written as JSON (default: benchmarks/results/load-<commit>.json).
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.benchmarks import synthetic  # noqa: E402
+from backend.benchmarks.bench_hot_paths import RESULTS_DIR, git_commit  # noqa: E402
+from backend.benchmarks.stub_upstreams import StubUpstreams, parse_mapping  # noqa: E402
+
+DUMMY_KEYS = ["NEWS_API_KEY", "NEWSAPI_KEY", "GNEWS_API_KEY", "SERPER_API_KEY", "SERPAPI_KEY",
+              "NEWSDATA_API_KEY", "GOOGLE_FC_API_KEY", "GEMINI_API_KEY", "GROQ_API_KEY"]
+JOB_TIMEOUT = 600
+POLL_INTERVAL = 0.5
+READY_TIMEOUT = 600
+
+# Effectively unlimited client-side throttles for the spawned API
+UNLIMITED_ENV = {
+    "LLM_RATE_LIMITS": ",".join(f"{model}=1000000:1000000000" for model in
+                                ("gemini-2.5-flash", "gemini-2.5-pro", "llama-3.1-8b-instant")),
+    "API_QUOTAS": ",".join(f"{provider}=0:0" for provider in
+                           ("gnews", "newsdata", "serper", "serpapi", "google_factcheck")),
+    "CIRCUIT_FAILURE_THRESHOLD": "1000000",
+}
+CLIENT_LIMIT_KEYS = tuple(UNLIMITED_ENV)
+
+
+def _post(base, path, payload):
+    response = requests.post(base + path, json=payload, timeout=JOB_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+def _poll(base, path):
+    deadline = time.monotonic() + JOB_TIMEOUT
+    while time.monotonic() < deadline:
+        response = requests.get(base + path, timeout=30)
+        response.raise_for_status()
+        status = response.json()["data"]["status"]
+        if status == "complete":
+            return
+        if status == "failed":
+            raise RuntimeError(f"job failed: {path}")
+        time.sleep(POLL_INTERVAL)
+    raise TimeoutError(f"job did not finish within {JOB_TIMEOUT}s: {path}")
+
+
+def scenario_analyze_url(base, i):
+    _post(base, "/api/analyze", {"input": f"https://stub-news-{i % 7}.example/world/story-{i}", "type": "url"})
+
+
+def scenario_analyze_text(base, i):
+    _post(base, "/api/analyze", {"input": synthetic.news_text(2000, seed=i), "type": "text"})
+
+
+def scenario_factcheck(base, i):
+    _post(base, "/api/factcheck", {"message": f"Officials confirmed the stub claim number {i}."})
+
+
+def scenario_bias_topic(base, i):
+    job = _post(base, "/api/bias/analyze-topic", {"topic": f"stub topic {i}"})
+    _poll(base, f"/api/bias/results/{job['job_id']}")
+
+
+def scenario_timeline(base, i):
+    job = _post(base, "/api/timeline/generate", {"topic": f"stub topic {i}"})
+    _poll(base, f"/api/timeline/results/{job['job_id']}")
+
+
+SCENARIOS = {
+    "analyze_url": scenario_analyze_url,
+    "analyze_text": scenario_analyze_text,
+    "factcheck": scenario_factcheck,
+    "bias_topic": scenario_bias_topic,
+    "timeline": scenario_timeline,
+}
+
+
+# -------------------- SERVER PROCESS --------------------
+def rss_mb(pid):
+    """Resident set size of `pid` in MB, or None when /proc isn't available."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+    return None
+
+
+class RssSampler:
+    """Samples a process's RSS in the background and keeps the peak."""
+
+    def __init__(self, pid, interval=0.2):
+        self.pid = pid
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            value = rss_mb(self.pid)
+            if value is not None and (self.peak is None or value > self.peak):
+                self.peak = value
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_api(stub_url, store_dir, log_file, client_limits="unlimited"):
+    port = _free_port()
+    env = {**os.environ, **{key: "load-test" for key in DUMMY_KEYS},
+           **(UNLIMITED_ENV if client_limits == "unlimited" else {}),
+           "UPSTREAM_REDIRECT_URL": stub_url,
+           "ARTICLE_STORE_PATH": os.path.join(store_dir, "articles.sqlite3"),
+           "CASSETTE_MODE": "off",
+           "PYTHONPATH": PROJECT_ROOT}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.direct_api:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=PROJECT_ROOT, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+    base = f"http://127.0.0.1:{port}"
+    wait_ready(base, process)
+    return process, base, {key: env.get(key, "(default)") for key in CLIENT_LIMIT_KEYS}
+
+
+def wait_ready(base, process=None):
+    deadline = time.monotonic() + READY_TIMEOUT
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"API exited with code {process.returncode} before becoming ready")
+        try:
+            if requests.get(base + "/readyz", timeout=5).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(1)
+    raise TimeoutError(f"API at {base} not ready after {READY_TIMEOUT}s")
+
+
+# -------------------- LOAD --------------------
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run_level(base, scenario, concurrency, total, offset, pid):
+    fn = SCENARIOS[scenario]
+    latencies, errors = [], []
+
+    def one(i):
+        start = time.perf_counter()
+        try:
+            fn(base, offset + i)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+            return
+        latencies.append(time.perf_counter() - start)
+
+    with RssSampler(pid) if pid else contextlib.nullcontext() as sampler:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(one, range(total)))
+        elapsed = time.perf_counter() - start
+
+    row = {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": len(errors),
+        "throughput_rps": round(len(latencies) / elapsed, 3) if elapsed else None,
+        "wall_seconds": round(elapsed, 3),
+        "rss_peak_mb": sampler.peak if sampler else None,
+        "rss_after_mb": rss_mb(pid) if pid else None,
+    }
+    if latencies:
+        row.update({
+            "p50_seconds": round(percentile(latencies, 0.50), 4),
+            "p95_seconds": round(percentile(latencies, 0.95), 4),
+            "p99_seconds": round(percentile(latencies, 0.99), 4),
+            "mean_seconds": round(statistics.mean(latencies), 4),
+        })
+    if errors:
+        row["sample_errors"] = sorted(set(errors))[:5]
+    return row
+
+
+def format_row(row):
+    latency = (f"p50 {row['p50_seconds']:.3f}s  p95 {row['p95_seconds']:.3f}s  p99 {row['p99_seconds']:.3f}s"
+               if "p50_seconds" in row else "no successful requests")
+    rss = f"  rss peak {row['rss_peak_mb']} MB / after {row['rss_after_mb']} MB" if row["rss_peak_mb"] else ""
+    return (f"{row['scenario']:<13} c={row['concurrency']:<3} {latency}  "
+            f"{row['throughput_rps']} req/s  errors {row['errors']}/{row['requests']}{rss}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", default="analyze_url,analyze_text,factcheck",
+                        help=f"comma-separated, from: {', '.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", default="1,2,4,8,16", help="concurrency levels to step through")
+    parser.add_argument("--requests", type=int, default=32, help="requests per level (at least the concurrency)")
+    parser.add_argument("--latency", default="", help="stub latency per provider, e.g. gemini=1.5,groq=0.4")
+    parser.add_argument("--error-rate", default="", help="stub 503 probability per provider, e.g. serper=0.05")
+    parser.add_argument("--target", help="an already-running API (its upstreams are not redirected by this script)")
+    parser.add_argument("--client-limits", choices=["unlimited", "default"], default="unlimited",
+                        help="LLM rate limits, API quotas and circuit breakers of the spawned API")
+    parser.add_argument("--keep-logs", action="store_true", help="keep the spawned API's log file")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/load-<commit>.json)")
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    stub = StubUpstreams(latency=parse_mapping(args.latency), error_rate=parse_mapping(args.error_rate))
+    stub_url = stub.start()
+    store_dir = tempfile.mkdtemp(prefix="load-test-")
+    log_path = os.path.join(store_dir, "api.log")
+    process = None
+    rows = []
+    client_limits = None
+    try:
+        if args.target:
+            base, pid = args.target.rstrip("/"), None
+            client_limits = "unknown (external target)"
+            wait_ready(base)
+        else:
+            print(f"Starting API against stub upstreams at {stub_url} (log: {log_path})", file=sys.stderr)
+            with open(log_path, "wb") as log_file:
+                process, base, client_limits = start_api(stub_url, store_dir, log_file, args.client_limits)
+            pid = process.pid
+        rss_idle = rss_mb(pid) if pid else None
+
+        offset = 0
+        for scenario in scenarios:
+            for concurrency in levels:
+                before = dict(stub.counts)
+                row = run_level(base, scenario, concurrency, max(args.requests, concurrency), offset, pid)
+                row["upstream_requests"] = {k: v - before.get(k, 0) for k, v in stub.counts.items()
+                                            if v != before.get(k, 0)}
+                offset += row["requests"]
+                rows.append(row)
+                print(format_row(row), file=sys.stderr)
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        stub.stop()
+        if not args.keep_logs:
+            shutil.rmtree(store_dir, ignore_errors=True)
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"load-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "commit": commit,
+                "timestamp": datetime.now().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "target": args.target or "spawned",
+                "stub_latency": stub.latency,
+                "stub_error_rate": stub.error_rate,
+                "rss_idle_mb": rss_idle,
+                "client_limits": client_limits,
+            },
+            "results": rows,
+        }, f, indent=2)
+    print(f"\nResults written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
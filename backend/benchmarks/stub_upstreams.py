@@ -0,0 +1,265 @@
+# backend/benchmarks/stub_upstreams.py
+"""
+Local stand-ins for every upstream the API calls, for load tests.
+
+One HTTP server answers as NewsAPI, GNews, Serper, SerpAPI, NewsData,
+Google Fact Check, Gemini (REST generateContent), Groq (OpenAI-style chat
+completions) and DuckDuckGo's HTML/lite search; any other host gets a
+synthetic article page. Start the API with
+UPSTREAM_REDIRECT_URL=<this server> (utils/upstream_redirect.py) so all of its
+outbound HTTP lands here, tagged with the original host.
+
+Each provider has a configurable latency (jittered +/-25%) and error rate
+(503 responses). Payloads come from benchmarks/synthetic.py, and LLM replies
+are JSON shaped for the prompt they answer (see LLM_REPLIES), so the agents'
+parsing code runs as it would against the real models.
+
+Usage:
+    python -m backend.benchmarks.stub_upstreams [--port 8900]
+        [--latency gemini=1.5,groq=0.4] [--error-rate serper=0.05]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.benchmarks import synthetic  # noqa: E402
+from backend.utils.upstream_redirect import UPSTREAM_HOST_HEADER  # noqa: E402
+
+HOST_PROVIDERS = {
+    "newsapi.org": "newsapi",
+    "gnews.io": "gnews",
+    "google.serper.dev": "serper",
+    "serpapi.com": "serpapi",
+    "newsdata.io": "newsdata",
+    "factchecktools.googleapis.com": "google_factcheck",
+    "generativelanguage.googleapis.com": "gemini",
+    "api.groq.com": "groq",
+    "html.duckduckgo.com": "duckduckgo",
+    "lite.duckduckgo.com": "duckduckgo",
+}
+
+# Seconds; roughly what the real services take
+DEFAULT_LATENCY = {
+    "newsapi": 0.3, "gnews": 0.3, "serper": 0.4, "serpapi": 1.5, "newsdata": 0.4,
+    "google_factcheck": 0.3, "gemini": 2.0, "groq": 0.5, "duckduckgo": 0.5, "article": 0.2,
+}
+
+# (prompt marker, reply): the first marker found in the prompt picks the reply
+LLM_REPLIES = [
+    ('"analysis_results"', {"analysis_results": [
+        {"category_name": "Framing", "score": 0, "justification": "Stub justification."}]}),
+    ('"search_query"', {"search_query": "stub search query", "keywords": ["stub", "news"]}),
+    ('"misconceptions"', {"misconceptions": ["Is the stub claim accurate?"]}),
+    ('"event_title"', [{"event_title": "Stub event", "description": "Officials announced a stub event.",
+                        "explicit_date": "2025-01-01", "actors": ["Officials"], "location": "Geneva"}]),
+    ("DuckDuckGo search strings", ["stub follow-up query"]),
+]
+DEFAULT_LLM_REPLY = {
+    "claims": ["Officials confirmed the stub claim."],
+    "overall_verdict": "UNVERIFIED", "confidence_score": 0.5, "executive_summary": "Stub reply.",
+    "claim_by_claim_analysis": [], "key_insights": [],
+    "verdict": "unverified", "confidence": 0.5, "summary": "Stub reply.",
+}
+
+
+def parse_mapping(spec: str) -> Dict[str, float]:
+    """"gemini=1.5,groq=0.4" -> {"gemini": 1.5, "groq": 0.4}"""
+    mapping = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        name, value = item.split("=", 1)
+        mapping[name.strip()] = float(value)
+    return mapping
+
+
+def llm_reply(prompt: str) -> str:
+    for marker, reply in LLM_REPLIES:
+        if marker in prompt:
+            return json.dumps(reply)
+    return json.dumps(DEFAULT_LLM_REPLY)
+
+
+class StubUpstreams:
+    def __init__(self, port: int = 0, latency: Optional[Dict[str, float]] = None,
+                 error_rate: Optional[Dict[str, float]] = None, seed: int = 0):
+        self.latency = {**DEFAULT_LATENCY, **(latency or {})}
+        self.error_rate = error_rate or {}
+        self.counts: Dict[str, int] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-upstreams", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _draw(self, provider: str):
+        """(delay, fail) for one request."""
+        with self._lock:
+            self.counts[provider] = self.counts.get(provider, 0) + 1
+            jitter = self._rng.uniform(0.75, 1.25)
+            fail = self._rng.random() < self.error_rate.get(provider, 0.0)
+        return self.latency.get(provider, 0.0) * jitter, fail
+
+    # -------------------- PAYLOADS --------------------
+    @staticmethod
+    def _seed(path: str) -> int:
+        return sum(path.encode("utf-8")) % 10_000
+
+    def payload(self, provider: str, path: str, query: Dict[str, str], body: Dict):
+        seed = self._seed(path + json.dumps(query, sort_keys=True))
+        news = synthetic.newsapi_payload(10, seed=seed)
+        articles = news["articles"]
+        if provider == "newsapi":
+            return news
+        if provider == "gnews":
+            return {"totalArticles": len(articles), "articles": [
+                {"title": a["title"], "description": a["description"], "content": a["description"],
+                 "url": a["url"], "image": a["urlToImage"], "publishedAt": a["publishedAt"],
+                 "source": {"name": a["source"]["name"], "url": f"https://{a['source']['name']}"}}
+                for a in articles]}
+        if provider == "serper":
+            results = [{"title": a["title"], "link": a["url"], "snippet": a["description"][:160],
+                        "date": "1 day ago", "source": a["source"]["name"], "position": i + 1}
+                       for i, a in enumerate(articles)]
+            return {"organic": results, "news": results}
+        if provider == "serpapi":
+            return {"visual_matches": [{"title": a["title"], "link": a["url"], "source": a["source"]["name"],
+                                        "thumbnail": a["urlToImage"]} for a in articles]}
+        if provider == "newsdata":
+            return {"status": "success", "totalResults": len(articles), "results": [
+                {"title": a["title"], "link": a["url"], "description": a["description"],
+                 "content": a["description"], "pubDate": "2025-01-01 00:00:00",
+                 "source_id": a["source"]["name"]} for a in articles]}
+        if provider == "google_factcheck":
+            return {"claims": [{"text": a["title"], "claimant": a["source"]["name"], "claimDate": a["publishedAt"],
+                                "claimReview": [{"publisher": {"name": "Stub Checkers", "site": "stubcheck.org"},
+                                                 "url": a["url"], "title": a["title"], "reviewDate": a["publishedAt"],
+                                                 "textualRating": "Mostly true", "languageCode": "en"}]}
+                               for a in articles[:3]]}
+        if provider == "gemini":
+            prompt = " ".join(part.get("text", "") for content in body.get("contents", [])
+                              for part in content.get("parts", []))
+            return {"candidates": [{"content": {"parts": [{"text": llm_reply(prompt)}], "role": "model"},
+                                    "finishReason": "STOP", "index": 0}],
+                    "usageMetadata": {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": 64,
+                                      "totalTokenCount": len(prompt) // 4 + 64}}
+        if provider == "groq":
+            prompt = " ".join(m.get("content", "") for m in body.get("messages", []))
+            return {"id": "chatcmpl-stub", "object": "chat.completion", "created": int(time.time()),
+                    "model": body.get("model", "stub"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": llm_reply(prompt)},
+                                 "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": 64,
+                              "total_tokens": len(prompt) // 4 + 64}}
+        return None
+
+    @staticmethod
+    def duckduckgo_page(articles) -> str:
+        links = "".join(f"<div class='result'><a class='result__a' href='{a['url']}'>{a['title']}</a>"
+                        f"<a class='result__url' href='{a['url']}'>{a['url']}</a></div>" for a in articles)
+        return f"<html><body>{links}</body></html>"
+
+    @staticmethod
+    def article_page(host: str, path: str) -> str:
+        seed = sum((host + path).encode("utf-8")) % 10_000
+        rng = random.Random(seed)
+        title = synthetic.headline(rng).capitalize()
+        paragraphs = "".join(f"<p>{synthetic.paragraph(rng)}</p>" for _ in range(12))
+        return (f"<html><head><title>{title}</title>"
+                f"<meta property='og:title' content='{title}'><meta property='og:site_name' content='{host}'>"
+                f"<meta property='og:image' content='https://{host}/img/lead.jpg'>"
+                f"<meta name='author' content='Stub Reporter'></head>"
+                f"<body><article><h1>{title}</h1>{paragraphs}</article></body></html>")
+
+    # -------------------- HANDLER --------------------
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _handle(self):
+                host = (self.headers.get(UPSTREAM_HOST_HEADER) or "").lower()
+                provider = HOST_PROVIDERS.get(host, "article")
+                parts = urllib.parse.urlsplit(self.path)
+                query = dict(urllib.parse.parse_qsl(parts.query))
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else {}
+                except ValueError:
+                    body = {}
+
+                delay, fail = stub._draw(provider)
+                time.sleep(delay)
+                if fail:
+                    return self._respond(503, b'{"error": "stub failure"}', "application/json")
+
+                if provider == "article":
+                    if parts.path.endswith((".jpg", ".png", ".gif", ".webp")):
+                        return self._respond(200, b"\xff\xd8\xff\xe0stub-image", "image/jpeg")
+                    return self._respond(200, stub.article_page(host, parts.path).encode("utf-8"),
+                                         "text/html; charset=utf-8")
+                if provider == "duckduckgo":
+                    articles = synthetic.newsapi_payload(10, seed=stub._seed(self.path))["articles"]
+                    return self._respond(200, stub.duckduckgo_page(articles).encode("utf-8"),
+                                         "text/html; charset=utf-8")
+                payload = stub.payload(provider, parts.path, query, body if isinstance(body, dict) else {})
+                return self._respond(200, json.dumps(payload).encode("utf-8"), "application/json")
+
+            do_GET = _handle
+            do_POST = _handle
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", default="", help="per-provider seconds, e.g. gemini=1.5,groq=0.4")
+    parser.add_argument("--error-rate", default="", help="per-provider 503 probability, e.g. serper=0.05")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stub = StubUpstreams(args.port, parse_mapping(args.latency), parse_mapping(args.error_rate), args.seed)
+    print(f"Stub upstreams listening on {stub.url}; start the API with UPSTREAM_REDIRECT_URL={stub.url}")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# backend/benchmarks/stubs.py
+"""
+Deterministic stand-ins for the heavy NLP models, used by the offline
+benchmarks so they run without downloads, GPUs or network access.
+
+They follow the call signatures the agents use (encode / predict / pipeline
+__call__ / spaCy Doc attributes) and are cheap, so stub-mode timings measure
+the Python around the models rather than model inference itself. Run the
+benchmarks with --models real to include inference.
+"""
+import hashlib
+import re
+
+import numpy as np
+
+from backend.utils.model_registry import set_model_override
+
+EMBEDDING_DIM = 384
+
+_WORD_RE = re.compile(r"\w+")
+_SENT_RE = re.compile(r"(?<=[.!?])\s+")
+_ENTITY_RE = re.compile(r"\b(?:[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b")
+_STOP_WORDS = {"the", "a", "an", "and", "or", "of", "to", "in", "on", "for", "with", "is", "was", "are", "said"}
+_ENTITY_LABELS = ("PERSON", "ORG", "GPE")
+
+
+def _bucket(token: str, buckets: int) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little") % buckets
+
+
+class StubSentenceTransformer:
+    """Hashed bag-of-words embeddings with the SentenceTransformer.encode signature."""
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def _embed(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for token in _WORD_RE.findall(text.lower()):
+            vec[_bucket(token, self.dim)] += 1.0
+        return vec
+
+    def encode(self, sentences, convert_to_tensor=False, normalize_embeddings=False, **kwargs):
+        single = isinstance(sentences, str)
+        matrix = np.stack([self._embed(s) for s in ([sentences] if single else sentences)]) \
+            if (single or len(sentences)) else np.zeros((0, self.dim), dtype=np.float32)
+        if normalize_embeddings:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.where(norms == 0, 1.0, norms)
+        result = matrix[0] if single else matrix
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(result)
+        return result
+
+
+class StubCrossEncoder:
+    """Token-overlap relevance scores with the CrossEncoder.predict signature."""
+
+    def predict(self, pairs, convert_to_numpy=True, **kwargs):
+        scores = []
+        for query, passage in pairs:
+            q = set(_WORD_RE.findall(query.lower()))
+            p = set(_WORD_RE.findall(passage.lower()))
+            overlap = len(q & p) / (len(q) or 1)
+            scores.append(8.0 * overlap - 4.0)  # roughly the logit range of ms-marco cross-encoders
+        return np.asarray(scores, dtype=np.float32)
+
+
+class StubTextClassificationPipeline:
+    """NLI-style pipeline output: [[{"label": ..., "score": ...}, ...]], one list per input for a list."""
+
+    def __call__(self, inputs, **kwargs):
+        if isinstance(inputs, list):
+            return [self(item)[0] for item in inputs]
+        text = inputs.get("text", "") if isinstance(inputs, dict) else str(inputs)
+        pair = inputs.get("text_pair", "") if isinstance(inputs, dict) else ""
+        a = set(_WORD_RE.findall(text.lower()))
+        b = set(_WORD_RE.findall(pair.lower()))
+        entail = len(a & b) / (len(a | b) or 1)
+        contra = 0.1 if " not " in f" {text.lower()} " else 0.05
+        neutral = max(0.0, 1.0 - entail - contra)
+        return [[
+            {"label": "ENTAILMENT", "score": entail},
+            {"label": "NEUTRAL", "score": neutral},
+            {"label": "CONTRADICTION", "score": contra},
+        ]]
+
+
+class _Span:
+    def __init__(self, text, label=""):
+        self.text = text
+        self.label_ = label
+
+    def __str__(self):
+        return self.text
+
+
+class _Token:
+    def __init__(self, text):
+        self.text = text
+        self.is_stop = text.lower() in _STOP_WORDS
+        self.pos_ = "PROPN" if text[:1].isupper() else ("NOUN" if len(text) > 3 else "X")
+        self.ent_type_ = ""
+
+
+class StubDoc:
+    """Enough of spaCy's Doc for the agents: sents, ents, noun_chunks and tokens."""
+
+    def __init__(self, text):
+        self.text = text
+        self.sents = [_Span(s) for s in _SENT_RE.split(text) if s.strip()]
+        self.ents = [_Span(m, _ENTITY_LABELS[_bucket(m, len(_ENTITY_LABELS))]) for m in _ENTITY_RE.findall(text)]
+        self.noun_chunks = [_Span(e.text) for e in self.ents]
+        self._tokens = [_Token(t) for t in _WORD_RE.findall(text)]
+
+    def __iter__(self):
+        return iter(self._tokens)
+
+    def __len__(self):
+        return len(self._tokens)
+
+
+class StubSpacy:
+    def __call__(self, text):
+        return StubDoc(text)
+
+
+def install_stub_models():
+    """Route every model the benchmarked code asks for to a stub."""
+    embedder = StubSentenceTransformer()
+    for name in ("all-MiniLM-L6-v2", "all-mpnet-base-v2"):
+        set_model_override("sentence_transformer", name, embedder)
+    set_model_override("cross_encoder", "cross-encoder/ms-marco-MiniLM-L-6-v2", StubCrossEncoder())
+    set_model_override("pipeline", "roberta-large-mnli", StubTextClassificationPipeline())
+    set_model_override("spacy", "en_core_web_sm", StubSpacy())
@@ -0,0 +1,119 @@
+# backend/benchmarks/synthetic.py
+"""
+Deterministic input generators for the offline benchmarks.
+
+Recorded fixtures in benchmarks/fixtures/ are used when present; these
+generators provide inputs of any size so the benchmarks can show how each
+hot path scales.
+"""
+import json
+import os
+import random
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+_SUBJECTS = ["Officials", "The ministry", "Researchers", "Local police", "The central bank",
+             "Health authorities", "The company", "Election observers", "Witnesses", "The agency"]
+_VERBS = ["confirmed", "denied", "announced", "reported", "warned", "estimated", "disclosed", "rejected"]
+_OBJECTS = ["new restrictions on imports", "a rise in hospital admissions", "flooding in coastal districts",
+            "an investigation into the contract", "a shortage of fuel", "the results of the audit",
+            "a ceasefire agreement", "record turnout in the capital", "a vaccine trial",
+            "cuts to interest rates"]
+_PLACES = ["Geneva", "Mumbai", "Nairobi", "Brussels", "Jakarta", "Lagos", "Ottawa", "Lima", "Seoul", "Cairo"]
+_DOMAINS = ["reuters.com", "apnews.com", "bbc.com", "theguardian.com", "nytimes.com", "thehindu.com",
+            "dailybuzzworld.com", "truthpatriotnews.net", "npr.org", "cnn.com", "example-blog.info"]
+_HYPE = ["SHOCKING", "You won't believe", "BREAKING", "Secret", "Exposed"]
+
+
+def sentence(rng: random.Random) -> str:
+    return (f"{rng.choice(_SUBJECTS)} in {rng.choice(_PLACES)} {rng.choice(_VERBS)} "
+            f"{rng.choice(_OBJECTS)} on {rng.choice(['Monday', 'Tuesday', 'Friday'])}, "
+            f"according to {rng.randint(2, 40)} people familiar with the matter.")
+
+
+def paragraph(rng: random.Random, sentences: int = 5) -> str:
+    return " ".join(sentence(rng) for _ in range(sentences))
+
+
+def news_text(chars: int, seed: int = 0) -> str:
+    """Article-like prose of roughly `chars` characters, with a few sensational phrases mixed in."""
+    rng = random.Random(seed)
+    parts, total = [], 0
+    while total < chars:
+        p = paragraph(rng)
+        if rng.random() < 0.15:
+            p = f"{rng.choice(_HYPE)}! {p}"
+        parts.append(p)
+        total += len(p) + 2
+    return "\n\n".join(parts)[:chars]
+
+
+def headline(rng: random.Random) -> str:
+    return f"{rng.choice(_PLACES)} {rng.choice(_SUBJECTS).lower()} {rng.choice(_VERBS)} {rng.choice(_OBJECTS)}"
+
+
+def trend_articles(count: int, seed: int = 0):
+    """Articles in the shape the trends module produces (title/snippet/url/source)."""
+    rng = random.Random(seed)
+    articles = []
+    for i in range(count):
+        domain = rng.choice(_DOMAINS)
+        articles.append({
+            "title": headline(rng),
+            "snippet": paragraph(rng, 2)[:200],
+            "url": f"https://www.{domain}/news/{i}",
+            "source": domain,
+            "published": "2025-01-01T00:00:00Z",
+        })
+    return articles
+
+
+def evidence_articles(count: int, sentences_per_article: int = 40, seed: int = 0):
+    """Articles in the shape similarity_checker.best_evidence_for_claim expects."""
+    rng = random.Random(seed)
+    return [{
+        "url": f"https://www.{rng.choice(_DOMAINS)}/story/{i}",
+        "source": rng.choice(_DOMAINS),
+        "title": headline(rng),
+        "content": paragraph(rng, sentences_per_article),
+    } for i in range(count)]
+
+
+def newsapi_payload(count: int, seed: int = 0):
+    """A NewsAPI /v2/top-headlines (or /v2/everything) style response body."""
+    rng = random.Random(seed)
+    articles = []
+    for i in range(count):
+        domain = rng.choice(_DOMAINS)
+        articles.append({
+            "source": {"id": None, "name": domain},
+            "title": headline(rng),
+            "description": paragraph(rng, 2),
+            "url": f"https://www.{domain}/world/{seed}-{i}",
+            "urlToImage": f"https://www.{domain}/img/{i}.jpg",
+            "publishedAt": "2025-01-01T00:00:00Z",
+        })
+    return {"status": "ok", "totalResults": count, "articles": articles}
+
+
+def recorded_newsapi_payload(name: str):
+    """A recorded NewsAPI response from fixtures/api/<name>.json, or None."""
+    path = os.path.join(FIXTURE_DIR, "api", f"{name}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def vector_chunks(count: int, seed: int = 0):
+    """Chunks in the shape timeline.o2_vector_store.chunk_text produces."""
+    rng = random.Random(seed)
+    chunks = []
+    for i in range(count):
+        url = f"https://www.{rng.choice(_DOMAINS)}/timeline/{seed}-{i}"
+        chunks.append({
+            "text": paragraph(rng, 6),
+            "metadata": {"source_url": url, "title": headline(rng), "pub_date": "2025-01-01",
+                         "publisher": "bench", "chunk_id": f"{url}-0"},
+        })
+    return chunks
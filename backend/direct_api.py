@@ -1,5 +1,5 @@
 # backend/direct_api.py
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import random
@@ -10,18 +10,33 @@ import os
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+import time
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
-from backend.utils.trends import get_trending_topics # Corrected path
-from backend.agents.misinformation_agent_lite import agent_service # Corrected path
-from backend.api.trend_routes import router as trends_router
-from backend.api import analyze
-from backend.api.bias_routes import router as bias_router
-from backend.api.timeline_routes import router as timeline_router
-from backend.api.factcheck_routes import router as fact_router
+from backend.utils.startup import timed_import, start_warmup, is_ready, startup_report
+
+# Heavy work (NLTK downloads, classifier training, spaCy/MiniLM loading) no longer
+# happens on import; these are timed so /api/startup can show where cold start goes.
+with timed_import("backend.utils.trends"):
+    from backend.utils.trends import trend_snapshot # Corrected path
+with timed_import("backend.agents.misinformation_agent_lite"):
+    from backend.agents.misinformation_agent_lite import agent_service, analysis_job, HAS_GEMINI_API # Corrected path
+with timed_import("backend.api.trend_routes"):
+    from backend.api.trend_routes import router as trends_router, snapshot_response
+with timed_import("backend.api.analyze"):
+    from backend.api import analyze
+with timed_import("backend.api.bias_routes"):
+    from backend.api.bias_routes import router as bias_router
+with timed_import("backend.api.timeline_routes"):
+    from backend.api.timeline_routes import router as timeline_router
+with timed_import("backend.api.factcheck_routes"):
+    from backend.api.factcheck_routes import router as fact_router
+from backend.utils.model_registry import loaded_models
+from backend.utils.metrics import HTTP_SECONDS, CONTENT_TYPE_LATEST, render_latest
+from backend.utils import http_client
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -32,7 +47,8 @@ try:
     HAS_AGENT = True
     logger.info("Successfully imported lightweight agent_service")
 
-    HAS_GEMINI = hasattr(agent_service, '_analyze_with_gemini') and agent_service._analyze_with_gemini({}) != {}
+    # Configuration check only - probing with a live Gemini call made every cold start pay for a request
+    HAS_GEMINI = HAS_GEMINI_API
     if HAS_GEMINI:
         logger.info("Gemini API integration is available")
     else:
@@ -45,8 +61,10 @@ except Exception as e:
     HAS_GEMINI = False
 
 
-is_agent_running = False
+# Agent runs are coordinated by analysis_job (one in flight, never on a request thread)
 last_agent_run_time = None
+# How long GET /api/agent/results waits on an in-flight run before answering with its progress
+AGENT_RESULTS_WAIT_SECONDS = float(os.getenv("AGENT_RESULTS_WAIT_SECONDS", "20"))
 agent_results = {
     "success": True,
     "timestamp": datetime.now().isoformat(),
@@ -68,14 +86,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# === REQUEST TIMING FOR /metrics ===
+@app.middleware("http")
+async def observe_request_duration(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template (/api/timeline/{job_id}), not the raw path, to keep cardinality bounded
+        route = request.scope.get("route")
+        HTTP_SECONDS.observe(time.perf_counter() - start, method=request.method,
+                             route=getattr(route, "path", "unmatched"), status=str(status))
+
 # === NOW INCLUDE ROUTERS - AFTER APP IS DEFINED ===
-    # go one directory up to import from api
-    # cd .. in python
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-print(os.getcwd())
-from backend.api.trend_routes import router as trends_router
-from backend.api import analyze
-from backend.api.bias_routes import router as bias_router 
 app.include_router(trends_router)
 app.include_router(analyze.router, prefix="/api")
 app.include_router(bias_router, prefix="/api") 
@@ -84,6 +110,17 @@ app.include_router(fact_router, prefix="/api")
 logger.info("Successfully included additional routers including bias and timeline routes")
 
 
+# === STARTUP: WARM MODELS WITHOUT BLOCKING IMPORT ===
+@app.on_event("startup")
+async def warm_up_models():
+    start_warmup()
+    trend_snapshot.start()
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    http_client.close()
+
+
 # === ERROR HANDLER - AFTER APP IS DEFINED ===
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
@@ -154,46 +191,31 @@ def calculate_sentiment(topic, articles):
     else:
         return "neutral"
 
-async def run_agent_analysis():
-    """Run the agent analysis in the background."""
-    global is_agent_running, last_agent_run_time, agent_results
-    
-    if not HAS_AGENT:
-        logger.error("No agent service available")
-        is_agent_running = False
-        return
-    
+def _store_agent_results(future):
+    """Done-callback for analysis_job runs started by this API."""
+    global last_agent_run_time, agent_results
     try:
-        is_agent_running = True
-        logger.info("Starting enhanced lightweight agent analysis...")
-        
-        
-        results = agent_service.analyze_trends()
-        
-        
-        enhanced_results = enhance_analysis_results(results)
-        
-        
-        agent_results = enhanced_results
+        agent_results = enhance_analysis_results(future.result())
         last_agent_run_time = datetime.now().isoformat()
         logger.info("Enhanced lightweight agent analysis completed successfully")
-        
     except Exception as e:
         logger.error(f"Error running enhanced lightweight agent analysis: {e}")
-        logger.error(traceback.format_exc())
-        
-        
-        error_message = str(e)
         agent_results = {
             "success": False,
             "timestamp": datetime.now().isoformat(),
             "message": "Error during lightweight AI analysis",
             "analysis": "An error occurred while running the lightweight AI analysis. Please check the server logs for details.",
-            "error_details": error_message,
+            "error_details": str(e),
             "using_lightweight_model": True
         }
-    finally:
-        is_agent_running = False
+
+def start_agent_analysis():
+    """Start an agent run, or join the one already in flight. Returns True if a new run was started."""
+    future, started = analysis_job.start()
+    if started:
+        logger.info("Starting enhanced lightweight agent analysis...")
+        future.add_done_callback(_store_agent_results)
+    return started
 
 def enhance_analysis_results(results):
     """Format and enhance analysis results for better frontend display."""
@@ -356,78 +378,78 @@ def get_top_indicators(trends, indicator_field, limit=5):
     
     return [{"name": name, "count": count} for name, count in sorted_indicators[:limit]]
 
+def format_trends_payload(trends_data):
+    """Format the trend snapshot for the frontend; runs once per snapshot version."""
+    logger.info(f"Formatting {len(trends_data or [])} trends from the trend snapshot")
+    
+    formatted_trends = []
+    
+    for trend in trends_data or []:
+        try:
+            topic = trend.get('topic', 'Unknown Topic')
+            articles = trend.get('articles', [])
+            
+            
+            mentions = trend.get('volume', random.randint(5000, 50000))
+            
+            
+            try:
+                risk_level = calculate_risk_level(topic, articles)
+            except Exception as risk_error:
+                logger.warning(f"Error calculating risk level: {str(risk_error)}")
+                risk_level = "medium"  
+                
+            try:
+                sentiment = calculate_sentiment(topic, articles)
+            except Exception as sentiment_error:
+                logger.warning(f"Error calculating sentiment: {str(sentiment_error)}")
+                sentiment = "neutral"  
+            
+            
+            description = "No description available"
+            if articles and len(articles) > 0:
+                if 'snippet' in articles[0] and articles[0]['snippet']:
+                    description = articles[0]['snippet']
+                elif 'title' in articles[0] and articles[0]['title']:
+                    description = articles[0]['title']
+            
+            
+            timestamp = "Recently"
+            if 'started' in trend and trend['started']:
+                timestamp = trend['started']
+            
+            
+            platform = random.choice(['twitter', 'facebook', 'instagram', 'tiktok'])
+            
+            formatted_trend = {
+                "topic": topic,
+                "platform": platform,
+                "mentions": mentions,
+                "sentiment": sentiment,
+                "misinformationRisk": risk_level,
+                "description": description,
+                "timestamp": timestamp
+            }
+            
+            formatted_trends.append(formatted_trend)
+            logger.debug(f"Successfully processed trend: {topic}")
+            
+        except Exception as trend_error:
+            logger.error(f"Error processing individual trend: {str(trend_error)}")
+            logger.error(traceback.format_exc())
+            
+    
+    logger.info(f"Prepared {len(formatted_trends)} formatted trends")
+    return {
+        "success": True,
+        "trends": formatted_trends
+    }
+
 @app.get("/api/trends")
-async def get_trends():
+async def get_trends(request: Request):
     try:
         logger.info("API request received for /api/trends")
-        
-        
-        trends_data = get_trending_topics()
-        logger.info(f"Retrieved {len(trends_data)} trends from get_trending_topics()")
-        
-        
-        formatted_trends = []
-        
-        for trend in trends_data:
-            try:
-                topic = trend.get('topic', 'Unknown Topic')
-                articles = trend.get('articles', [])
-                
-                
-                mentions = trend.get('volume', random.randint(5000, 50000))
-                
-                
-                try:
-                    risk_level = calculate_risk_level(topic, articles)
-                except Exception as risk_error:
-                    logger.warning(f"Error calculating risk level: {str(risk_error)}")
-                    risk_level = "medium"  
-                    
-                try:
-                    sentiment = calculate_sentiment(topic, articles)
-                except Exception as sentiment_error:
-                    logger.warning(f"Error calculating sentiment: {str(sentiment_error)}")
-                    sentiment = "neutral"  
-                
-                
-                description = "No description available"
-                if articles and len(articles) > 0:
-                    if 'snippet' in articles[0] and articles[0]['snippet']:
-                        description = articles[0]['snippet']
-                    elif 'title' in articles[0] and articles[0]['title']:
-                        description = articles[0]['title']
-                
-                
-                timestamp = "Recently"
-                if 'started' in trend and trend['started']:
-                    timestamp = trend['started']
-                
-                
-                platform = random.choice(['twitter', 'facebook', 'instagram', 'tiktok'])
-                
-                formatted_trend = {
-                    "topic": topic,
-                    "platform": platform,
-                    "mentions": mentions,
-                    "sentiment": sentiment,
-                    "misinformationRisk": risk_level,
-                    "description": description,
-                    "timestamp": timestamp
-                }
-                
-                formatted_trends.append(formatted_trend)
-                logger.debug(f"Successfully processed trend: {topic}")
-                
-            except Exception as trend_error:
-                logger.error(f"Error processing individual trend: {str(trend_error)}")
-                logger.error(traceback.format_exc())
-                
-        
-        logger.info(f"Returning {len(formatted_trends)} formatted trends")
-        return {
-            "success": True,
-            "trends": formatted_trends
-        }
+        return await snapshot_response(request, "direct_api", format_trends_payload)
     
     except Exception as e:
         logger.error(f"Error in get_trends endpoint: {str(e)}")
@@ -439,17 +461,26 @@ async def get_agent_status():
     """Get the current status of the agent."""
     return {
         "available": HAS_AGENT,
-        "running": is_agent_running,
+        "running": analysis_job.running,
         "last_run": last_agent_run_time,
         "using_enhanced_analysis": True,
-        "gemini_api_available": HAS_GEMINI
+        "gemini_api_available": HAS_GEMINI,
+        "job": analysis_job.status()
+    }
+
+@app.get("/api/models")
+async def get_loaded_models():
+    """List the NLP models currently resident in this process."""
+    models = loaded_models()
+    return {
+        "success": True,
+        "count": len(models),
+        "models": models
     }
 
 @app.post("/api/agent/analyze")
-async def trigger_agent_analysis(background_tasks: BackgroundTasks):
-    """Trigger a new agent analysis."""
-    global is_agent_running
-    
+async def trigger_agent_analysis():
+    """Trigger a new agent analysis, or report the one already running."""
     if not HAS_AGENT:
         return {
             "success": False,
@@ -457,26 +488,30 @@ async def trigger_agent_analysis(background_tasks: BackgroundTasks):
             "fallback": True
         }
     
-    if is_agent_running:
+    if not start_agent_analysis():
         return {
             "success": True,
             "message": "Agent analysis already running",
-            "running": True
+            "running": True,
+            "job": analysis_job.status()
         }
     
-    
-    background_tasks.add_task(run_agent_analysis)
-    
     return {
         "success": True,
         "message": "Enhanced lightweight agent analysis started",
-        "using_gemini_api": HAS_GEMINI
+        "using_gemini_api": HAS_GEMINI,
+        "running": True,
+        "job": analysis_job.status()
     }
 
 @app.get("/api/agent/results")
-async def get_agent_results(background_tasks: BackgroundTasks):
-    """Get the latest agent analysis results. Triggers analysis if none exists."""
-    global agent_results, is_agent_running, last_agent_run_time
+async def get_agent_results(wait: Optional[float] = None):
+    """
+    Get the latest agent analysis results. Triggers analysis if none exists.
+    While a run is in flight this waits up to `wait` seconds (default
+    AGENT_RESULTS_WAIT_SECONDS) for it, then reports its progress instead.
+    """
+    global agent_results
     
     if not HAS_AGENT:
         # Return fallback response if agent is not available
@@ -498,26 +533,17 @@ async def get_agent_results(background_tasks: BackgroundTasks):
             (isinstance(results, dict) and results.get("success") == False and "no analysis" in results.get("message", "").lower())
         )
         
-        # If no results exist and agent is not currently running, trigger analysis
-        if no_analysis and not is_agent_running:
-            logger.info("No existing results found. Triggering automatic analysis...")
-            
-            # Set the flag to prevent duplicate runs
-            is_agent_running = True
-            
-            # Run analysis synchronously to return results immediately
+        # If no results exist, trigger analysis (or join the run already in flight)
+        if no_analysis and start_agent_analysis():
+            logger.info("No existing results found. Triggered automatic analysis")
+        
+        # If agent is currently running, wait for it on the event loop rather than a request thread
+        if analysis_job.running:
+            timeout = AGENT_RESULTS_WAIT_SECONDS if wait is None else max(0.0, min(wait, 300.0))
             try:
-                results = agent_service.analyze_trends()
-                enhanced_results = enhance_analysis_results(results)
-                agent_results = enhanced_results
-                last_agent_run_time = datetime.now().isoformat()
-                logger.info("Automatic analysis completed successfully")
-                return enhanced_results
+                finished = await analysis_job.wait(timeout=timeout)
             except Exception as analysis_error:
                 logger.error(f"Error during automatic analysis: {analysis_error}")
-                logger.error(traceback.format_exc())
-                
-                # Return error response
                 return {
                     "success": False,
                     "timestamp": datetime.now().isoformat(),
@@ -525,19 +551,20 @@ async def get_agent_results(background_tasks: BackgroundTasks):
                     "message": "Error during automatic analysis",
                     "analysis": "An error occurred while running the automatic AI analysis. Please try again later."
                 }
-            finally:
-                is_agent_running = False
-        
-        # If agent is currently running
-        if is_agent_running:
-            return {
-                "success": True,
-                "timestamp": datetime.now().isoformat(),
-                "message": "Analysis is currently in progress",
-                "analysis": "The AI agent is currently analyzing trends. Please wait a moment and refresh.",
-                "running": True,
-                "using_enhanced_analysis": True
-            }
+            
+            if finished is None:
+                job = analysis_job.status()
+                return {
+                    "success": True,
+                    "timestamp": datetime.now().isoformat(),
+                    "message": "Analysis is currently in progress",
+                    "analysis": f"The AI agent is currently analyzing trends ({job['progress_percent']}% complete). Please wait a moment and refresh.",
+                    "running": True,
+                    "progress_percent": job["progress_percent"],
+                    "job": job,
+                    "using_enhanced_analysis": True
+                }
+            results = finished
         
         # If we have existing results, return them
         if results:
@@ -566,6 +593,28 @@ async def get_agent_results(background_tasks: BackgroundTasks):
             "analysis": "There was an error retrieving the AI analysis. Please try again later."
         }
 
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: the models needed by /api/analyze are warm."""
+    report = startup_report()
+    body = {"ready": is_ready(), "warmup": report["warmup"], "warmup_steps": report["warmup_steps"]}
+    return JSONResponse(status_code=200 if body["ready"] else 503, content=body)
+
+@app.get("/api/startup")
+async def get_startup_report():
+    """Per-module import times and model warm-up progress for this process."""
+    return startup_report()
+
+@app.get("/metrics")
+async def metrics():
+    """Stage, upstream provider, model inference and request timings in Prometheus text format."""
+    return Response(render_latest(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/")
 async def root():
     deps_status = "All dependencies installed" if HAS_AGENT else "Missing dependencies"
@@ -581,9 +630,15 @@ async def root():
         "dependencies": deps_status,
         "endpoints": {
             "trends": "/api/trends",
+            "trends_status": "/api/trends/status",
             "analysis": "/api/agent/results",
+            "analyze_stream": "/api/analyze/stream",
             "agent_status": "/api/agent/status",
-            "trigger_analysis": "/api/agent/analyze"
+            "trigger_analysis": "/api/agent/analyze",
+            "health": "/healthz",
+            "readiness": "/readyz",
+            "startup_report": "/api/startup",
+            "metrics": "/metrics"
         }
     }
 
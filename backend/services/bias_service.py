@@ -15,6 +15,7 @@ from backend.agents.bias_analyzer_priyank.news_fetcher import get_urls_from_gnew
 from backend.agents.bias_analyzer_priyank.config import NEUTRAL_BIAS_THRESHOLD
 from backend.agents.bias_analyzer_priyank.knowledge_base import KnowledgeBase
 from backend.agents.bias_analyzer_priyank.fact_checker import generate_misconceptions, generate_fact_check_report
+from backend.utils.metrics import track_stage
 
 # Configure logging
 logger = logging.getLogger("bias_service")
@@ -60,18 +61,21 @@ def run_topic_analysis_background(job_id: str, topic: str):
         neutral_articles_for_kb = []
         all_analyses = []
 
-        urls = get_urls_from_gnews(topic)
+        with track_stage("bias_topic", "fetch_urls"):
+            urls = get_urls_from_gnews(topic)
         if not urls:
             raise ValueError("Could not fetch any article URLs.")
 
         for i, url in enumerate(urls):
             job_results[job_id]["progress"] = f"Analyzing URL {i+1}/{len(urls)}: {url}"
-            content = extract_content_from_url(url)
+            with track_stage("bias_topic", "extract_content"):
+                content = extract_content_from_url(url)
             if not content:
                 continue
 
-            agent = BiasAnalysisAgent(content, source_url=url)
-            analysis_result = agent.run_for_api()
+            with track_stage("bias_topic", "bias_analysis"):
+                agent = BiasAnalysisAgent(content, source_url=url)
+                analysis_result = agent.run_for_api()
             if not analysis_result:
                 continue
             
@@ -84,32 +88,34 @@ def run_topic_analysis_background(job_id: str, topic: str):
                 biased_articles_for_review.append({"content": content, "url": url, "score": final_score})
 
         # Add neutral articles to Knowledge Base
-        for article in neutral_articles_for_kb:
-             kb.add_document(article["content"], article["url"])
+        with track_stage("bias_topic", "knowledge_base"):
+            for article in neutral_articles_for_kb:
+                 kb.add_document(article["content"], article["url"])
 
         # Generate fact-checks
         fact_checks = []
-        if kb.collection.count() > 0:
-            for article in biased_articles_for_review:
-                misconceptions = generate_misconceptions(article["content"])
-                for misconception in misconceptions:
-                    relevant_chunks = kb.query(misconception)
-                    # # Note: generate_fact_check_report prints to console. 
-                    # # For an API, this should be refactored to return JSON.
-                    # # For now, we'll just log it.
-                    # logger.info(f"Fact-checking misconception: '{misconception}'")
-                    # fact_checks.append({
-                    #     "misconception": misconception,
-                    #     "source": article["url"],
-                    #     "evidence_chunks": relevant_chunks
-                    # })
-                    report = generate_fact_check_report(misconception, relevant_chunks, article["url"])
-
-                    # If a report was successfully generated, save it
-                    if report:
-                        report['misconception'] = misconception
-                        report['biased_source'] = article["url"]
-                        fact_checks.append(report)
+        with track_stage("bias_topic", "fact_checks"):
+            if kb.collection.count() > 0:
+                for article in biased_articles_for_review:
+                    misconceptions = generate_misconceptions(article["content"])
+                    for misconception in misconceptions:
+                        relevant_chunks = kb.query(misconception)
+                        # # Note: generate_fact_check_report prints to console. 
+                        # # For an API, this should be refactored to return JSON.
+                        # # For now, we'll just log it.
+                        # logger.info(f"Fact-checking misconception: '{misconception}'")
+                        # fact_checks.append({
+                        #     "misconception": misconception,
+                        #     "source": article["url"],
+                        #     "evidence_chunks": relevant_chunks
+                        # })
+                        report = generate_fact_check_report(misconception, relevant_chunks, article["url"])
+
+                        # If a report was successfully generated, save it
+                        if report:
+                            report['misconception'] = misconception
+                            report['biased_source'] = article["url"]
+                            fact_checks.append(report)
         
         # Store final results
         job_results[job_id]["status"] = "complete"
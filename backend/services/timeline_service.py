@@ -103,6 +103,7 @@ from backend.agents.timeline.o3_event_extraction import extract_events_from_chun
 from backend.agents.timeline.o4_graph_builder import Neo4jGraph
 from backend.agents.timeline.o5_narrative_generator import generate_narrative
 from backend.agents.timeline.config import CHROMA_DB_PATH
+from backend.utils.metrics import track_stage
 
 logger = logging.getLogger("timeline_service")
 
@@ -120,25 +121,26 @@ def run_timeline_generation_background(job_id: str, topic: str):
         # === CLEANUP PHASE ===
         timeline_job_results[job_id]["progress"] = "Cleaning up previous data..."
         
-        # 1. Reset the ChromaDB client to release file locks
-        reset_db_client()
-        
-        # 2. Force garbage collection to ensure file handles are closed (Crucial for Windows)
-        gc.collect()
-
-        # 3. Now delete the directory
-        if os.path.exists(CHROMA_DB_PATH):
-            try:
-                shutil.rmtree(CHROMA_DB_PATH)
-                logger.info(f"Job {job_id}: Removed old ChromaDB directory.")
-            except PermissionError:
-                logger.warning(f"Job {job_id}: Could not delete ChromaDB folder (PermissionError). attempting to continue with overwrite.")
-            except Exception as e:
-                logger.warning(f"Job {job_id}: Error deleting ChromaDB folder: {e}")
-
-        # 4. Clear Neo4j
-        graph = Neo4jGraph()
-        graph.clear_database()
+        with track_stage("timeline", "cleanup"):
+            # 1. Reset the ChromaDB client to release file locks
+            reset_db_client()
+            
+            # 2. Force garbage collection to ensure file handles are closed (Crucial for Windows)
+            gc.collect()
+
+            # 3. Now delete the directory
+            if os.path.exists(CHROMA_DB_PATH):
+                try:
+                    shutil.rmtree(CHROMA_DB_PATH)
+                    logger.info(f"Job {job_id}: Removed old ChromaDB directory.")
+                except PermissionError:
+                    logger.warning(f"Job {job_id}: Could not delete ChromaDB folder (PermissionError). attempting to continue with overwrite.")
+                except Exception as e:
+                    logger.warning(f"Job {job_id}: Error deleting ChromaDB folder: {e}")
+
+            # 4. Clear Neo4j
+            graph = Neo4jGraph()
+            graph.clear_database()
         
         logger.info(f"Job {job_id}: Cleared databases for new analysis.")
 
@@ -146,49 +148,54 @@ def run_timeline_generation_background(job_id: str, topic: str):
         
         # 1. RETRIEVAL
         timeline_job_results[job_id]["progress"] = "Step 1/5: Retrieving news articles..."
-        article_infos = get_urls_from_duckduckgo(topic, max_results=5)
-        
-        if not article_infos:
-            # Fallback or exit if no articles found
-            logger.warning(f"Job {job_id}: No articles found for {topic}")
-            # Depending on logic, you might want to raise an error or return empty results
-            # For now, let's proceed but all_articles will be empty
-        
-        all_articles = [
-            data for info in article_infos 
-            if (data := extract_content_from_url(info['url'], info['published_at'])) is not None
-        ]
+        with track_stage("timeline", "retrieval"):
+            article_infos = get_urls_from_duckduckgo(topic, max_results=5)
+            
+            if not article_infos:
+                # Fallback or exit if no articles found
+                logger.warning(f"Job {job_id}: No articles found for {topic}")
+                # Depending on logic, you might want to raise an error or return empty results
+                # For now, let's proceed but all_articles will be empty
+            
+            all_articles = [
+                data for info in article_infos 
+                if (data := extract_content_from_url(info['url'], info['published_at'])) is not None
+            ]
 
         if not all_articles:
              raise ValueError("No valid content could be extracted from search results.")
 
         # 2. VECTOR STORE
         timeline_job_results[job_id]["progress"] = f"Step 2/5: Storing {len(all_articles)} articles in vector DB..."
-        for article in all_articles:
-            chunks = chunk_text(article)
-            add_chunks_to_db(chunks)
+        with track_stage("timeline", "vector_store"):
+            for article in all_articles:
+                chunks = chunk_text(article)
+                add_chunks_to_db(chunks)
 
         # 3. EVENT EXTRACTION
         all_chunks = get_all_chunks_from_db()
         timeline_job_results[job_id]["progress"] = f"Step 3/5: Extracting events from {len(all_chunks)} text chunks..."
         
         all_events = []
-        for i, chunk in enumerate(all_chunks):
-            # Update progress more frequently
-            timeline_job_results[job_id]["progress"] = f"Step 3/5: Extracting events (chunk {i+1}/{len(all_chunks)})..."
-            if events := extract_events_from_chunk(chunk):
-                all_events.extend(events)
+        with track_stage("timeline", "event_extraction"):
+            for i, chunk in enumerate(all_chunks):
+                # Update progress more frequently
+                timeline_job_results[job_id]["progress"] = f"Step 3/5: Extracting events (chunk {i+1}/{len(all_chunks)})..."
+                if events := extract_events_from_chunk(chunk):
+                    all_events.extend(events)
         
         # 4. GRAPH CONSTRUCTION
         timeline_job_results[job_id]["progress"] = f"Step 4/5: Building knowledge graph with {len(all_events)} events..."
-        for event in all_events:
-            graph.add_event(event)
-        graph.add_temporal_relationships()
+        with track_stage("timeline", "graph_build"):
+            for event in all_events:
+                graph.add_event(event)
+            graph.add_temporal_relationships()
 
         # 5. NARRATIVE GENERATION
         timeline_job_results[job_id]["progress"] = "Step 5/5: Generating final narrative..."
-        sorted_events = graph.get_sorted_events()
-        final_narrative = generate_narrative(sorted_events)
+        with track_stage("timeline", "narrative"):
+            sorted_events = graph.get_sorted_events()
+            final_narrative = generate_narrative(sorted_events)
         
         graph.close()
 
@@ -0,0 +1,39 @@
+# backend/tests/test_http_client.py
+import time
+
+from backend.utils.http_client import PAGE_CHUNK_BYTES, Page, ParagraphCounter, detect_encoding
+
+
+def count_in_chunks(data: bytes) -> int:
+    """Feed `data` to a ParagraphCounter the way _download does, one chunk at a time."""
+    counter, buffer = ParagraphCounter(), bytearray()
+    for offset in range(0, len(data), PAGE_CHUNK_BYTES):
+        buffer += data[offset:offset + PAGE_CHUNK_BYTES]
+        counter.feed(buffer)
+    return counter.chars
+
+
+def test_paragraphs_without_end_tags_are_counted_in_linear_time():
+    # </p> is optional in HTML; each <p> ends the previous paragraph
+    data = (b"<p>" + b"x" * 200 + b"\n") * 10_000  # ~2 MB
+    start = time.perf_counter()
+    chars = count_in_chunks(data)
+    assert time.perf_counter() - start < 2
+    assert chars == 200 * (10_000 - 1)  # the last paragraph is still open
+
+
+def test_paragraphs_end_at_block_tags_and_inline_tags_are_stripped():
+    data = b"<body>" + b'<div><p class="lead">Hello <b>world</b></p><p>second<div>x</div></div>' * 3
+    assert count_in_chunks(data) == 3 * (len("Hello world") + len("second"))
+
+
+def test_tag_split_across_chunks_is_seen():
+    data = b"<p>" + b"y" * (PAGE_CHUNK_BYTES - 2) + b"</p><p>z</p>"
+    assert count_in_chunks(data) == PAGE_CHUNK_BYTES - 2 + 1
+
+
+def test_unknown_or_utf16_meta_charset_falls_back_to_utf8():
+    assert detect_encoding(b'<meta charset="bogus">') == "utf-8"
+    assert detect_encoding(b'<meta charset="utf-16">') == "utf-8"
+    assert detect_encoding(b'<meta charset="windows-1252">') == "cp1252"
+    assert "café" in Page("https://example.com", 200, {}, '<meta charset="bogus">café'.encode()).text
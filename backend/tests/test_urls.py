@@ -0,0 +1,18 @@
+# backend/tests/test_urls.py
+from backend.utils.urls import canonicalize_url
+
+
+def test_amp_copies_map_to_the_article():
+    article = canonicalize_url("https://www.example.com/world/big-story-2025")
+    for amp in ("https://www.example.com/world/big-story-2025/amp/",
+                "https://m.example.com/world/big-story-2025?amp=1",
+                "https://example.com/world/big-story-2025?outputType=amp",
+                "https://www-example-com.cdn.ampproject.org/c/s/www.example.com/world/big-story-2025/amp"):
+        assert canonicalize_url(amp) == article
+
+
+def test_distinct_pages_keep_distinct_keys():
+    assert canonicalize_url("https://example.com/reviews/amp") != canonicalize_url("https://example.com/reviews")
+    assert canonicalize_url("https://example.com/amp/story") != canonicalize_url("https://example.com/story")
+    assert canonicalize_url("https://example.com/search?output=1&q=x") != canonicalize_url(
+        "https://example.com/search?q=x")
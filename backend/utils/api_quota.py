@@ -0,0 +1,220 @@
+# backend/utils/api_quota.py
+"""
+Quota accounting and request de-duplication for the paid news/search APIs
+(GNews, Serper, NewsData, SerpAPI, Google Fact Check).
+
+http_client.request routes every call made with `provider=` through here:
+  - identical calls in flight at the same time share one upstream request;
+  - successful responses are reused for API_CACHE_FRESH_SECONDS;
+  - calls are counted per provider against per-minute and per-day budgets
+    (API_QUOTAS, "gnews=60:100,serper=300:0"; 0 means unlimited);
+  - once a budget is API_CACHE_FIRST_RATIO used, any cached response up to
+    API_CACHE_MAX_AGE_SECONDS old is served before spending another call;
+  - with the budget spent, a cached response is returned if there is one,
+    otherwise QuotaExceeded (a requests exception) is raised; the same
+    fallback applies while the provider's circuit breaker is open.
+
+Counters are per process and reset with the window (minute, UTC day).
+Identical means same method, URL, query params and body; headers are
+ignored, so API keys sent as headers don't split the key.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+
+from backend.utils.circuit_breaker import CircuitOpen
+from backend.utils.metrics import API_DEDUP, API_QUOTA_LIMIT, API_QUOTA_USED
+from backend.utils.result_cache import SingleFlightCache, SHARED
+
+logger = logging.getLogger("api-quota")
+
+API_CACHE_FRESH_SECONDS = float(os.getenv("API_CACHE_FRESH_SECONDS", "120"))
+API_CACHE_MAX_AGE_SECONDS = float(os.getenv("API_CACHE_MAX_AGE_SECONDS", str(6 * 3600)))
+API_CACHE_ENTRIES = int(os.getenv("API_CACHE_ENTRIES", "512"))
+API_CACHE_FIRST_RATIO = float(os.getenv("API_CACHE_FIRST_RATIO", "0.8"))
+
+# calls per minute, calls per day (free-tier defaults; override with API_QUOTAS)
+DEFAULT_QUOTAS: Dict[str, Tuple[int, int]] = {
+    "gnews": (60, 100),
+    "newsdata": (30, 200),
+    "serper": (300, 0),
+    "serpapi": (0, 100),
+    "google_factcheck": (0, 10_000),
+}
+FALLBACK_QUOTA = (0, 0)
+
+
+def _parse_quotas(spec: str) -> Dict[str, Tuple[int, int]]:
+    """"gnews=60:100,serper=300:0" -> {provider: (per_minute, per_day)}"""
+    quotas = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        try:
+            provider, values = item.split("=", 1)
+            per_minute, per_day = values.split(":", 1)
+            quotas[provider.strip()] = (int(per_minute), int(per_day))
+        except ValueError:
+            logger.warning(f"Ignoring malformed API_QUOTAS entry: {item!r}")
+    return quotas
+
+
+QUOTAS = {**DEFAULT_QUOTAS, **_parse_quotas(os.getenv("API_QUOTAS", ""))}
+
+
+class QuotaExceeded(requests.exceptions.RequestException):
+    """The provider's call budget is spent and no cached response can stand in."""
+
+
+class ProviderQuota:
+    """Fixed-window call counters (current minute, current UTC day) for one provider."""
+
+    def __init__(self, provider: str, per_minute: int = 0, per_day: int = 0):
+        self.provider = provider
+        self.limits = {"minute": per_minute, "day": per_day}
+        self._windows = {"minute": (None, 0), "day": (None, 0)}
+        self._lock = threading.Lock()
+        for window, limit in self.limits.items():
+            API_QUOTA_LIMIT.set(limit, provider=provider, window=window)
+
+    @staticmethod
+    def _window_ids(now: float) -> Dict[str, int]:
+        return {"minute": int(now // 60), "day": int(now // 86400)}
+
+    def _used(self, now: float) -> Dict[str, int]:
+        # Called with the lock held
+        ids = self._window_ids(now)
+        return {w: (count if window_id == ids[w] else 0) for w, (window_id, count) in self._windows.items()}
+
+    def pressure(self) -> float:
+        """Highest fraction of any budget used so far (0 when unlimited)."""
+        with self._lock:
+            used = self._used(time.time())
+        return max((used[w] / limit for w, limit in self.limits.items() if limit), default=0.0)
+
+    def try_acquire(self) -> bool:
+        """Count one call if every budget has room left."""
+        now = time.time()
+        ids = self._window_ids(now)
+        with self._lock:
+            used = self._used(now)
+            if any(limit and used[w] >= limit for w, limit in self.limits.items()):
+                return False
+            for w in used:
+                used[w] += 1
+                self._windows[w] = (ids[w], used[w])
+        for w, count in used.items():
+            API_QUOTA_USED.set(count, provider=self.provider, window=w)
+        return True
+
+    def refund(self):
+        """Give back a call counted by try_acquire() that never went out."""
+        now = time.time()
+        ids = self._window_ids(now)
+        with self._lock:
+            used = self._used(now)
+            for w in used:
+                used[w] = max(0, used[w] - 1)
+                self._windows[w] = (ids[w], used[w])
+        for w, count in used.items():
+            API_QUOTA_USED.set(count, provider=self.provider, window=w)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            used = self._used(time.time())
+        return {w: {"used": used[w], "limit": limit} for w, limit in self.limits.items()}
+
+
+_quotas: Dict[str, ProviderQuota] = {}
+_responses: "OrderedDict[str, Tuple[float, requests.Response]]" = OrderedDict()
+_lock = threading.Lock()
+
+# Joins concurrent identical calls; completed responses are kept in _responses instead
+_flights = SingleFlightCache(ttl_seconds=0, stale_seconds=0, should_cache=lambda response: False, name="api-calls")
+
+
+def quota_for(provider: str) -> ProviderQuota:
+    with _lock:
+        quota = _quotas.get(provider)
+        if quota is None:
+            quota = _quotas[provider] = ProviderQuota(provider, *QUOTAS.get(provider, FALLBACK_QUOTA))
+        return quota
+
+
+def request_key(provider: str, method: str, url: str, kwargs: Dict[str, Any]) -> str:
+    payload = json.dumps([provider, method.upper(), url, kwargs.get("params"), kwargs.get("json"),
+                          kwargs.get("data")], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cached(key: str, max_age: float) -> Optional[requests.Response]:
+    with _lock:
+        entry = _responses.get(key)
+        if entry is None or time.time() - entry[0] > max_age:
+            return None
+        _responses.move_to_end(key)
+        return entry[1]
+
+
+def _remember(key: str, response: requests.Response):
+    with _lock:
+        _responses[key] = (time.time(), response)
+        _responses.move_to_end(key)
+        while len(_responses) > API_CACHE_ENTRIES:
+            _responses.popitem(last=False)
+
+
+def _metered(provider: str, key: Optional[str], send: Callable[[], requests.Response]) -> requests.Response:
+    if not quota_for(provider).try_acquire():
+        fallback = _cached(key, API_CACHE_MAX_AGE_SECONDS) if key else None
+        if fallback is not None:
+            API_DEDUP.inc(provider=provider, reason="quota_fallback")
+            return fallback
+        API_DEDUP.inc(provider=provider, reason="rejected")
+        raise QuotaExceeded(f"{provider} call budget exhausted ({quota_for(provider).snapshot()})")
+    try:
+        response = send()
+    except CircuitOpen:
+        quota_for(provider).refund()  # skipped without reaching the provider
+        fallback = _cached(key, API_CACHE_MAX_AGE_SECONDS) if key else None
+        if fallback is None:
+            raise
+        API_DEDUP.inc(provider=provider, reason="circuit_fallback")
+        return fallback
+    if key and response.status_code == 200:
+        _remember(key, response)
+    return response
+
+
+def call(provider: str, method: str, url: str, kwargs: Dict[str, Any],
+         send: Callable[[], requests.Response], share: bool = True) -> requests.Response:
+    """
+    Answer from the cache or a call already in flight when possible, else
+    `send()` within the budget. `share=False` only meters the call.
+    """
+    if not share:
+        return _metered(provider, None, send)
+    key = request_key(provider, method, url, kwargs)
+    cache_first = quota_for(provider).pressure() >= API_CACHE_FIRST_RATIO
+    cached = _cached(key, API_CACHE_MAX_AGE_SECONDS if cache_first else API_CACHE_FRESH_SECONDS)
+    if cached is not None:
+        API_DEDUP.inc(provider=provider, reason="cache_first" if cache_first else "cached")
+        return cached
+
+    response, info = _flights.get_or_compute(key, lambda: _metered(provider, key, send))
+    if info["status"] == SHARED:
+        API_DEDUP.inc(provider=provider, reason="shared")
+    return response
+
+
+def status() -> Dict[str, Any]:
+    with _lock:
+        quotas = dict(_quotas)
+        cached = len(_responses)
+    return {"quotas": {name: quota.snapshot() for name, quota in quotas.items()},
+            "cached_responses": cached, "in_flight": _flights.snapshot()}
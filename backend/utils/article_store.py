@@ -0,0 +1,280 @@
+# backend/utils/article_store.py
+"""
+Local article store shared by every pipeline that downloads pages.
+
+Pages are kept in SQLite, keyed by canonical URL (utils.urls), so the
+tracking-parameter, AMP and mobile variants of one wire story resolve to the
+same row. Bodies live in a separate table keyed by content hash and are
+compressed with zstd (zlib when zstandard isn't installed); two URLs serving
+the same bytes share one body.
+
+http_client.fetch_page reads through the store:
+  - younger than ARTICLE_STORE_FRESH_SECONDS: served without any request;
+  - older: revalidated with If-None-Match / If-Modified-Since, and a 304
+    keeps the stored body;
+  - not revalidated for ARTICLE_STORE_MAX_AGE_SECONDS: evicted by purge().
+
+Pages cut short by `enough_text` are stored as partial and only served to
+callers that need no more text than was downloaded.
+
+Store errors are logged and treated as misses; they never fail a fetch.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+from backend.utils import cassette
+from backend.utils.urls import canonicalize_url
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger("article-store")
+
+ARTICLE_STORE_ENABLED = os.getenv("ARTICLE_STORE_ENABLED", "1") != "0"
+ARTICLE_STORE_PATH = os.getenv("ARTICLE_STORE_PATH", os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "articles.sqlite3"))
+ARTICLE_STORE_FRESH_SECONDS = float(os.getenv("ARTICLE_STORE_FRESH_SECONDS", str(6 * 3600)))
+ARTICLE_STORE_MAX_AGE_SECONDS = float(os.getenv("ARTICLE_STORE_MAX_AGE_SECONDS", str(7 * 86400)))
+# Run purge() after this many writes
+ARTICLE_STORE_PURGE_EVERY = int(os.getenv("ARTICLE_STORE_PURGE_EVERY", "500"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    canonical_url TEXT PRIMARY KEY,
+    url           TEXT NOT NULL,
+    content_hash  TEXT NOT NULL,
+    status_code   INTEGER NOT NULL,
+    content_type  TEXT NOT NULL DEFAULT '',
+    etag          TEXT NOT NULL DEFAULT '',
+    last_modified TEXT NOT NULL DEFAULT '',
+    text_target   INTEGER NOT NULL DEFAULT 0,  -- 0: complete body, else the enough_text it was cut at
+    truncated     INTEGER NOT NULL DEFAULT 0,
+    fetched_at    REAL NOT NULL,
+    validated_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_validated_at ON pages (validated_at);
+CREATE INDEX IF NOT EXISTS pages_content_hash ON pages (content_hash);
+CREATE TABLE IF NOT EXISTS bodies (
+    content_hash TEXT PRIMARY KEY,
+    codec        TEXT NOT NULL,
+    size         INTEGER NOT NULL,
+    body         BLOB NOT NULL
+);
+"""
+
+
+def _compress(raw: bytes):
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=6).compress(raw)
+    return "zlib", zlib.compress(raw, 6)
+
+
+def _decompress(codec: str, body: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("body is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(body)
+    if codec == "zlib":
+        return zlib.decompress(body)
+    raise ValueError(f"unknown codec {codec!r}")
+
+
+class StoredPage:
+    """One stored page: what fetch_page needs to rebuild a Page, plus validators."""
+
+    def __init__(self, row: sqlite3.Row, raw: bytes, now: float):
+        self.url = row["url"]
+        self.canonical_url = row["canonical_url"]
+        self.status_code = row["status_code"]
+        self.content_type = row["content_type"]
+        self.etag = row["etag"]
+        self.last_modified = row["last_modified"]
+        self.text_target = row["text_target"]
+        self.truncated = bool(row["truncated"])
+        self.raw = raw
+        self.age_seconds = now - row["validated_at"]
+
+    @property
+    def fresh(self) -> bool:
+        return self.age_seconds <= ARTICLE_STORE_FRESH_SECONDS
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": self.content_type}
+        if self.etag:
+            headers["ETag"] = self.etag
+        if self.last_modified:
+            headers["Last-Modified"] = self.last_modified
+        return headers
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def serves(self, enough_text: Optional[int]) -> bool:
+        """A partial page only serves callers that stop at the same amount of text or less."""
+        return not self.text_target or bool(enough_text and enough_text <= self.text_target)
+
+
+class ArticleStore:
+    def __init__(self, path: str = ARTICLE_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._writes = 0
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "writes": 0, "evicted": 0, "errors": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        # Called with the lock held
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            conn.row_factory = sqlite3.Row
+            # WAL lets several worker processes read while one writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def lookup(self, url: str) -> Optional[StoredPage]:
+        key = canonicalize_url(url)
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute("SELECT * FROM pages WHERE canonical_url = ?", (key,)).fetchone()
+                body = row and conn.execute("SELECT codec, body FROM bodies WHERE content_hash = ?",
+                                            (row["content_hash"],)).fetchone()
+            if not row or not body:
+                self.stats["misses"] += 1
+                return None
+            stored = StoredPage(row, _decompress(body["codec"], body["body"]), time.time())
+        except (sqlite3.Error, ValueError, zlib.error) as e:
+            self._error("lookup", url, e)
+            return None
+        if stored.age_seconds > ARTICLE_STORE_MAX_AGE_SECONDS:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits" if stored.fresh else "revalidated"] += 1
+        return stored
+
+    def save(self, url: str, final_url: str, status_code: int, headers, raw: bytes,
+             truncated: bool = False, text_target: int = 0):
+        """Store a downloaded page under the canonical form of both the requested and the final URL."""
+        content_hash = hashlib.sha256(raw).hexdigest()
+        codec, body = _compress(raw)
+        now = time.time()
+        row = (final_url, content_hash, status_code, headers.get("Content-Type", "") or "",
+               headers.get("ETag", "") or "", headers.get("Last-Modified", "") or "",
+               int(text_target or 0), int(truncated), now, now)
+        keys = {canonicalize_url(url), canonicalize_url(final_url)}
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    conn.execute("INSERT OR IGNORE INTO bodies (content_hash, codec, size, body) VALUES (?, ?, ?, ?)",
+                                 (content_hash, codec, len(raw), body))
+                    for key in keys:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO pages (canonical_url, url, content_hash, status_code, "
+                            "content_type, etag, last_modified, text_target, truncated, fetched_at, validated_at) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (key,) + row)
+                self._writes += 1
+                self.stats["writes"] += 1
+                purge_due = ARTICLE_STORE_PURGE_EVERY and self._writes % ARTICLE_STORE_PURGE_EVERY == 0
+        except sqlite3.Error as e:
+            self._error("save", url, e)
+            return
+        if purge_due:
+            self.purge()
+
+    def mark_validated(self, url: str, headers=None):
+        """Record a 304: the stored body is current again, with any refreshed validators."""
+        headers = headers or {}
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    conn.execute(
+                        "UPDATE pages SET validated_at = ?, "
+                        "etag = COALESCE(NULLIF(?, ''), etag), last_modified = COALESCE(NULLIF(?, ''), last_modified) "
+                        "WHERE canonical_url = ?",
+                        (time.time(), headers.get("ETag", "") or "", headers.get("Last-Modified", "") or "",
+                         canonicalize_url(url)))
+        except sqlite3.Error as e:
+            self._error("mark_validated", url, e)
+
+    def purge(self, max_age_seconds: float = ARTICLE_STORE_MAX_AGE_SECONDS) -> int:
+        """Evict pages not validated within `max_age_seconds` and bodies no page refers to."""
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    evicted = conn.execute("DELETE FROM pages WHERE validated_at < ?",
+                                           (time.time() - max_age_seconds,)).rowcount
+                    conn.execute("DELETE FROM bodies WHERE content_hash NOT IN (SELECT content_hash FROM pages)")
+        except sqlite3.Error as e:
+            self._error("purge", "", e)
+            return 0
+        self.stats["evicted"] += evicted
+        if evicted:
+            logger.info(f"Evicted {evicted} pages older than {max_age_seconds:.0f}s")
+        return evicted
+
+    def _error(self, operation: str, url: str, error: Exception):
+        self.stats["errors"] += 1
+        logger.warning(f"Article store {operation} failed{' for ' + url if url else ''}: {error}")
+
+    def status(self) -> Dict[str, Any]:
+        summary = {"path": self.path, "codec": "zstd" if zstandard is not None else "zlib", **self.stats}
+        try:
+            with self._lock:
+                conn = self._connection()
+                pages, = conn.execute("SELECT COUNT(*) FROM pages").fetchone()
+                bodies, stored, raw = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0), COALESCE(SUM(size), 0) FROM bodies").fetchone()
+            summary.update(pages=pages, bodies=bodies, stored_bytes=stored, raw_bytes=raw)
+        except sqlite3.Error as e:
+            summary["error"] = str(e)
+        return summary
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_store: Optional[ArticleStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> Optional[ArticleStore]:
+    """The process-wide store, or None when ARTICLE_STORE_ENABLED=0 or a cassette is active."""
+    global _store
+    # A recording must capture every download, and a replay must serve them from the cassette
+    if not ARTICLE_STORE_ENABLED or cassette.active() is not None:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = ArticleStore()
+        return _store
+
+
+def close():
+    with _store_lock:
+        if _store is not None:
+            _store.close()
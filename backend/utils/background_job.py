@@ -0,0 +1,124 @@
+# backend/utils/background_job.py
+"""
+Single-flight background job with progress reporting.
+
+Used for the long, Gemini-heavy trend analysis: at most one run is in
+flight per process, it always runs on its own worker thread (never on a
+request thread), and every caller that asks for a run while one is going
+gets the same Future back. The job reports progress through a callback
+so status endpoints can show a percentage.
+"""
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("background-job")
+
+ProgressCallback = Callable[[float, str], None]
+
+
+class BackgroundJob:
+    """`run(progress)` does the work; `progress(fraction, message)` may be called any number of times."""
+
+    def __init__(self, name: str, run: Callable[[ProgressCallback], Any]):
+        self.name = name
+        self._run = run
+        self._lock = threading.Lock()
+        self._future: Optional[Future] = None
+        self._state: Dict[str, Any] = {
+            "run_id": None,
+            "running": False,
+            "progress": 0.0,
+            "stage": "idle",
+            "started_at": None,
+            "finished_at": None,
+            "seconds": None,
+            "last_error": None,
+            "completed_runs": 0,
+        }
+
+    def start(self) -> Tuple[Future, bool]:
+        """
+        Start a run unless one is already in flight.
+        Returns (future, started) where `started` is False if an existing run was joined.
+        """
+        with self._lock:
+            if self._future is not None and not self._future.done():
+                return self._future, False
+
+            future = Future()
+            self._future = future
+            self._state.update({
+                "run_id": uuid.uuid4().hex[:12],
+                "running": True,
+                "progress": 0.0,
+                "stage": "starting",
+                "started_at": datetime.now().isoformat(),
+                "finished_at": None,
+                "seconds": None,
+                "last_error": None,
+            })
+            threading.Thread(target=self._execute, args=(future,), name=f"{self.name}-job", daemon=True).start()
+            return future, True
+
+    def _progress(self, fraction: float, message: str = ""):
+        with self._lock:
+            # Never move backwards, and leave 100% for completion
+            self._state["progress"] = max(self._state["progress"], min(float(fraction), 0.99))
+            if message:
+                self._state["stage"] = message
+
+    def _execute(self, future: Future):
+        start = time.perf_counter()
+        logger.info(f"{self.name}: run {self._state['run_id']} started")
+        try:
+            result = self._run(self._progress)
+        except Exception as e:
+            logger.error(f"{self.name}: run failed: {e}")
+            with self._lock:
+                self._state.update({"running": False, "stage": "failed", "last_error": str(e),
+                                    "finished_at": datetime.now().isoformat(),
+                                    "seconds": round(time.perf_counter() - start, 2)})
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            self._state.update({"running": False, "progress": 1.0, "stage": "completed",
+                                "finished_at": datetime.now().isoformat(),
+                                "seconds": round(time.perf_counter() - start, 2)})
+            self._state["completed_runs"] += 1
+        logger.info(f"{self.name}: run finished in {self._state['seconds']}s")
+        future.set_result(result)
+
+    @property
+    def running(self) -> bool:
+        return self._state["running"]
+
+    def current(self) -> Optional[Future]:
+        """The in-flight run, if any."""
+        future = self._future
+        return future if future is not None and not future.done() else None
+
+    async def wait(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Await the in-flight run without blocking the event loop.
+        Returns its result, or None if nothing is running or `timeout` expires first.
+        """
+        future = self.current()
+        if future is None:
+            return None
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            state = dict(self._state)
+        state["progress_percent"] = round(state.pop("progress") * 100, 1)
+        return state
@@ -0,0 +1,378 @@
+# backend/utils/cassette.py
+"""
+Record/replay of outbound HTTP and LLM traffic, for reproducible offline
+benchmarks of whole pipelines.
+
+    CASSETTE_MODE=record CASSETTE_PATH=backend/benchmarks/cassettes/fact_check.jsonl ...
+    CASSETTE_MODE=replay CASSETTE_PATH=... CASSETTE_LATENCY=recorded ...
+
+Record mode lets traffic through and appends every exchange to the cassette
+(JSON lines). Replay mode never touches the network: requests are answered
+from the cassette and anything not recorded raises CassetteMiss, a requests
+exception, so pipelines degrade exactly as they would on a network error.
+
+Captured at three points, installed by install() (http_client calls
+it on import when CASSETTE_MODE is set):
+  - requests: HTTPAdapter.send, so the shared session and any library that
+    uses requests directly;
+  - httpx: the sync and async transports (the Groq SDK, arequest);
+  - LLM: llm_gateway records the provider-neutral result, and the HTTP
+    underneath that call is not recorded a second time. Replayed LLM calls
+    skip the gateway's quota waits.
+Clients with their own HTTP stack (duckduckgo_search) are wrapped with
+recorded_call() at the call site.
+
+While a cassette is active the article store is bypassed, so every page
+download is captured and replayed rather than served from local disk.
+
+Requests are matched on method, URL and body. Credentials in the query
+string (key, api_key, apikey, token...) are redacted before the URL is
+stored or matched, and request headers are never written. Identical
+requests replay their recorded responses in order, repeating the last one.
+
+CASSETTE_LATENCY sets the replayed latency: "0" (default), a fixed number
+of seconds, or "recorded" for the original timings scaled by
+CASSETTE_LATENCY_SCALE.
+"""
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger("cassette")
+
+CASSETTE_MODE = os.getenv("CASSETTE_MODE", "off")  # off | record | replay
+CASSETTE_PATH = os.getenv("CASSETTE_PATH", os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "cassettes", "default.jsonl"))
+CASSETTE_LATENCY = os.getenv("CASSETTE_LATENCY", "0")
+CASSETTE_LATENCY_SCALE = float(os.getenv("CASSETTE_LATENCY_SCALE", "1.0"))
+
+SECRET_PARAMS = {"key", "api_key", "apikey", "token", "access_token", "apitoken", "auth"}
+# Describe the stored (decoded, complete) body, so they must not be replayed as recorded
+_DROPPED_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection", "set-cookie"}
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """Replay mode: the request was not recorded in the cassette."""
+
+
+def redact_url(url: str) -> str:
+    parts = urllib.parse.urlsplit(url)
+    query = [(k, "REDACTED" if k.lower() in SECRET_PARAMS else v)
+             for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)]
+    query.sort()
+    return urllib.parse.urlunsplit((parts.scheme, parts.netloc, parts.path, urllib.parse.urlencode(query), ""))
+
+
+def _body_bytes(body: Any) -> bytes:
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    if isinstance(body, (bytes, bytearray)):
+        return bytes(body)
+    return b""  # streamed/file bodies are not part of the match
+
+
+def http_key(method: str, url: str, body: Any = None) -> str:
+    payload = f"{method.upper()} {redact_url(url)}\n".encode("utf-8") + _body_bytes(body)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def llm_key(provider: str, model: str, prompt: str, config: Dict[str, Any]) -> str:
+    payload = json.dumps([provider, model, prompt, config], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    def __init__(self, path: str, mode: str):
+        self.path = path
+        self.mode = mode
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._replayed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.stats = {"recorded": 0, "replayed": 0, "missed": 0}
+        if mode == "replay":
+            self._load()
+        elif mode == "record":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            logger.warning(f"Cassette {self.path} does not exist; every request will miss")
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries.setdefault(entry["key"], []).append(entry)
+        logger.info(f"Loaded {sum(map(len, self._entries.values()))} exchanges from {self.path}")
+
+    def record(self, entry: Dict[str, Any]):
+        line = json.dumps(entry, sort_keys=True)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self.stats["recorded"] += 1
+
+    def rewind(self):
+        """Replay identical requests from their first recorded response again."""
+        with self._lock:
+            self._replayed.clear()
+
+    def replay(self, key: str, description: str) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.stats["missed"] += 1
+                raise CassetteMiss(f"Not in cassette {os.path.basename(self.path)}: {description}")
+            index = self._replayed.get(key, 0)
+            self._replayed[key] = index + 1
+            self.stats["replayed"] += 1
+            entry = entries[min(index, len(entries) - 1)]
+        _sleep_for(entry.get("elapsed", 0.0))
+        return entry
+
+
+def _sleep_for(recorded_elapsed: float):
+    if CASSETTE_LATENCY == "recorded":
+        delay = recorded_elapsed * CASSETTE_LATENCY_SCALE
+    else:
+        delay = float(CASSETTE_LATENCY or 0)
+    if delay > 0:
+        time.sleep(delay)
+
+
+_cassette: Optional[Cassette] = None
+_install_lock = threading.Lock()
+_local = threading.local()
+
+
+def active() -> Optional[Cassette]:
+    return _cassette
+
+
+@contextmanager
+def _suppressed():
+    """HTTP made inside an LLM call belongs to that call's recording."""
+    previous = getattr(_local, "suppressed", False)
+    _local.suppressed = True
+    try:
+        yield
+    finally:
+        _local.suppressed = previous
+
+
+def _error_entry(key: str, kind: str, description: str, error: Exception, elapsed: float) -> Dict[str, Any]:
+    return {"key": key, "kind": kind, "request": description,
+            "error": {"type": type(error).__name__, "message": str(error)[:500]}, "elapsed": round(elapsed, 4)}
+
+
+def _http_entry(key: str, kind: str, method: str, url: str, status: int, headers, final_url: str,
+                body: bytes, elapsed: float) -> Dict[str, Any]:
+    return {
+        "key": key, "kind": kind, "request": f"{method} {redact_url(url)}",
+        "response": {
+            "status": status,
+            "url": redact_url(final_url),
+            "headers": {k: v for k, v in headers.items() if k.lower() not in _DROPPED_HEADERS},
+            "body": base64.b64encode(body).decode("ascii"),
+        },
+        "elapsed": round(elapsed, 4),
+    }
+
+
+def _raise_recorded_error(entry: Dict[str, Any]):
+    error = entry["error"]
+    exc_type = getattr(requests.exceptions, error["type"], None)
+    if not (isinstance(exc_type, type) and issubclass(exc_type, requests.exceptions.RequestException)):
+        exc_type = requests.exceptions.ConnectionError
+    raise exc_type(f"[replayed] {error['message']}")
+
+# -------------------- REQUESTS --------------------
+_original_adapter_send = HTTPAdapter.send
+
+
+def _adapter_send(self, request, **kwargs):
+    cassette = _cassette
+    if cassette is None or getattr(_local, "suppressed", False):
+        return _original_adapter_send(self, request, **kwargs)
+    key = http_key(request.method, request.url, request.body)
+    description = f"{request.method} {redact_url(request.url)}"
+
+    if cassette.mode == "replay":
+        entry = cassette.replay(key, description)
+        if "error" in entry:
+            _raise_recorded_error(entry)
+        recorded = entry["response"]
+        body = base64.b64decode(recorded["body"])
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.headers = CaseInsensitiveDict({**recorded["headers"], "Content-Length": str(len(body))})
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url if recorded["url"] == redact_url(request.url) else recorded["url"]
+        response.request = request
+        response.reason = "Replayed"
+        response._content = body
+        response._content_consumed = True  # iter_content() then serves the stored body
+        return response
+
+    start = time.perf_counter()
+    try:
+        response = _original_adapter_send(self, request, **kwargs)
+        body = response.content  # read fully, even for stream=True, so the exchange can be stored
+    except requests.exceptions.RequestException as e:
+        cassette.record(_error_entry(key, "http", description, e, time.perf_counter() - start))
+        raise
+    cassette.record(_http_entry(key, "http", request.method, request.url, response.status_code,
+                                response.headers, response.url or request.url, body, time.perf_counter() - start))
+    return response
+
+# -------------------- HTTPX --------------------
+def _httpx_replay(httpx, cassette: Cassette, request):
+    url = str(request.url)
+    key = http_key(request.method, url, request.content)
+    entry = cassette.replay(key, f"{request.method} {redact_url(url)}")
+    if "error" in entry:
+        raise httpx.ConnectError(f"[replayed] {entry['error']['message']}", request=request)
+    recorded = entry["response"]
+    return httpx.Response(recorded["status"], headers=recorded["headers"],
+                          content=base64.b64decode(recorded["body"]), request=request)
+
+
+def _httpx_record(cassette: Cassette, request, response, body: bytes, elapsed: float):
+    url = str(request.url)
+    cassette.record(_http_entry(http_key(request.method, url, request.content), "httpx", request.method, url,
+                                response.status_code, response.headers, url, body, elapsed))
+
+
+def _install_httpx():
+    try:
+        import httpx
+    except ImportError:
+        return
+    original_sync = httpx.HTTPTransport.handle_request
+    original_async = httpx.AsyncHTTPTransport.handle_async_request
+
+    def handle_request(self, request):
+        cassette = _cassette
+        if cassette is None or getattr(_local, "suppressed", False):
+            return original_sync(self, request)
+        if cassette.mode == "replay":
+            return _httpx_replay(httpx, cassette, request)
+        start = time.perf_counter()
+        response = original_sync(self, request)
+        body = response.read()
+        _httpx_record(cassette, request, response, body, time.perf_counter() - start)
+        return response
+
+    async def handle_async_request(self, request):
+        cassette = _cassette
+        if cassette is None or getattr(_local, "suppressed", False):
+            return await original_async(self, request)
+        if cassette.mode == "replay":
+            return _httpx_replay(httpx, cassette, request)
+        start = time.perf_counter()
+        response = await original_async(self, request)
+        body = await response.aread()
+        _httpx_record(cassette, request, response, body, time.perf_counter() - start)
+        return response
+
+    httpx.HTTPTransport.handle_request = handle_request
+    httpx.AsyncHTTPTransport.handle_async_request = handle_async_request
+
+# -------------------- LLM --------------------
+def replaying() -> bool:
+    return _cassette is not None and _cassette.mode == "replay"
+
+
+def replay_llm(provider: str, model: str, prompt: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Recorded {"text", "input_tokens", "output_tokens"} for this prompt; raises CassetteMiss if absent."""
+    key = llm_key(provider, model, prompt, config)
+    entry = _cassette.replay(key, f"{provider}/{model} prompt sha256={key[:12]}")
+    if "error" in entry:
+        _raise_recorded_error(entry)
+    return entry["result"]
+
+
+def record_llm(provider: str, model: str, prompt: str, config: Dict[str, Any], call):
+    """Run `call()` (returning an llm_gateway.LLMResult), recording the exchange in record mode."""
+    cassette = _cassette
+    if cassette is None or cassette.mode != "record":
+        return call()
+    key = llm_key(provider, model, prompt, config)
+    description = f"{provider}/{model} prompt sha256={key[:12]}"
+    start = time.perf_counter()
+    try:
+        with _suppressed():
+            result = call()
+    except Exception as e:
+        cassette.record(_error_entry(key, "llm", description, e, time.perf_counter() - start))
+        raise
+    cassette.record({
+        "key": key, "kind": "llm", "request": description,
+        "result": {"text": result.text, "input_tokens": result.input_tokens, "output_tokens": result.output_tokens},
+        "elapsed": round(time.perf_counter() - start, 4),
+    })
+    return result
+
+
+# -------------------- OTHER CLIENTS --------------------
+def recorded_call(name: str, args: Any, call):
+    """
+    For clients that bypass requests/httpx (e.g. duckduckgo_search's own HTTP
+    stack): record or replay `call()`'s JSON-serialisable result under
+    (name, args). Outside cassette mode this is just `call()`.
+    """
+    cassette = _cassette
+    if cassette is None:
+        return call()
+    key = hashlib.sha256(json.dumps([name, args], sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    description = f"{name}({json.dumps(args, default=str)[:200]})"
+    if cassette.mode == "replay":
+        entry = cassette.replay(key, description)
+        if "error" in entry:
+            _raise_recorded_error(entry)
+        return entry["result"]
+    start = time.perf_counter()
+    try:
+        result = call()
+    except Exception as e:
+        cassette.record(_error_entry(key, "call", description, e, time.perf_counter() - start))
+        raise
+    cassette.record({"key": key, "kind": "call", "request": description, "result": result,
+                     "elapsed": round(time.perf_counter() - start, 4)})
+    return result
+
+
+def install(mode: str = CASSETTE_MODE, path: str = CASSETTE_PATH) -> Optional[Cassette]:
+    """Start recording or replaying for the whole process (idempotent for the same mode and path)."""
+    global _cassette
+    if mode not in ("record", "replay"):
+        return None
+    with _install_lock:
+        if _cassette is not None and (_cassette.mode, _cassette.path) == (mode, path):
+            return _cassette
+        if HTTPAdapter.send is not _adapter_send:
+            HTTPAdapter.send = _adapter_send
+            _install_httpx()
+        _cassette = Cassette(path, mode)
+        logger.warning(f"Cassette {mode} mode: {path}")
+        return _cassette
+
+
+def uninstall():
+    """Stop recording/replaying; traffic goes to the network again."""
+    global _cassette
+    with _install_lock:
+        _cassette = None
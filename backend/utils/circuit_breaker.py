@@ -0,0 +1,130 @@
+# backend/utils/circuit_breaker.py
+"""
+Per-provider circuit breakers.
+
+After CIRCUIT_FAILURE_THRESHOLD consecutive failures a provider's breaker
+opens and calls to it fail instantly with CircuitOpen instead of waiting
+for another timeout. After CIRCUIT_RESET_SECONDS one probe call is let
+through (half-open): success closes the breaker, failure re-opens it.
+
+Failures are connection errors, timeouts, 5xx responses and 401/403/429
+(bad key or spent quota); other 4xx answers are the caller's problem and
+count as successes. http_client.request and llm_gateway.generate consult
+the breaker for every provider call, so agents only need to treat
+CircuitOpen (or its `degraded` flag) as "this signal is unavailable".
+"""
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+from backend.utils.metrics import CIRCUIT_REJECTIONS, CIRCUIT_STATE
+
+logger = logging.getLogger("circuit-breaker")
+
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "60"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+FAILURE_STATUSES = frozenset({401, 403, 429})
+
+
+class CircuitOpen(requests.exceptions.RequestException):
+    """The provider's breaker is open; the call was skipped without touching the network."""
+    degraded = True
+
+
+def is_failure_status(status_code: Optional[int]) -> bool:
+    return status_code is not None and (status_code >= 500 or status_code in FAILURE_STATUSES)
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_seconds: float = CIRCUIT_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.last_error = ""
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        CIRCUIT_STATE.set(_STATE_VALUES[CLOSED], provider=name)
+
+    def _set_state(self, state: str):
+        # Called with the lock held
+        if state != self.state:
+            logger.warning(f"{self.name} circuit {self.state} -> {state}"
+                           + (f" ({self.last_error})" if state == OPEN else ""))
+        self.state = state
+        CIRCUIT_STATE.set(_STATE_VALUES[state], provider=self.name)
+
+    def before_call(self):
+        """Raise CircuitOpen unless a call may go out now (closed, or the single half-open probe)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self._set_state(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            retry_in = max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+        CIRCUIT_REJECTIONS.inc(provider=self.name)
+        raise CircuitOpen(f"{self.name} is unavailable (circuit open, retry in {retry_in:.0f}s): {self.last_error}")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probe_in_flight = False
+            self._set_state(CLOSED)
+
+    def record_failure(self, error: Any = ""):
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)[:200]
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+    def record_status(self, status_code: int):
+        if is_failure_status(status_code):
+            self.record_failure(f"HTTP {status_code}")
+        else:
+            self.record_success()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "last_error": self.last_error}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_lock = threading.Lock()
+
+
+def breaker_for(provider: str) -> CircuitBreaker:
+    with _lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            breaker = _breakers[provider] = CircuitBreaker(provider)
+        return breaker
+
+
+def is_open(provider: str) -> bool:
+    """True while calls to `provider` are being skipped."""
+    return breaker_for(provider).state != CLOSED
+
+
+def status() -> Dict[str, Any]:
+    with _lock:
+        breakers = dict(_breakers)
+    return {name: breaker.snapshot() for name, breaker in breakers.items()}
@@ -0,0 +1,98 @@
+# backend/utils/document.py
+"""
+Per-request page document shared by every /api/analyze stage.
+
+The page is downloaded once and parsed once; fetch_content, the reverse
+image search and cross-verification all read from the same object instead
+of each refetching and reparsing the URL. Article extraction goes through
+the shared engine in backend.utils.extraction.
+"""
+import threading
+import typing as T
+import urllib.parse
+
+from bs4 import BeautifulSoup
+
+from backend.utils import http_client
+
+DOCUMENT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+class PageDocument:
+    """Raw bytes, decoded HTML, parsed tree and extracted content for one URL."""
+
+    def __init__(self, url: str, raw: bytes, html: str, status_code: int = 200,
+                 headers: T.Optional[T.Dict[str, str]] = None):
+        self.url = url
+        self.raw = raw
+        self.html = html
+        self.status_code = status_code
+        self.headers = dict(headers or {})
+        self._lock = threading.Lock()
+        self._soup = None
+        self._og = None
+        self._content = None
+
+    @classmethod
+    def fetch(cls, url: str, timeout: int = 15) -> "PageDocument":
+        """Download `url` once (streamed and size-capped). Raises on network, HTTP or content-type errors."""
+        page = http_client.fetch_page(url, headers=DOCUMENT_HEADERS, timeout=timeout)
+        return cls(page.url, page.raw, page.text, page.status_code, page.headers)
+
+    @classmethod
+    def from_html(cls, url: str, html: str) -> "PageDocument":
+        """Wrap HTML that was obtained elsewhere (cache, fixtures)."""
+        return cls(url, html.encode("utf-8"), html)
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """Untouched parse tree. Shared between stages, so treat it as read-only."""
+        if self._soup is None:
+            with self._lock:
+                if self._soup is None:
+                    self._soup = BeautifulSoup(self.html, "html.parser")
+        return self._soup
+
+    @property
+    def og(self) -> T.Dict[str, str]:
+        """OpenGraph tags, e.g. {"og:title": ..., "og:image": ...}."""
+        if self._og is None:
+            og = {}
+            for meta in self.soup.find_all("meta"):
+                prop = meta.get("property") or meta.get("name") or ""
+                if prop.startswith("og:") and meta.get("content") and prop not in og:
+                    og[prop] = meta["content"]
+            self._og = og
+        return self._og
+
+    @property
+    def content(self) -> T.Dict[str, T.Any]:
+        """Cleaned article content in the extraction engine's schema, extracted once."""
+        if self._content is None:
+            from backend.utils.extraction import extract
+            with self._lock:
+                if self._content is None:
+                    self._content = extract(self.html, self.url)
+        return self._content
+
+    @property
+    def title(self) -> str:
+        return self.content.get("title") or ""
+
+    @property
+    def text(self) -> str:
+        return self.content.get("text") or ""
+
+    @property
+    def images(self) -> T.List[str]:
+        return self.content.get("images", [])
+
+    @property
+    def og_image(self) -> str:
+        src = self.og.get("og:image", "")
+        return urllib.parse.urljoin(self.url, src) if src else ""
@@ -0,0 +1,326 @@
+# backend/utils/embedding_cache.py
+"""
+Persistent embedding cache shared by every process that encodes with MiniLM.
+
+Embeddings are keyed by a hash of the exact text and stored per model as
+float16 rows of a memory-mapped numpy matrix; a SQLite index (WAL, like the
+article store) maps hash -> row and records when each row was last used.
+The model registry routes SentenceTransformer.encode through cached_encode():
+cached texts are read from the matrix, and only the misses are encoded, in
+one call (which the inference batcher may merge with other callers').
+
+Rows are appended until the matrix holds EMBEDDING_CACHE_MAX_ROWS; then an
+LRU compaction copies the most recently used EMBEDDING_CACHE_KEEP_RATIO of
+them into a new matrix file (a new generation) and drops the rest. Readers in
+other processes keep their mapping of the old file until they next see the
+new generation, so a compaction never moves rows under them.
+
+Vectors are stored unnormalized; normalize_embeddings and convert_to_tensor
+are applied on the way out, so every caller shares the same rows. Calls with
+other encode options bypass the cache. Cache errors are logged and treated as
+misses; they never fail an encode.
+"""
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from backend.utils import onnx_backend
+
+logger = logging.getLogger("embedding-cache")
+
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "1") != "0"
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "embeddings"))
+EMBEDDING_CACHE_MAX_ROWS = int(os.getenv("EMBEDDING_CACHE_MAX_ROWS", "200000"))
+EMBEDDING_CACHE_KEEP_RATIO = float(os.getenv("EMBEDDING_CACHE_KEEP_RATIO", "0.75"))
+# Flush last-used times after this many hits
+TOUCH_FLUSH_EVERY = 256
+
+CACHEABLE_OPTIONS = {"normalize_embeddings", "convert_to_tensor", "convert_to_numpy", "show_progress_bar", "batch_size"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key       BLOB PRIMARY KEY,
+    row       INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+CREATE TABLE IF NOT EXISTS meta (
+    id         INTEGER PRIMARY KEY CHECK (id = 1),
+    generation INTEGER NOT NULL,
+    dim        INTEGER NOT NULL,
+    capacity   INTEGER NOT NULL,
+    next_row   INTEGER NOT NULL
+);
+"""
+
+
+def text_key(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()[:16]
+
+
+def _chunks(items: List, size: int = 500) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class EmbeddingCache:
+    """One model's cache: a directory holding index.sqlite3 and vectors-<generation>.f16."""
+
+    def __init__(self, directory: str, max_rows: int = EMBEDDING_CACHE_MAX_ROWS,
+                 keep_ratio: float = EMBEDDING_CACHE_KEEP_RATIO):
+        self.directory = directory
+        self.max_rows = max_rows
+        self.keep_ratio = keep_ratio
+        self._lock = threading.Lock()
+        self._conn = None
+        self._vectors = None
+        self._generation = None
+        self._touched: Dict[bytes, float] = {}
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "compactions": 0, "errors": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        # Called with the lock held
+        if self._conn is None:
+            os.makedirs(self.directory, exist_ok=True)
+            conn = sqlite3.connect(os.path.join(self.directory, "index.sqlite3"), check_same_thread=False,
+                                   timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _vectors_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"vectors-{generation}.f16")
+
+    def _matrix(self, generation: int, dim: int, capacity: int, create: bool = False) -> Optional[np.memmap]:
+        # Called with the lock held
+        if self._generation == generation and self._vectors is not None:
+            return self._vectors
+        try:
+            matrix = np.memmap(self._vectors_path(generation), dtype=np.float16,
+                               mode="w+" if create else "r+", shape=(capacity, dim))
+        except FileNotFoundError:
+            return None  # compacted away by another process since the index was read
+        self._vectors, self._generation = matrix, generation
+        return matrix
+
+    def get(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """float32 vectors for the cached keys among `keys`."""
+        found = {}
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute("BEGIN")  # one snapshot for the generation and the rows
+                try:
+                    meta = conn.execute("SELECT generation, dim, capacity FROM meta").fetchone()
+                    rows = []
+                    if meta is not None:
+                        for chunk in _chunks(keys):
+                            rows.extend(conn.execute(
+                                f"SELECT key, row FROM entries WHERE key IN ({','.join('?' * len(chunk))})",
+                                chunk).fetchall())
+                finally:
+                    conn.execute("COMMIT")
+                matrix = self._matrix(*meta) if rows else None
+                if matrix is not None:
+                    vectors = np.asarray(matrix[np.array([row for _, row in rows])], dtype=np.float32)
+                    found = {key: vector for (key, _), vector in zip(rows, vectors)}
+                    now = time.time()
+                    self._touched.update((key, now) for key in found)
+                    flush_due = len(self._touched) >= TOUCH_FLUSH_EVERY
+                else:
+                    flush_due = False
+            if flush_due:
+                self.flush()
+        except (sqlite3.Error, OSError, ValueError) as e:
+            self._error("get", e)
+            return {}
+        self.stats["hits"] += len(found)
+        self.stats["misses"] += len(keys) - len(found)
+        return found
+
+    def put(self, keys: List[bytes], vectors: np.ndarray):
+        """Append float16 `vectors` for `keys`, compacting first when the matrix is full."""
+        vectors = np.asarray(vectors, dtype=np.float16)
+        if not keys or len(keys) > self.max_rows * (1 - self.keep_ratio):
+            return
+        stale_path = None
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    meta = conn.execute("SELECT generation, dim, capacity, next_row FROM meta").fetchone()
+                    if meta is None:
+                        meta = (1, vectors.shape[1], self.max_rows, 0)
+                        conn.execute("INSERT INTO meta (id, generation, dim, capacity, next_row) VALUES (1, ?, ?, ?, ?)",
+                                     meta)
+                        self._matrix(meta[0], meta[1], meta[2], create=True)
+                    generation, dim, capacity, next_row = meta
+                    if dim != vectors.shape[1]:
+                        raise ValueError(f"cached vectors have {dim} dimensions, got {vectors.shape[1]}")
+
+                    present = set()
+                    for chunk in _chunks(keys):
+                        present.update(key for key, in conn.execute(
+                            f"SELECT key FROM entries WHERE key IN ({','.join('?' * len(chunk))})", chunk))
+                    new = [i for i, key in enumerate(keys) if key not in present]
+                    if new:
+                        if next_row + len(new) > capacity:
+                            stale_path = self._vectors_path(generation)
+                            generation, next_row = self._compact(conn, generation, dim, capacity, len(new))
+                        matrix = self._matrix(generation, dim, capacity)
+                        matrix[next_row:next_row + len(new)] = vectors[new]
+                        now = time.time()
+                        conn.executemany("INSERT INTO entries (key, row, last_used) VALUES (?, ?, ?)",
+                                         [(keys[i], next_row + n, now) for n, i in enumerate(new)])
+                        conn.execute("UPDATE meta SET next_row = ? WHERE id = 1", (next_row + len(new),))
+                    self._flush_touched(conn)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    stale_path = None
+                    raise
+                self.stats["writes"] += len(new)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            self._error("put", e)
+            return
+        if stale_path:
+            try:
+                os.remove(stale_path)  # processes still mapping it keep their pages
+            except OSError:
+                pass
+
+    def _compact(self, conn: sqlite3.Connection, generation: int, dim: int, capacity: int, incoming: int):
+        """Copy the most recently used rows into a new generation; returns (generation, next_row)."""
+        self._flush_touched(conn)
+        keep = max(0, min(int(capacity * self.keep_ratio), capacity - incoming))
+        kept = conn.execute("SELECT key, row, last_used FROM entries ORDER BY last_used DESC LIMIT ?",
+                            (keep,)).fetchall()
+        old = self._matrix(generation, dim, capacity)
+        new = np.memmap(self._vectors_path(generation + 1), dtype=np.float16, mode="w+", shape=(capacity, dim))
+        if kept:
+            new[:len(kept)] = old[np.array([row for _, row, _ in kept])]
+        conn.execute("DELETE FROM entries")
+        conn.executemany("INSERT INTO entries (key, row, last_used) VALUES (?, ?, ?)",
+                         [(key, n, last_used) for n, (key, _, last_used) in enumerate(kept)])
+        conn.execute("UPDATE meta SET generation = ?, next_row = ? WHERE id = 1", (generation + 1, len(kept)))
+        self._vectors, self._generation = new, generation + 1
+        self.stats["compactions"] += 1
+        logger.info(f"Compacted {self.directory}: kept {len(kept)} of {capacity} rows")
+        return generation + 1, len(kept)
+
+    def _flush_touched(self, conn: sqlite3.Connection):
+        # Called with the lock held, inside a write transaction
+        if self._touched:
+            conn.executemany("UPDATE entries SET last_used = MAX(last_used, ?) WHERE key = ?",
+                             [(when, key) for key, when in self._touched.items()])
+            self._touched.clear()
+
+    def flush(self):
+        """Write pending last-used times to the index."""
+        try:
+            with self._lock:
+                if not self._touched:
+                    return
+                conn = self._connection()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._flush_touched(conn)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            self._error("flush", e)
+
+    def _error(self, operation: str, error: Exception):
+        self.stats["errors"] += 1
+        logger.warning(f"Embedding cache {operation} failed in {self.directory}: {error}")
+
+    def status(self) -> Dict[str, Any]:
+        summary = {"path": self.directory, **self.stats}
+        try:
+            with self._lock:
+                conn = self._connection()
+                entries, = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+                meta = conn.execute("SELECT generation, dim, capacity FROM meta").fetchone()
+            summary.update(entries=entries)
+            if meta:
+                summary.update(generation=meta[0], dim=meta[1], capacity=meta[2])
+        except sqlite3.Error as e:
+            summary["error"] = str(e)
+        return summary
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._vectors = self._generation = None
+
+
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(model_name: str) -> Optional[EmbeddingCache]:
+    """The process-wide cache for `model_name`, or None when EMBEDDING_CACHE_ENABLED=0."""
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    # ONNX/int8 embeddings differ slightly from PyTorch's, so each backend keeps its own rows
+    variant = f"onnx-{onnx_backend.ONNX_QUANTIZATION}" if onnx_backend.enabled() and onnx_backend.available() else "torch"
+    directory = os.path.join(EMBEDDING_CACHE_DIR, re.sub(r"[^A-Za-z0-9_.-]+", "--", model_name), variant)
+    with _caches_lock:
+        cache = _caches.get(directory)
+        if cache is None:
+            cache = _caches[directory] = EmbeddingCache(directory)
+        return cache
+
+
+def close():
+    with _caches_lock:
+        for cache in _caches.values():
+            cache.flush()
+            cache.close()
+
+
+def cached_encode(model_name: str, model: Any, encode: Callable) -> Callable:
+    """Wrap `encode` (SentenceTransformer.encode for `model`) with the cache for `model_name`."""
+    def encode_with_cache(*args, **kwargs):
+        cache = get_cache(model_name)
+        sentences = args[0] if len(args) == 1 else None
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else sentences
+        if (cache is None or not isinstance(texts, list) or not texts
+                or not all(isinstance(t, str) for t in texts) or not set(kwargs) <= CACHEABLE_OPTIONS
+                or not (kwargs.get("convert_to_numpy", True) or kwargs.get("convert_to_tensor", False))):
+            return encode(*args, **kwargs)
+
+        keys = [text_key(t) for t in texts]
+        found = cache.get(list(set(keys)))
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        if missing:
+            # Callers get the model's float32 output; only the stored copy is float16
+            encoded = np.asarray(encode(list(missing.values()), convert_to_numpy=True), dtype=np.float32)
+            cache.put(list(missing), encoded)
+            found.update(zip(missing, encoded))
+
+        matrix = np.stack([found[key] for key in keys])
+        if kwargs.get("normalize_embeddings"):
+            matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        result = matrix[0] if single else matrix
+        if kwargs.get("convert_to_tensor"):
+            import torch
+            return torch.from_numpy(result).to(model.device)
+        return result
+    return encode_with_cache
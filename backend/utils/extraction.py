@@ -0,0 +1,182 @@
+# backend/utils/extraction.py
+"""
+Article-extraction engine shared by every pipeline.
+
+One result schema for all backends:
+    {"title", "text", "images", "videos", "authors", "publish_date",
+     "sitename", "backend"}
+
+Backends run cheapest first (the lxml extractor in fetch_content, then
+trafilatura, then newspaper3k). The next ones only run when the result fails
+the quality check (too little text or no title): one after another by default,
+or all at once with EXTRACTION_STRATEGY=race, keeping the first good result.
+A backend whose library isn't installed is skipped.
+
+Results are cached by (content hash, page URL). Concurrent requests for the
+same page share one extraction, so a page is parsed once per content
+version, not once per pipeline. The URL is part of the key only because
+image links are resolved against it.
+"""
+import hashlib
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.utils.metrics import track_stage
+from backend.utils.result_cache import SingleFlightCache
+
+logger = logging.getLogger("extraction")
+
+EXTRACTION_MIN_CHARS = int(os.getenv("EXTRACTION_MIN_CHARS", "250"))
+EXTRACTION_STRATEGY = os.getenv("EXTRACTION_STRATEGY", "fallback")  # or "race"
+EXTRACTION_CACHE_SECONDS = float(os.getenv("EXTRACTION_CACHE_SECONDS", "3600"))
+
+Backend = Callable[[str, str], Dict[str, Any]]
+
+# Shared by all racing extractions so an abandoned slow backend never blocks the caller
+_race_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="extract-race")
+
+EMPTY_RESULT = {"title": "", "text": "", "images": [], "videos": [], "authors": [],
+                "publish_date": "", "sitename": "", "backend": ""}
+
+
+def _normalise(result: Dict[str, Any], backend: str) -> Dict[str, Any]:
+    normalised = dict(EMPTY_RESULT)
+    normalised.update({k: v for k, v in result.items() if v is not None})
+    normalised["title"] = (normalised["title"] or "").strip()
+    normalised["text"] = (normalised["text"] or "").strip()
+    normalised["backend"] = backend
+    return normalised
+
+# -------------------- BACKENDS --------------------
+def _lxml_backend(page_html: str, url: str) -> Dict[str, Any]:
+    from backend.utils.fetch_content import extract_content
+    return extract_content(page_html, url)
+
+
+def _trafilatura_backend(page_html: str, url: str) -> Dict[str, Any]:
+    import trafilatura
+    text = trafilatura.extract(page_html, url=url or None, include_comments=False,
+                               include_tables=False, no_fallback=True)
+    metadata = trafilatura.extract_metadata(page_html)
+    return {
+        "title": getattr(metadata, "title", "") or "",
+        "text": text or "",
+        "authors": [a.strip() for a in (getattr(metadata, "author", "") or "").split(";") if a.strip()],
+        "publish_date": getattr(metadata, "date", "") or "",
+        "sitename": getattr(metadata, "sitename", "") or "",
+    }
+
+
+def _newspaper_backend(page_html: str, url: str) -> Dict[str, Any]:
+    from newspaper import Article
+    article = Article(url or "http://localhost/")
+    article.download(input_html=page_html)
+    article.parse()
+    return {
+        "title": article.title or "",
+        "text": article.text or "",
+        "images": [article.top_image] if article.top_image else [],
+        "videos": list(article.movies or []),
+        "authors": article.authors or [],
+        "publish_date": str(article.publish_date) if article.publish_date else "",
+    }
+
+
+BACKENDS: List[Tuple[str, Backend]] = [
+    ("lxml", _lxml_backend),
+    ("trafilatura", _trafilatura_backend),
+    ("newspaper", _newspaper_backend),
+]
+
+
+def register_backend(name: str, backend: Backend, position: Optional[int] = None):
+    """Add (or replace) a backend; `position` 0 makes it the first one tried."""
+    existing = [i for i, (n, _) in enumerate(BACKENDS) if n == name]
+    for i in reversed(existing):
+        del BACKENDS[i]
+    BACKENDS.insert(len(BACKENDS) if position is None else position, (name, backend))
+    _cache.clear()
+
+# -------------------- ENGINE --------------------
+def is_good(result: Dict[str, Any], min_chars: int = EXTRACTION_MIN_CHARS) -> bool:
+    """Quality heuristic: a title and enough body text made of more than one line or sentence."""
+    text = result.get("text") or ""
+    return bool(result.get("title")) and len(text) >= min_chars and (text.count(".") + text.count("\n")) >= 2
+
+
+def _run(name: str, backend: Backend, page_html: str, url: str) -> Optional[Dict[str, Any]]:
+    try:
+        with track_stage("extraction", name):
+            return _normalise(backend(page_html, url), name)
+    except ImportError:
+        return None
+    except Exception as e:
+        logger.warning(f"{name} extraction failed for {url or 'page'}: {e}")
+        return None
+
+
+def _best(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Fill metadata the winning backend lacks from the others (e.g. lxml has images, trafilatura has dates)
+    results = [r for r in results if r]
+    if not results:
+        return dict(EMPTY_RESULT)
+    winner = dict(max(results, key=lambda r: (is_good(r), len(r["text"]))))
+    for other in results:
+        for key, value in other.items():
+            if key not in ("text", "backend") and not winner.get(key) and value:
+                winner[key] = value
+    return winner
+
+
+def _extract(page_html: str, url: str, min_chars: int) -> Dict[str, Any]:
+    available = list(BACKENDS)
+    if not available:
+        return dict(EMPTY_RESULT)
+    name, backend = available[0]
+    first = _run(name, backend, page_html, url)
+    if first and is_good(first, min_chars):
+        return first
+
+    rest = available[1:]
+    results = [first]
+    if EXTRACTION_STRATEGY == "race" and len(rest) > 1:
+        futures = [_race_pool.submit(_run, n, b, page_html, url) for n, b in rest]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if result and is_good(result, min_chars):
+                # Slower backends finish in the background; their results are dropped
+                for other in futures:
+                    other.cancel()
+                break
+    else:
+        for n, b in rest:
+            result = _run(n, b, page_html, url)
+            results.append(result)
+            if result and is_good(result, min_chars):
+                break
+    return _best(results)
+
+
+def content_key(page_html: str, url: str = "") -> str:
+    digest = hashlib.sha256(page_html.encode("utf-8", errors="replace")).hexdigest()
+    return f"{digest}:{url}"
+
+
+_cache = SingleFlightCache(ttl_seconds=EXTRACTION_CACHE_SECONDS, stale_seconds=0, max_entries=256,
+                           name="extraction")
+
+
+def extract(page_html: str, url: str = "", min_chars: int = EXTRACTION_MIN_CHARS) -> Dict[str, Any]:
+    """Extract an article from HTML. Returns a copy of the cached result in the common schema."""
+    if not page_html:
+        return dict(EMPTY_RESULT)
+    result, _ = _cache.get_or_compute((content_key(page_html, url), min_chars),
+                                      lambda: _extract(page_html, url, min_chars))
+    return {k: (list(v) if isinstance(v, list) else v) for k, v in result.items()}
+
+
+def extract_text(page_html: str, url: str = "") -> str:
+    return extract(page_html, url)["text"]
@@ -64,52 +64,173 @@
 
 #     print(content)
 # # backend/utils/fetch_content.py
-import requests
-from bs4 import BeautifulSoup
 import html
 import re
+import threading
 import urllib.parse
 import typing as T
+import lxml.html
+from lxml import etree
+from backend.utils.document import PageDocument
 
-def fetch_content(url: str) -> T.Dict[str, T.Any]:
-    """Fetch cleaned article content (title, text, images, videos) from a URL."""
+UNWANTED_TAGS = ("script", "style", "noscript", "iframe", "footer", "header", "form", "nav", "aside")
+BLOCK_TAGS = ("article", "main", "section", "div")
+VIDEO_EMBED_HOSTS = ("youtube.com", "youtu.be", "vimeo.com")
+# lxml parser objects must not be shared between threads, so keep one per thread
+_parsers = threading.local()
+
+def fetch_content(url: str, document: T.Optional[PageDocument] = None) -> T.Dict[str, T.Any]:
+    """
+    Fetch cleaned article content (title, text, images, videos) from a URL.
+    Pass an already downloaded `document` to reuse it instead of refetching.
+    """
+    if document is None:
+        try:
+            document = PageDocument.fetch(url)
+        except Exception as e:
+            return {"error": str(e), "title": "", "text": "", "images": [], "videos": []}
+    return dict(document.content)
+
+def _html_parser():
+    parser = getattr(_parsers, "parser", None)
+    if parser is None:
+        # huge_tree lifts libxml2's nesting limit; without it deeply nested pages parse as empty
+        parser = _parsers.parser = lxml.html.HTMLParser(huge_tree=True)
+    return parser
+
+def _parse_html(page_html: str):
     try:
-        resp = requests.get(
-            url,
-            headers={"User-Agent": "Mozilla/5.0 (compatible; CleanBot/1.0)"},
-            timeout=15,
-        )
-        resp.raise_for_status()
-    except Exception as e:
-        return {"error": str(e), "title": "", "text": "", "images": [], "videos": []}
+        return lxml.html.document_fromstring(page_html, parser=_html_parser())
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        return lxml.html.document_fromstring(page_html.encode("utf-8"), parser=_html_parser())
+    except etree.ParserError:
+        return None
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+def _join_text(el) -> str:
+    """Equivalent of BeautifulSoup's get_text(" ", strip=True) for an lxml element."""
+    return " ".join(s for s in (t.strip() for t in el.itertext(etree.Element)) if s)
 
-    # remove unwanted sections
-    for tag in soup(["script", "style", "noscript", "iframe", "footer", "header", "form", "nav", "aside"]):
-        tag.decompose()
+def _score_blocks(root) -> T.Dict[T.Any, T.Tuple[int, int]]:
+    """
+    One bottom-up pass over the tree computing, for every element, the length of
+    its visible text and of the text inside links. Each node is visited once,
+    so the cost is linear in DOM size instead of re-walking every subtree.
 
-    # --- Extract title ---
-    title = (soup.title.string or "").strip() if soup.title else ""
+    Returns {block element: (text_len, link_text_len)} for the BLOCK_TAGS
+    elements, with text_len matching len(get_text(" ", strip=True)).
+    """
+    blocks = {}
+    # (sum of stripped string lengths, number of non-empty strings) per element
+    text_stats = {}
+    link_stats = {}
+    # Reversed pre-order visits every child before its parent
+    for el in reversed(list(root.iter())):
+        if not isinstance(el.tag, str):
+            continue
+        total, count = 0, 0
+        link_total, link_count = 0, 0
+        if el.text:
+            stripped = el.text.strip()
+            if stripped:
+                total += len(stripped)
+                count += 1
+        for child in el:
+            if isinstance(child.tag, str):
+                c_total, c_count = text_stats.pop(child)
+                l_total, l_count = link_stats.pop(child)
+                total += c_total
+                count += c_count
+                link_total += l_total
+                link_count += l_count
+            if child.tail:
+                stripped = child.tail.strip()
+                if stripped:
+                    total += len(stripped)
+                    count += 1
+        if el.tag == "a":
+            link_total, link_count = total, count
+        text_stats[el] = (total, count)
+        link_stats[el] = (link_total, link_count)
+        if el.tag in BLOCK_TAGS:
+            # Strings are joined with single spaces, hence the count - 1 separators
+            blocks[el] = (total + max(count - 1, 0), link_total + max(link_count - 1, 0))
+    return blocks
 
-    # --- Find main content block ---
-    candidates = soup.find_all(["article", "main", "section", "div"], recursive=True)
+def _find_main_block(root):
+    """
+    Pick the article/main/section/div with the most non-link text.
+
+    Scores are text_len * (1 - link_density), computed in a single pass by
+    _score_blocks. For blocks without links this is the plain text length, so
+    the choice matches the previous "longest get_text()" heuristic, while
+    link-heavy wrappers (menus, related-story lists) are now penalised.
+    """
+    blocks = _score_blocks(root)
     main_block = None
-    max_text_len = 0
+    best_score = 0.0
+    # Document order, so ties keep the outermost block as before
+    for el in root.iter(*BLOCK_TAGS):
+        text_len, link_len = blocks[el]
+        if not text_len:
+            continue
+        score = text_len * (1.0 - min(link_len, text_len) / text_len)
+        if score > best_score:
+            main_block = el
+            best_score = score
+    return main_block
+
+def _meta_tags(root) -> T.Dict[str, str]:
+    """First content value of each <meta property|name=...>, keyed by the lower-cased name."""
+    tags = {}
+    for el in root.iter("meta"):
+        name = (el.get("property") or el.get("name") or "").lower()
+        content = el.get("content")
+        if name and content and name not in tags:
+            tags[name] = content.strip()
+    return tags
+
+def extract_content(page_html: str, url: str) -> T.Dict[str, T.Any]:
+    """Extract cleaned article content (title, text, images, videos, metadata) from HTML."""
+    root = _parse_html(page_html)
+    if root is None:
+        return {"title": "", "text": "", "images": [], "videos": [],
+                "authors": [], "publish_date": "", "sitename": ""}
+
+    videos = []
+    seen_videos = set()
 
-    for c in candidates:
-        text_len = len(c.get_text(" ", strip=True))
-        if text_len > max_text_len:
-            main_block = c
-            max_text_len = text_len
+    # YouTube / Vimeo embeds (collected before iframes are stripped below)
+    for iframe in root.iter("iframe"):
+        src = iframe.get("src")
+        if src and any(x in src for x in VIDEO_EMBED_HOSTS) and src not in seen_videos:
+            seen_videos.add(src)
+            videos.append(src)
+
+    # remove unwanted sections (drop_tree keeps the trailing text that follows the element)
+    for el in list(root.iter(*UNWANTED_TAGS)):
+        if el.getparent() is not None:
+            el.drop_tree()
+
+    # --- Extract title ---
+    title_el = root.find(".//title")
+    title = (title_el.text or "").strip() if title_el is not None else ""
+
+    # --- Metadata from <meta> tags ---
+    meta = _meta_tags(root)
+    authors = [a.strip() for a in meta.get("author", "").split(",") if a.strip()]
+    publish_date = meta.get("article:published_time") or meta.get("date") or ""
+    sitename = meta.get("og:site_name", "")
 
-    if main_block:
-        text_parts = main_block.find_all(["p", "li"])
-        text = "\n".join(t.get_text(" ", strip=True) for t in text_parts)
+    # --- Find main content block ---
+    main_block = _find_main_block(root)
+
+    if main_block is not None:
+        text_parts = main_block.iter("p", "li")
     else:
         # fallback
-        ps = soup.find_all("p")
-        text = "\n".join(p.get_text(" ", strip=True) for p in ps)
+        text_parts = root.iter("p")
+    text = "\n".join(_join_text(t) for t in text_parts)
 
     text = html.unescape(text)
     text = re.sub(r"\s+\n", "\n", text)
@@ -117,38 +238,36 @@ def fetch_content(url: str) -> T.Dict[str, T.Any]:
 
     # --- IMAGES ---
     images = []
-    for img in soup.find_all("img"):
+    seen_images = set()
+    for img in root.iter("img"):
         src = img.get("src") or img.get("data-src") or img.get("data-original")
         if src and not src.startswith("data:"):
             abs_url = urllib.parse.urljoin(url, src)
-            if abs_url not in images:
+            if abs_url not in seen_images:
+                seen_images.add(abs_url)
                 images.append(abs_url)
 
     # --- VIDEOS ---
-    videos = []
-    for vid in soup.find_all("video"):
+    for vid in root.iter("video"):
         src = vid.get("src")
         if not src:
-            sources = vid.find_all("source")
-            if sources:
-                src = sources[0].get("src")
+            source = vid.find(".//source")
+            if source is not None:
+                src = source.get("src")
         if src:
             abs_url = urllib.parse.urljoin(url, src)
-            if abs_url not in videos:
+            if abs_url not in seen_videos:
+                seen_videos.add(abs_url)
                 videos.append(abs_url)
 
-    # YouTube / Vimeo embeds
-    for iframe in soup.find_all("iframe"):
-        src = iframe.get("src")
-        if src and any(x in src for x in ["youtube.com", "youtu.be", "vimeo.com"]):
-            if src not in videos:
-                videos.append(src)
-
     return {
         "title": title,
         "text": text,
         "images": images,
         "videos": videos,
+        "authors": authors,
+        "publish_date": publish_date,
+        "sitename": sitename,
     }
 
 if __name__ == "__main__":
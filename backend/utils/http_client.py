@@ -0,0 +1,410 @@
+# backend/utils/http_client.py
+"""
+Shared HTTP client layer for every outbound call.
+
+Instead of bare `requests.get` (a new TCP+TLS handshake per call) all
+fetchers go through one pooled `requests.Session`:
+  - keep-alive connection pools per host, sized to the per-host limit;
+  - at most HTTP_PER_HOST_LIMIT concurrent requests to any one host;
+  - process-wide DNS cache (getaddrinfo results kept DNS_CACHE_SECONDS);
+  - uniform (connect, read) timeouts when a caller doesn't pass one;
+  - retry with exponential backoff on connection errors and 502/503/504.
+
+Responses and exceptions are plain `requests` ones, so existing
+`raise_for_status()` / `except requests.exceptions...` handling keeps working.
+Passing `provider=` records the call in the upstream metrics, meters it
+against that provider's quota (sharing identical concurrent calls) and
+routes it through the provider's circuit breaker.
+
+`fetch_page` streams HTML pages instead of buffering whole bodies: the
+content type is checked before any body byte is read, bodies are capped at
+MAX_PAGE_BYTES, decoding trusts the declared or <meta> charset (no charset
+sniffing), and callers that only need article text can stop the download
+once enough paragraph text has arrived. Pages are read through the local
+article store, so each article is downloaded once per deployment rather
+than once per pipeline.
+"""
+import codecs
+import logging
+import os
+import re
+import socket
+import threading
+import time
+import urllib.parse
+from contextlib import nullcontext
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from backend.utils import api_quota, article_store, cassette, circuit_breaker, upstream_redirect
+from backend.utils.article_store import StoredPage
+from backend.utils.metrics import track_provider
+from backend.utils.result_cache import SingleFlightCache
+from backend.utils.urls import canonicalize_url
+
+logger = logging.getLogger("http-client")
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "15"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_BACKOFF_SECONDS = float(os.getenv("HTTP_BACKOFF_SECONDS", "0.5"))
+HTTP_PER_HOST_LIMIT = int(os.getenv("HTTP_PER_HOST_LIMIT", "8"))
+# How many distinct hosts keep an idle connection pool around
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "64"))
+DNS_CACHE_SECONDS = float(os.getenv("DNS_CACHE_SECONDS", "300"))
+# Decompressed bytes; pages above this are cut off, Content-Length above it is refused
+MAX_PAGE_BYTES = int(os.getenv("MAX_PAGE_BYTES", str(5 * 1024 * 1024)))
+PAGE_CHUNK_BYTES = 64 * 1024
+
+DEFAULT_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+# 429 is deliberately absent: a quota response won't clear within a backoff window
+RETRY_STATUSES = (502, 503, 504)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# -------------------- DNS CACHE --------------------
+_original_getaddrinfo = socket.getaddrinfo
+_dns_cache: Dict[tuple, tuple] = {}
+_dns_lock = threading.Lock()
+_DNS_CACHE_MAX_ENTRIES = 2048
+
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    key = (host, port, family, type, proto, flags)
+    now = time.monotonic()
+    with _dns_lock:
+        entry = _dns_cache.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    # Failures are not cached; they propagate as usual
+    result = _original_getaddrinfo(host, port, family, type, proto, flags)
+    with _dns_lock:
+        if len(_dns_cache) >= _DNS_CACHE_MAX_ENTRIES:
+            _dns_cache.clear()
+        _dns_cache[key] = (now + DNS_CACHE_SECONDS, result)
+    return result
+
+
+def install_dns_cache():
+    """Cache name resolution for the whole process."""
+    if DNS_CACHE_SECONDS > 0 and socket.getaddrinfo is not _cached_getaddrinfo:
+        socket.getaddrinfo = _cached_getaddrinfo
+
+
+install_dns_cache()
+# Load tests against local stub upstreams; a no-op unless UPSTREAM_REDIRECT_URL is set
+upstream_redirect.install()
+# Record/replay for offline benchmarks (utils.cassette); a no-op unless CASSETTE_MODE is set
+cassette.install()
+
+# -------------------- PER-HOST LIMITS --------------------
+_host_slots: Dict[str, threading.BoundedSemaphore] = {}
+_slots_lock = threading.Lock()
+
+
+def _host(url: str) -> str:
+    return (urllib.parse.urlsplit(url).hostname or "").lower()
+
+
+def _host_slot(url: str) -> threading.BoundedSemaphore:
+    host = _host(url)
+    with _slots_lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = _host_slots[host] = threading.BoundedSemaphore(HTTP_PER_HOST_LIMIT)
+        return slot
+
+
+def _provider_span(provider: Optional[str], operation: str):
+    return track_provider(provider, operation) if provider else nullcontext()
+
+# -------------------- SYNC CLIENT --------------------
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF_SECONDS,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=IDEMPOTENT_METHODS,
+        raise_on_status=False,          # hand the last response back; callers decide
+        respect_retry_after_header=False,
+    )
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_PER_HOST_LIMIT,
+                          max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # Shared across every caller and thread, so never carry cookies from one site visit to the next
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def request(method: str, url: str, provider: Optional[str] = None, operation: str = "request",
+            dedupe: bool = True, **kwargs) -> requests.Response:
+    """
+    `requests.request` over the shared pool. Extra kwargs are passed through unchanged.
+
+    Calls naming a `provider` are metered against its quota and de-duplicated
+    (utils.api_quota); `dedupe=False` keeps the metering but never shares or
+    reuses the response. They also go through the provider's circuit
+    breaker, raising circuit_breaker.CircuitOpen while it is open.
+    """
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+
+    def send() -> requests.Response:
+        with _host_slot(url), _provider_span(provider, operation):
+            return get_session().request(method, url, **kwargs)
+
+    def guarded_send() -> requests.Response:
+        breaker = circuit_breaker.breaker_for(provider)
+        breaker.before_call()
+        try:
+            response = send()
+        except requests.exceptions.RequestException as e:
+            breaker.record_failure(e)
+            raise
+        except BaseException:
+            breaker.record_success()  # not the provider's fault; don't leave a half-open probe hanging
+            raise
+        breaker.record_status(response.status_code)
+        return response
+
+    if provider:
+        return api_quota.call(provider, method, url, kwargs, guarded_send,
+                              share=dedupe and not kwargs.get("stream"))
+    return send()
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+# -------------------- PAGE DOWNLOADS --------------------
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "application/xml", "text/xml", "text/plain")
+
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.I)
+# Tags that end an open <p>: its own end tag, the next <p>, or any block-level
+# start/end tag, since </p> is optional in HTML. Bounded so no match scans far.
+_BLOCK_TAG_RE = re.compile(
+    rb"<(/?)(p|div|section|article|main|aside|header|footer|nav|h[1-6]|ul|ol|li|dl|table|tr|td|th"
+    rb"|blockquote|pre|figure|form|hr|body|html)\b[^<>]{0,1024}>", re.I)
+_TAG_RE = re.compile(rb"<[^<>]*>")
+# Re-scanned bytes at the end of each chunk, so a tag split across chunks is still seen
+_TAG_OVERLAP_BYTES = 1100
+_BOMS = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+
+
+# Nothing is kept in memory (the article store is the cache); this only joins concurrent fetches
+_page_flights = SingleFlightCache(ttl_seconds=0, stale_seconds=0, should_cache=lambda page: False, name="page-fetch")
+
+
+class DownloadRejected(requests.exceptions.RequestException):
+    """The response was not fetched in full because of its type or size."""
+
+
+class Page:
+    """A downloaded page: raw bytes plus the decoded HTML."""
+
+    def __init__(self, url: str, status_code: int, headers, raw: bytes, truncated: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.raw = raw
+        # True when the body was cut short by the size cap or by `enough_text`
+        self.truncated = truncated
+        self.encoding = detect_encoding(raw, headers.get("Content-Type", ""))
+        self._text = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.raw.decode(self.encoding, errors="replace")
+        return self._text
+
+
+def _known_codec(name) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.decode("ascii", "ignore") if isinstance(name, bytes) else name).name
+    except LookupError:
+        return None
+
+
+def detect_encoding(raw: bytes, content_type: str = "") -> str:
+    """
+    Charset from the BOM, the Content-Type header or a <meta> tag in the first
+    4 KB, else UTF-8. Never falls back to statistical detection, which is what
+    makes `requests.Response.text` slow on large pages.
+    """
+    for bom, name in _BOMS:
+        if raw.startswith(bom):
+            return name
+    declared = _known_codec(requests.utils.get_encoding_from_headers({"content-type": content_type})
+                            if "charset" in content_type.lower() else None)
+    if declared:
+        return declared
+    match = _META_CHARSET_RE.search(raw[:4096])
+    declared = _known_codec(match.group(1)) if match else None
+    # A <meta> can't truthfully declare UTF-16 (it wouldn't be readable as ASCII); the HTML spec reads it as UTF-8
+    if not declared or declared.startswith("utf-16"):
+        return "utf-8"
+    return declared
+
+
+def _media_type(content_type: str) -> str:
+    return content_type.split(";", 1)[0].strip().lower()
+
+
+class ParagraphCounter:
+    """
+    Counts visible characters of finished <p> elements in a growing buffer.
+
+    Each feed() scans only the bytes added since the last one (plus a short
+    overlap for split tags), so a download is scanned in linear time however
+    the paragraphs are written.
+    """
+
+    def __init__(self):
+        self.chars = 0
+        self._pos = 0
+        self._open_at: Optional[int] = None  # content start of the <p> still open
+
+    def feed(self, buffer) -> int:
+        """Scan `buffer` (the whole download so far) and return the running total."""
+        for match in _BLOCK_TAG_RE.finditer(buffer, self._pos):
+            if self._open_at is not None:
+                self.chars += len(_TAG_RE.sub(b"", bytes(buffer[self._open_at:match.start()])).strip())
+                self._open_at = None
+            if not match.group(1) and match.group(2).lower() == b"p":
+                self._open_at = match.end()
+            self._pos = match.end()
+        self._pos = max(self._pos, len(buffer) - _TAG_OVERLAP_BYTES)
+        return self.chars
+
+
+def _download(url: str, headers: Optional[Dict[str, str]], timeout, max_bytes: int, enough_text: Optional[int],
+              allowed_types: Tuple[str, ...], provider: Optional[str], operation: str,
+              stored: Optional[StoredPage] = None) -> Page:
+    if stored is not None:
+        headers = {**(headers or {}), **stored.conditional_headers()}
+    with _host_slot(url), _provider_span(provider, operation):
+        response = get_session().get(url, headers=headers, timeout=timeout or DEFAULT_TIMEOUT, stream=True)
+        with response:
+            if response.status_code == 304 and stored is not None:
+                article_store.get_store().mark_validated(url, response.headers)
+                return _page_from_store(stored, max_bytes)
+            response.raise_for_status()
+            media_type = _media_type(response.headers.get("Content-Type", ""))
+            if media_type and media_type not in allowed_types:
+                raise DownloadRejected(f"Refusing {media_type} response from {url}", response=response)
+            declared_length = response.headers.get("Content-Length", "")
+            # Only meaningful when the body isn't compressed; otherwise the cap applies while reading
+            if declared_length.isdigit() and not response.headers.get("Content-Encoding") \
+                    and int(declared_length) > max_bytes:
+                raise DownloadRejected(f"{url} is {declared_length} bytes (limit {max_bytes})", response=response)
+
+            buffer = bytearray()
+            truncated = stopped_early = False
+            paragraphs = ParagraphCounter()
+            for chunk in response.iter_content(PAGE_CHUNK_BYTES):
+                if not buffer and chunk[:5] == b"%PDF-":
+                    raise DownloadRejected(f"{url} is a PDF served as {media_type or 'unknown type'}",
+                                           response=response)
+                buffer += chunk
+                if len(buffer) >= max_bytes:
+                    del buffer[max_bytes:]
+                    truncated = True
+                    logger.info(f"Truncated {url} at {max_bytes} bytes")
+                    break
+                if enough_text:
+                    if paragraphs.feed(buffer) >= enough_text:
+                        truncated = stopped_early = True
+                        break
+            page = Page(response.url or url, response.status_code, response.headers, bytes(buffer), truncated)
+
+    store = article_store.get_store()
+    if store is not None and page.status_code == 200:
+        store.save(url, page.url, page.status_code, page.headers, page.raw, truncated,
+                   text_target=enough_text if stopped_early else 0)
+    return page
+
+
+def _page_from_store(stored: StoredPage, max_bytes: int) -> Page:
+    raw = stored.raw[:max_bytes]
+    return Page(stored.url, stored.status_code, stored.headers, raw,
+                stored.truncated or len(raw) < len(stored.raw))
+
+
+def fetch_page(url: str, headers: Optional[Dict[str, str]] = None, timeout=None,
+               max_bytes: int = MAX_PAGE_BYTES, enough_text: Optional[int] = None,
+               allowed_types: Tuple[str, ...] = HTML_CONTENT_TYPES,
+               provider: Optional[str] = None, operation: str = "page", use_store: bool = True) -> Page:
+    """
+    Stream an HTML page. Raises requests.HTTPError for error statuses (before
+    reading the body) and DownloadRejected for non-HTML or oversized responses.
+
+    `enough_text` stops the download once that many characters of paragraph
+    text have arrived; use it where only the article body is needed.
+
+    Reads through the article store (utils.article_store): URL variants of a
+    page stored recently are served from disk, older ones are revalidated
+    with a conditional request. Concurrent fetches of one page share a
+    single download. `use_store=False` always downloads.
+    """
+    store = article_store.get_store() if use_store else None
+    if store is None:
+        return _download(url, headers, timeout, max_bytes, enough_text, allowed_types, provider, operation)
+
+    def load() -> Page:
+        stored = store.lookup(url)
+        if stored is not None and not (stored.serves(enough_text)
+                                       and _media_type(stored.content_type) in allowed_types + ("",)):
+            stored = None
+        if stored is not None and stored.fresh:
+            return _page_from_store(stored, max_bytes)
+        return _download(url, headers, timeout, max_bytes, enough_text, allowed_types, provider, operation, stored)
+
+    page, _ = _page_flights.get_or_compute((canonicalize_url(url), enough_text or 0, max_bytes), load)
+    return page
+
+def close():
+    global _session
+    article_store.close()
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def status() -> Dict[str, object]:
+    with _dns_lock:
+        dns_entries = len(_dns_cache)
+    return {
+        "timeout": {"connect": HTTP_CONNECT_TIMEOUT, "read": HTTP_READ_TIMEOUT},
+        "retries": HTTP_RETRIES,
+        "per_host_limit": HTTP_PER_HOST_LIMIT,
+        "pooled_hosts": len(_host_slots),
+        "dns_cache_entries": dns_entries,
+        "page_fetches": _page_flights.snapshot(),
+        "api": api_quota.status(),
+        "circuits": circuit_breaker.status(),
+    }
@@ -0,0 +1,238 @@
+# backend/utils/inference_batcher.py
+"""
+Micro-batching for the shared transformer models.
+
+Concurrent callers of the same model method (with the same options) are
+queued and served by one worker thread per model method, which concatenates
+their inputs, runs a single forward pass and hands each caller its slice of
+the output. Callers keep their one-input-at-a-time code; the model registry
+routes InstrumentedModel calls through run().
+
+Batchable calls:
+  - SentenceTransformer.encode(str | list[str], **options)
+  - CrossEncoder.predict(list[(a, b)], **options)
+  - text-classification / sentiment-analysis pipelines called with one str or
+    one {"text", "text_pair"} dict
+  - zero-shot-classification pipelines called with one str and its labels
+
+Anything else runs directly, as before. A worker waits up to
+INFERENCE_BATCH_WAIT_MS for more requests only while its previous batch held
+several (i.e. under concurrent load), so a lone sequential caller pays no
+added latency. Batches stop at INFERENCE_BATCH_MAX inputs; one request is
+never split. If a batched forward pass fails, its requests are retried one
+by one so a bad input only fails its own caller.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.utils.metrics import INFERENCE_BATCH_SIZE, INFERENCE_QUEUE_WAIT_SECONDS, track_inference
+
+logger = logging.getLogger("inference-batcher")
+
+INFERENCE_BATCHING = os.getenv("INFERENCE_BATCHING", "1") != "0"
+INFERENCE_BATCH_WAIT_MS = float(os.getenv("INFERENCE_BATCH_WAIT_MS", "5"))
+INFERENCE_BATCH_MAX = int(os.getenv("INFERENCE_BATCH_MAX", "32"))
+
+CLASSIFICATION_TASKS = ("text-classification", "sentiment-analysis")
+ZERO_SHOT_TASK = "zero-shot-classification"
+
+
+class _Request:
+    __slots__ = ("items", "enqueued", "done", "result", "error")
+
+    def __init__(self, items: List[Any]):
+        self.items = items
+        self.enqueued = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class MicroBatcher:
+    """Serves one model method with fixed options; `forward(items)` returns one output per item."""
+
+    def __init__(self, forward: Callable[[List[Any]], Any], labels: Tuple[str, str, str],
+                 max_batch: int = INFERENCE_BATCH_MAX, max_wait: float = INFERENCE_BATCH_WAIT_MS / 1000):
+        self._forward = forward
+        self._labels = labels  # (kind, model, method)
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._last_batch_requests = 0
+
+    def submit(self, items: List[Any]):
+        """Block until `items` went through a forward pass; returns their outputs."""
+        request = _Request(items)
+        with self._cond:
+            self._queue.append(request)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name=f"batcher-{self._labels[1]}", daemon=True)
+                self._worker.start()
+            self._cond.notify()
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _next_batch(self) -> List[_Request]:
+        with self._cond:
+            while not self._queue:
+                self._cond.wait()
+            batch = [self._queue.popleft()]
+            size = len(batch[0].items)
+            # Only hold the batch open when callers are known to be arriving concurrently
+            deadline = time.perf_counter() + self.max_wait if self._last_batch_requests > 1 else None
+            while size < self.max_batch:
+                if self._queue:
+                    if size + len(self._queue[0].items) > self.max_batch:
+                        break
+                    request = self._queue.popleft()
+                    batch.append(request)
+                    size += len(request.items)
+                    continue
+                remaining = deadline - time.perf_counter() if deadline is not None else 0
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            self._last_batch_requests = len(batch)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._execute(batch)
+            except BaseException as e:  # never let the worker die with callers waiting
+                for request in batch:
+                    if not request.done.is_set():
+                        request.error = e
+                        request.done.set()
+
+    def _call(self, items: List[Any]):
+        kind, model, method = self._labels
+        with track_inference(kind, model, method):
+            outputs = self._forward(items)
+        if isinstance(outputs, dict):  # some pipelines unwrap single-item lists
+            outputs = [outputs]
+        if len(outputs) != len(items):
+            raise ValueError(f"{model}.{method} returned {len(outputs)} outputs for {len(items)} inputs")
+        return outputs
+
+    def _execute(self, batch: List[_Request]):
+        kind, model, method = self._labels
+        now = time.perf_counter()
+        items = []
+        for request in batch:
+            INFERENCE_QUEUE_WAIT_SECONDS.observe(now - request.enqueued, model=model, method=method)
+            items.extend(request.items)
+        INFERENCE_BATCH_SIZE.observe(len(items), model=model, method=method)
+
+        try:
+            outputs = self._call(items)
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0].error = e
+                batch[0].done.set()
+                return
+            logger.warning(f"Batched {model}.{method} failed for {len(items)} inputs, retrying one by one: {e}")
+            for request in batch:
+                try:
+                    request.result = self._call(request.items)
+                except Exception as single_error:
+                    request.error = single_error
+                request.done.set()
+            return
+
+        offset = 0
+        for request in batch:
+            request.result = outputs[offset:offset + len(request.items)]
+            offset += len(request.items)
+            request.done.set()
+
+
+_batchers: Dict[Tuple, MicroBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def _freeze(options: Dict[str, Any]) -> Optional[Tuple]:
+    """Hashable form of call options, or None when they can't key a batch."""
+    frozen = tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in options.items()))
+    try:
+        hash(frozen)
+    except TypeError:
+        return None
+    return frozen
+
+
+def _plan(kind: str, task: str, method: str, args: tuple, kwargs: Dict[str, Any]):
+    """(items, options, unpack) for a batchable call, or None to run it directly."""
+    if method == "encode" and len(args) == 1:
+        sentences = args[0]
+        if isinstance(sentences, str):
+            return [sentences], kwargs, lambda out: out[0]
+        if isinstance(sentences, list) and sentences and all(isinstance(s, str) for s in sentences):
+            return sentences, kwargs, lambda out: out
+    elif method == "predict" and len(args) == 1:
+        pairs = args[0]
+        if (isinstance(pairs, list) and pairs
+                and all(isinstance(p, (list, tuple)) and len(p) == 2 for p in pairs)):
+            return list(pairs), kwargs, lambda out: out
+    elif method == "__call__" and kind == "pipeline":
+        if task in CLASSIFICATION_TASKS and len(args) == 1 and not kwargs:
+            inputs = args[0]
+            # Same shapes transformers returns for a single input
+            if isinstance(inputs, str):
+                return [inputs], {}, lambda out: [out[0]]
+            if isinstance(inputs, dict) and set(inputs) == {"text", "text_pair"}:
+                return [inputs], {}, lambda out: out[0]
+        elif task == ZERO_SHOT_TASK and args and isinstance(args[0], str):
+            options = dict(kwargs)
+            if len(args) == 2:
+                options["candidate_labels"] = args[1]
+            elif len(args) > 2:
+                return None
+            labels = options.get("candidate_labels")
+            if isinstance(labels, str):
+                options["candidate_labels"] = [labels]
+            elif not isinstance(labels, (list, tuple)) or not labels:
+                return None
+            return [args[0]], options, lambda out: out[0]
+    return None
+
+
+def _batcher(target: Any, fn: Callable, kind: str, name: str, method: str, options: Dict[str, Any],
+             frozen: Tuple) -> MicroBatcher:
+    key = (id(target), method, frozen)
+    batcher = _batchers.get(key)
+    if batcher is None:
+        with _batchers_lock:
+            batcher = _batchers.get(key)
+            if batcher is None:
+                if kind == "pipeline":
+                    # Pipelines run list inputs one at a time unless given a batch size
+                    def forward(items):
+                        return fn(items, batch_size=len(items), **options)
+                else:
+                    def forward(items):
+                        return fn(items, **options)
+                batcher = MicroBatcher(forward, (kind, name, method))
+                _batchers[key] = batcher
+    return batcher
+
+
+def run(target: Any, fn: Callable, kind: str, name: str, task: str, method: str, args: tuple,
+        kwargs: Dict[str, Any]):
+    """Call `fn(*args, **kwargs)` (a method of `target`), batched with concurrent callers when possible."""
+    plan = _plan(kind, task, method, args, kwargs) if INFERENCE_BATCHING else None
+    frozen = _freeze(plan[1]) if plan else None
+    if frozen is None:
+        with track_inference(kind, name, method):
+            return fn(*args, **kwargs)
+    items, options, unpack = plan
+    return unpack(_batcher(target, fn, kind, name, method, options, frozen).submit(items))
@@ -0,0 +1,280 @@
+# backend/utils/llm_gateway.py
+"""
+Single entry point for every LLM call (Gemini and Groq).
+
+    result = llm_gateway.generate(prompt, "gemini-2.5-flash", temperature=0.1,
+                                  response_mime_type="application/json",
+                                  operation="timeline.event_extraction")
+    result.text
+
+What it adds over calling the SDKs directly:
+  - responses cached by hash of (provider, model, prompt, generation config),
+    and identical concurrent prompts share one call (SingleFlightCache);
+    sampled prompts (temperature above LLM_CACHE_MAX_TEMPERATURE) are not
+    cached unless the caller asks for it;
+  - per-model RPM and TPM token buckets: a call waits exactly as long as the
+    quota requires, replacing fixed time.sleep() pacing in the agents;
+  - at most LLM_MAX_CONCURRENCY calls in flight per provider;
+  - a per-provider circuit breaker: while Gemini or Groq keeps failing,
+    calls raise circuit_breaker.CircuitOpen at once instead of timing out;
+  - latency, token counts, cache hits and quota waits in /metrics.
+
+SDK exceptions propagate unchanged (google_exceptions.GoogleAPICallError,
+ValueError for blocked Gemini responses, groq errors), so existing handlers
+keep working. SDK clients are created once, on first use.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from backend.utils import cassette, circuit_breaker
+from backend.utils.circuit_breaker import is_failure_status
+from backend.utils.metrics import LLM_CACHE, LLM_QUOTA_WAIT_SECONDS, LLM_TOKENS, track_provider
+from backend.utils.result_cache import SingleFlightCache, HIT, SHARED
+
+logger = logging.getLogger("llm-gateway")
+
+LLM_CACHE_SECONDS = float(os.getenv("LLM_CACHE_SECONDS", "3600"))
+LLM_CACHE_ENTRIES = int(os.getenv("LLM_CACHE_ENTRIES", "1024"))
+# Above this temperature a response is meant to vary between calls, so it isn't cached by default
+LLM_CACHE_MAX_TEMPERATURE = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.3"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+
+# requests per minute, tokens per minute (free-tier defaults; override with LLM_RATE_LIMITS)
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    "gemini-2.5-flash": (10, 250_000),
+    "gemini-2.5-pro": (5, 250_000),
+    "llama-3.1-8b-instant": (30, 6_000),
+}
+FALLBACK_RATE_LIMIT = (30, 100_000)
+
+
+def _parse_rate_limits(spec: str) -> Dict[str, Tuple[float, float]]:
+    """"gemini-2.5-flash=10:250000,gemini-2.5-pro=5:250000" -> {model: (rpm, tpm)}"""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        try:
+            model, values = item.split("=", 1)
+            rpm, tpm = values.split(":", 1)
+            limits[model.strip()] = (float(rpm), float(tpm))
+        except ValueError:
+            logger.warning(f"Ignoring malformed LLM_RATE_LIMITS entry: {item!r}")
+    return limits
+
+
+RATE_LIMITS = {**DEFAULT_RATE_LIMITS, **_parse_rate_limits(os.getenv("LLM_RATE_LIMITS", ""))}
+
+
+class LLMResult:
+    """Provider-neutral response: `.text` plus token usage."""
+
+    def __init__(self, text: str, provider: str, model: str, input_tokens: int = 0,
+                 output_tokens: int = 0, cached: bool = False):
+        self.text = text
+        self.provider = provider
+        self.model = model
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.cached = cached
+
+    def as_cached(self) -> "LLMResult":
+        return LLMResult(self.text, self.provider, self.model, self.input_tokens, self.output_tokens, cached=True)
+
+
+class TokenBucket:
+    """
+    Reservation-style token bucket refilled at `per_minute`.
+
+    `reserve(n)` takes n tokens immediately (the level may go negative) and
+    returns how long the caller must wait before using them, so callers are
+    served in arrival order and never poll.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            # A single request larger than the bucket would otherwise wait forever
+            self.level -= min(amount, self.capacity)
+            return 0.0 if self.level >= 0 else -self.level / self.rate
+
+    def adjust(self, delta: float):
+        """Charge (positive) or refund (negative) the difference once actual usage is known."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.level = min(self.capacity, self.level - delta)
+
+
+_buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+_provider_slots: Dict[str, threading.BoundedSemaphore] = {}
+_state_lock = threading.Lock()
+
+_cache = SingleFlightCache(ttl_seconds=LLM_CACHE_SECONDS, stale_seconds=0, max_entries=LLM_CACHE_ENTRIES,
+                           should_cache=lambda result: bool(result.text), name="llm")
+
+
+def _model_key(model: str) -> str:
+    # "models/gemini-2.5-flash" and "gemini-2.5-flash" share one quota
+    return model.split("/")[-1]
+
+
+def _buckets_for(model: str) -> Tuple[TokenBucket, TokenBucket]:
+    key = _model_key(model)
+    with _state_lock:
+        buckets = _buckets.get(key)
+        if buckets is None:
+            rpm, tpm = RATE_LIMITS.get(key, FALLBACK_RATE_LIMIT)
+            buckets = _buckets[key] = (TokenBucket(rpm), TokenBucket(tpm))
+        return buckets
+
+
+def _provider_slot(provider: str) -> threading.BoundedSemaphore:
+    with _state_lock:
+        slot = _provider_slots.get(provider)
+        if slot is None:
+            slot = _provider_slots[provider] = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+        return slot
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough pre-call estimate (~4 characters per token); corrected from reported usage afterwards."""
+    return max(1, len(text) // 4)
+
+# -------------------- PROVIDERS --------------------
+_gemini_models: Dict[str, Any] = {}
+_groq_client = None
+_client_lock = threading.Lock()
+
+
+def _gemini_model(model: str):
+    import google.generativeai as genai
+    with _client_lock:
+        if not _gemini_models:
+            genai.configure(api_key=os.getenv("GEMINI_API_KEY"), transport="rest")
+        instance = _gemini_models.get(model)
+        if instance is None:
+            instance = _gemini_models[model] = genai.GenerativeModel(model)
+        return instance
+
+
+def _call_gemini(prompt: str, model: str, config: Dict[str, Any]) -> LLMResult:
+    import google.generativeai as genai
+    generation_config = genai.types.GenerationConfig(**config) if config else None
+    response = _gemini_model(model).generate_content(prompt, generation_config=generation_config)
+    text = response.text  # raises ValueError when the response was blocked, as before
+    usage = getattr(response, "usage_metadata", None)
+    return LLMResult(text, "gemini", model,
+                     getattr(usage, "prompt_token_count", 0) or 0,
+                     getattr(usage, "candidates_token_count", 0) or 0)
+
+
+def _call_groq(prompt: str, model: str, config: Dict[str, Any]) -> LLMResult:
+    global _groq_client
+    with _client_lock:
+        if _groq_client is None:
+            from groq import Groq
+            _groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+    options = dict(config)
+    if "max_output_tokens" in options:
+        options["max_tokens"] = options.pop("max_output_tokens")
+    completion = _groq_client.chat.completions.create(
+        model=model, messages=[{"role": "user", "content": prompt}], **options)
+    usage = getattr(completion, "usage", None)
+    return LLMResult((completion.choices[0].message.content or "").strip(), "groq", model,
+                     getattr(usage, "prompt_tokens", 0) or 0,
+                     getattr(usage, "completion_tokens", 0) or 0)
+
+
+PROVIDERS = {"gemini": _call_gemini, "groq": _call_groq}
+
+# -------------------- GATEWAY --------------------
+def _cache_key(provider: str, model: str, prompt: str, config: Dict[str, Any]) -> str:
+    payload = json.dumps([provider, _model_key(model), prompt, config], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _is_provider_failure(error: Exception) -> bool:
+    # Blocked responses (ValueError) and bad requests are about the prompt, not the provider
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if isinstance(status, int):
+        return is_failure_status(status)
+    return not isinstance(error, ValueError)
+
+
+def _call(provider: str, model: str, prompt: str, config: Dict[str, Any], operation: str) -> LLMResult:
+    if cassette.replaying():
+        recorded = cassette.replay_llm(provider, _model_key(model), prompt, config)
+        return LLMResult(recorded["text"], provider, model, recorded["input_tokens"], recorded["output_tokens"])
+    breaker = circuit_breaker.breaker_for(provider)
+    breaker.before_call()
+    model_key = _model_key(model)
+    requests_bucket, tokens_bucket = _buckets_for(model)
+    expected = estimate_tokens(prompt) + int(config.get("max_output_tokens") or 0)
+    wait = max(requests_bucket.reserve(1), tokens_bucket.reserve(expected))
+    LLM_QUOTA_WAIT_SECONDS.observe(wait, provider=provider, model=model_key)
+    if wait > 0:
+        logger.info(f"{provider}/{model_key}: waiting {wait:.1f}s for quota ({operation})")
+        time.sleep(wait)
+
+    try:
+        with _provider_slot(provider), track_provider(provider, operation):
+            result = cassette.record_llm(provider, _model_key(model), prompt, config,
+                                         lambda: PROVIDERS[provider](prompt, model, config))
+    except Exception as e:
+        if _is_provider_failure(e):
+            breaker.record_failure(e)
+        else:
+            breaker.record_success()
+        raise
+    breaker.record_success()
+
+    if result.input_tokens or result.output_tokens:
+        tokens_bucket.adjust(result.input_tokens + result.output_tokens - expected)
+    LLM_TOKENS.inc(result.input_tokens, provider=provider, model=model_key, direction="input")
+    LLM_TOKENS.inc(result.output_tokens, provider=provider, model=model_key, direction="output")
+    return result
+
+
+def generate(prompt: str, model: str, provider: str = "gemini", operation: str = "generate",
+             cache: Optional[bool] = None, **config) -> LLMResult:
+    """
+    Run one prompt through `provider`. `config` holds generation settings
+    (temperature, top_p, top_k, max_output_tokens, response_mime_type, ...)
+    and is part of the cache key. `cache=False` always makes a fresh call;
+    the default caches unless temperature is above LLM_CACHE_MAX_TEMPERATURE.
+    """
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unknown LLM provider: {provider}")
+    model_key = _model_key(model)
+    if cache is None:
+        cache = (config.get("temperature") or 0.0) <= LLM_CACHE_MAX_TEMPERATURE
+    if not cache:
+        LLM_CACHE.inc(provider=provider, model=model_key, result="bypass")
+        return _call(provider, model, prompt, config, operation)
+
+    key = _cache_key(provider, model, prompt, config)
+    result, info = _cache.get_or_compute(key, lambda: _call(provider, model, prompt, config, operation))
+    LLM_CACHE.inc(provider=provider, model=model_key, result=info["status"])
+    return result.as_cached() if info["status"] in (HIT, SHARED) else result
+
+
+def status() -> Dict[str, Any]:
+    with _state_lock:
+        quotas = {model: {"requests_available": round(rpm.level, 2), "tokens_available": round(tpm.level)}
+                  for model, (rpm, tpm) in _buckets.items()}
+    return {"cache": dict(_cache.stats), "quotas": quotas, "max_concurrency": LLM_MAX_CONCURRENCY,
+            "circuits": {p: circuit_breaker.breaker_for(p).snapshot() for p in PROVIDERS}}
@@ -0,0 +1,264 @@
+# backend/utils/metrics.py
+"""
+In-process metrics with Prometheus text exposition for GET /metrics.
+
+Three families cover where request time goes:
+  - pipeline stages (run_pipeline, fact_check_pipeline, timeline and bias jobs)
+  - upstream providers (NewsAPI, GNews, Serper, SerpAPI, NewsData,
+    Google Fact Check, Gemini, Groq)
+  - model inference calls made through the model registry
+plus LLM token usage, cache hits and quota waits from the LLM gateway, and
+quota usage, de-duplicated calls and circuit breaker state for the paid
+news/search APIs.
+
+Only counters, gauges and histograms are needed, so they are implemented here
+rather than pulling in a client library.
+"""
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Seconds; wide enough for both spaCy calls (ms) and Gemini-heavy stages (minutes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+_registry: Dict[str, "_Metric"] = {}
+_registry_lock = threading.Lock()
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {sorted(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [bucket counts..., sum, count]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            if index < len(self.buckets):
+                state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                le = (("le", _format_value(bound)),)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, (('le', '+Inf'),))} {state[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {state[-1]}")
+        return lines
+
+
+def _register(metric):
+    with _registry_lock:
+        existing = _registry.get(metric.name)
+        if existing is not None:
+            return existing
+        _registry[metric.name] = metric
+        return metric
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return _register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return _register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+    return _register(Histogram(name, documentation, labelnames, buckets))
+
+
+def render_latest() -> str:
+    """All registered metrics in the Prometheus text format (version 0.0.4)."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# -------------------- FACTSPHERE METRICS --------------------
+STAGE_SECONDS = histogram(
+    "factsphere_stage_duration_seconds", "Wall time of one pipeline stage.", ["pipeline", "stage"])
+STAGE_RUNS = counter(
+    "factsphere_stage_runs_total", "Pipeline stage executions by outcome.", ["pipeline", "stage", "outcome"])
+
+PROVIDER_SECONDS = histogram(
+    "factsphere_upstream_request_duration_seconds", "Latency of calls to external providers.",
+    ["provider", "operation"])
+PROVIDER_REQUESTS = counter(
+    "factsphere_upstream_requests_total", "Calls to external providers by outcome.",
+    ["provider", "operation", "outcome"])
+
+INFERENCE_SECONDS = histogram(
+    "factsphere_model_inference_seconds", "Latency of model inference calls.", ["kind", "model", "method"])
+INFERENCE_CALLS = counter(
+    "factsphere_model_inference_total", "Model inference calls by outcome.", ["kind", "model", "method", "outcome"])
+INFERENCE_BATCH_SIZE = histogram(
+    "factsphere_inference_batch_size", "Inputs per batched forward pass.", ["model", "method"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128))
+INFERENCE_QUEUE_WAIT_SECONDS = histogram(
+    "factsphere_inference_queue_wait_seconds", "Time inference requests waited to join a batch.",
+    ["model", "method"], buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1, 5))
+EVIDENCE_CASCADE = counter(
+    "factsphere_evidence_cascade_total", "Candidate sentences scored or pruned at each evidence-ranking stage.",
+    ["stage", "outcome"])
+
+LLM_TOKENS = counter(
+    "factsphere_llm_tokens_total", "Tokens sent to and received from LLM providers.",
+    ["provider", "model", "direction"])
+LLM_CACHE = counter(
+    "factsphere_llm_cache_total", "LLM gateway cache lookups by result.", ["provider", "model", "result"])
+LLM_QUOTA_WAIT_SECONDS = histogram(
+    "factsphere_llm_quota_wait_seconds", "Time LLM calls waited for RPM/TPM quota.", ["provider", "model"])
+
+API_QUOTA_USED = gauge(
+    "factsphere_api_quota_used", "Calls made to a paid API in the current window.", ["provider", "window"])
+API_QUOTA_LIMIT = gauge(
+    "factsphere_api_quota_limit", "Configured call budget per window (0 = unlimited).", ["provider", "window"])
+API_DEDUP = counter(
+    "factsphere_api_dedup_total", "API calls answered without a new upstream request, by reason.",
+    ["provider", "reason"])
+
+CIRCUIT_STATE = gauge(
+    "factsphere_circuit_state", "Provider circuit breaker state (0 closed, 1 half-open, 2 open).", ["provider"])
+CIRCUIT_REJECTIONS = counter(
+    "factsphere_circuit_rejections_total", "Calls skipped because the provider's circuit was open.", ["provider"])
+
+HTTP_SECONDS = histogram(
+    "factsphere_http_request_duration_seconds", "Latency of API requests served.", ["method", "route", "status"])
+
+
+@contextmanager
+def _timed(histogram_metric: Histogram, counter_metric: Counter, labels: Dict[str, str]):
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        histogram_metric.observe(time.perf_counter() - start, **labels)
+        counter_metric.inc(outcome=outcome, **labels)
+
+
+def track_stage(pipeline: str, stage: str):
+    """`with track_stage("analyze", "language_detection"): ...`"""
+    return _timed(STAGE_SECONDS, STAGE_RUNS, {"pipeline": pipeline, "stage": stage})
+
+
+def record_stage(pipeline: str, stage: str, seconds: float, outcome: str = "ok"):
+    """For stages timed elsewhere (e.g. by the stage graph)."""
+    STAGE_SECONDS.observe(seconds, pipeline=pipeline, stage=stage)
+    STAGE_RUNS.inc(pipeline=pipeline, stage=stage, outcome=outcome)
+
+
+def track_provider(provider: str, operation: str = "request"):
+    """`with track_provider("newsapi", "top_headlines"): requests.get(...)`"""
+    return _timed(PROVIDER_SECONDS, PROVIDER_REQUESTS, {"provider": provider, "operation": operation})
+
+
+def track_inference(kind: str, model: str, method: str):
+    return _timed(INFERENCE_SECONDS, INFERENCE_CALLS, {"kind": kind, "model": model, "method": method})
@@ -0,0 +1,189 @@
+# backend/utils/model_registry.py
+"""
+Process-wide registry for the heavy NLP models used across the agents.
+
+Every SentenceTransformer, CrossEncoder, transformers pipeline and spaCy
+pipeline is loaded once, on first use, and the same instance is handed to
+every caller. The registry also keeps track of what is resident so the API
+can report it, and times inference calls for /metrics. Calls from concurrent
+callers are micro-batched into shared forward passes (utils.inference_batcher),
+and sentence embeddings are served from a persistent cache when the same text
+was encoded before (utils.embedding_cache).
+MODEL_BACKEND=onnx serves the supported models through ONNX Runtime with int8
+weights (utils.onnx_backend).
+"""
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from backend.utils import embedding_cache, inference_batcher, onnx_backend
+
+logger = logging.getLogger("model-registry")
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+_models: Dict[Tuple, Any] = {}
+_load_info: Dict[Tuple, Dict[str, Any]] = {}
+_key_locks: Dict[Tuple, threading.Lock] = {}
+_registry_lock = threading.Lock()
+# (kind, name) -> instance served instead of loading the real model (benchmarks, offline runs)
+_overrides: Dict[Tuple[str, str], Any] = {}
+
+
+def _canonical_name(name: str) -> str:
+    """Map 'sentence-transformers/all-MiniLM-L6-v2' and 'all-MiniLM-L6-v2' to the same key."""
+    prefix = "sentence-transformers/"
+    return name[len(prefix):] if name.startswith(prefix) else name
+
+
+class InstrumentedModel:
+    """
+    Transparent wrapper that records latency of encode/predict/__call__ in
+    the inference metrics and batches those calls across concurrent callers.
+    Every other attribute is forwarded to the model.
+    """
+    _TIMED_METHODS = ("encode", "predict")
+
+    def __init__(self, model: Any, kind: str, name: str, task: str = ""):
+        object.__setattr__(self, "_model", model)
+        object.__setattr__(self, "_labels", (kind, name, task))
+
+    @property
+    def wrapped(self) -> Any:
+        return self._model
+
+    def __getattr__(self, attr):
+        value = getattr(self._model, attr)
+        if attr in self._TIMED_METHODS and callable(value):
+            kind, name, task = self._labels
+
+            def timed(*args, **kwargs):
+                return inference_batcher.run(self._model, value, kind, name, task, attr, args, kwargs)
+            if attr == "encode" and kind == "sentence_transformer":
+                return embedding_cache.cached_encode(name, self._model, timed)
+            return timed
+        return value
+
+    def __setattr__(self, attr, value):
+        setattr(self._model, attr, value)
+
+    def __call__(self, *args, **kwargs):
+        kind, name, task = self._labels
+        return inference_batcher.run(self._model, self._model, kind, name, task, "__call__", args, kwargs)
+
+
+def get_model(key: Tuple, loader: Callable[[], Any]) -> Any:
+    """
+    Return the model registered under `key`, calling `loader` the first time.
+    Concurrent first callers for the same key wait for a single load.
+    """
+    if _overrides:
+        override = _overrides.get((key[0], key[1]))
+        if override is not None:
+            return override
+
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _registry_lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    with key_lock:
+        model = _models.get(key)
+        if model is None:
+            logger.info(f"Loading model {key[0]}:{key[1]} ...")
+            start = time.perf_counter()
+            model = InstrumentedModel(loader(), key[0], key[1], key[2] if len(key) > 2 else "")
+            elapsed = time.perf_counter() - start
+            _models[key] = model
+            _load_info[key] = {
+                "kind": key[0],
+                "name": key[1],
+                "load_seconds": round(elapsed, 3),
+                "loaded_at": datetime.now().isoformat(),
+            }
+            logger.info(f"Loaded model {key[0]}:{key[1]} in {elapsed:.2f}s")
+    return model
+
+
+def set_model_override(kind: str, name: str, model: Any):
+    """Serve `model` for every (kind, name) lookup instead of loading the real one."""
+    if kind == "sentence_transformer":
+        name = _canonical_name(name)
+    _overrides[(kind, name)] = model
+
+
+def clear_model_overrides():
+    _overrides.clear()
+
+
+def get_sentence_transformer(name: str = DEFAULT_EMBEDDING_MODEL):
+    """Shared SentenceTransformer bi-encoder."""
+    name = _canonical_name(name)
+
+    def _load():
+        if onnx_backend.enabled():
+            model = onnx_backend.load_sentence_transformer(name)
+            if model is not None:
+                return model
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(name)
+
+    return get_model(("sentence_transformer", name), _load)
+
+
+def get_cross_encoder(name: str):
+    """Shared sentence_transformers CrossEncoder."""
+    def _load():
+        if onnx_backend.enabled():
+            model = onnx_backend.load_cross_encoder(name)
+            if model is not None:
+                return model
+        from sentence_transformers import CrossEncoder
+        return CrossEncoder(name)
+
+    return get_model(("cross_encoder", name), _load)
+
+
+def get_hf_pipeline(task: str, model: str, **kwargs):
+    """Shared transformers pipeline, keyed by task, model and extra pipeline kwargs."""
+    options = tuple(sorted(kwargs.items()))
+
+    def _load():
+        if onnx_backend.enabled():
+            onnx_pipeline = onnx_backend.load_pipeline(task, model, **kwargs)
+            if onnx_pipeline is not None:
+                return onnx_pipeline
+        from transformers import pipeline
+        return pipeline(task, model=model, **kwargs)
+
+    return get_model(("pipeline", model, task, options), _load)
+
+
+def get_spacy_model(name: str = "en_core_web_sm"):
+    """Shared spaCy language pipeline."""
+    def _load():
+        import spacy
+        return spacy.load(name)
+
+    return get_model(("spacy", name), _load)
+
+
+def is_loaded(kind: str, name: str) -> bool:
+    """True if a model of this kind and name is already resident."""
+    name = _canonical_name(name)
+    return any(key[0] == kind and key[1] == name for key in _models)
+
+
+def loaded_models() -> List[Dict[str, Any]]:
+    """Describe every resident model: kind, name, load time and when it was loaded."""
+    report = []
+    for key, info in list(_load_info.items()):
+        entry = dict(info)
+        if len(key) > 2:
+            entry["task"] = key[2]
+        report.append(entry)
+    return report
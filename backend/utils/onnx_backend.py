@@ -0,0 +1,168 @@
+# backend/utils/onnx_backend.py
+"""
+Opt-in ONNX Runtime backend with dynamic int8 quantization, for CPU hosts.
+
+With MODEL_BACKEND=onnx the model registry loads these through onnxruntime
+instead of PyTorch:
+  - SentenceTransformer bi-encoders (all-MiniLM-L6-v2)
+  - CrossEncoders (ms-marco-MiniLM-L-6-v2)
+  - sequence-classification pipelines: text-classification / sentiment-analysis
+    (roberta-large-mnli, cardiffnlp sentiment) and zero-shot-classification
+    (bart-large-mnli)
+
+The first load of a model exports it to ONNX, quantizes the weights to int8
+(ONNX_QUANTIZATION: avx2, avx512, avx512_vnni or arm64; "none" keeps fp32)
+and keeps the result under ONNX_CACHE_DIR, so later processes load the
+quantized file directly. Exports are written to a temporary directory and
+moved into place, so workers racing on the same model don't corrupt it.
+
+Requires `pip install "optimum[onnxruntime]"`. When it is missing, a model
+kind or task isn't supported, or exporting/loading a model fails (offline
+host, unsupported architecture), the loader logs a warning and returns None
+and the registry falls back to PyTorch. benchmarks/bench_onnx.py checks accuracy parity and compares
+latency and memory against the PyTorch path.
+"""
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+from typing import Any, Optional
+
+logger = logging.getLogger("onnx-backend")
+
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "torch").lower()
+ONNX_CACHE_DIR = os.getenv("ONNX_CACHE_DIR", os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "onnx"))
+ONNX_QUANTIZATION = os.getenv("ONNX_QUANTIZATION", "avx2").lower()
+
+SEQUENCE_CLASSIFICATION_TASKS = ("text-classification", "sentiment-analysis", "zero-shot-classification")
+
+_warned_missing = False
+_warn_lock = threading.Lock()
+# Models whose export or load failed and were handed back to PyTorch
+failed = set()
+
+
+def enabled() -> bool:
+    return MODEL_BACKEND == "onnx"
+
+
+def available() -> bool:
+    """True when onnxruntime and optimum can be imported; logs once when they can't."""
+    global _warned_missing
+    try:
+        import onnxruntime  # noqa: F401
+        import optimum.onnxruntime  # noqa: F401
+        return True
+    except ImportError as e:
+        with _warn_lock:
+            if not _warned_missing:
+                _warned_missing = True
+                logger.warning(f"MODEL_BACKEND=onnx but ONNX Runtime is unavailable ({e}); using PyTorch")
+        return False
+
+
+def _quantized() -> bool:
+    return ONNX_QUANTIZATION not in ("", "none", "fp32")
+
+
+def _cache_path(kind: str, name: str) -> str:
+    variant = ONNX_QUANTIZATION if _quantized() else "fp32"
+    return os.path.join(ONNX_CACHE_DIR, kind, re.sub(r"[^A-Za-z0-9_.-]+", "--", name), variant)
+
+
+def _publish(build, target: str):
+    """Run build(tmp_dir) and move the result to `target`, unless another process got there first."""
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=".export-", dir=os.path.dirname(target))
+    try:
+        build(tmp)
+        try:
+            os.rename(tmp, target)
+        except OSError:
+            if not os.path.isdir(target):
+                raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+# ---------- SENTENCE-TRANSFORMERS ----------
+def _sentence_transformers_file() -> str:
+    return f"onnx/model_qint8_{ONNX_QUANTIZATION}.onnx" if _quantized() else "onnx/model.onnx"
+
+
+def _load_st(cls, kind: str, name: str):
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    path = _cache_path(kind, name)
+    if not os.path.isdir(path):
+        def build(tmp):
+            logger.info(f"Exporting {name} to ONNX ({ONNX_QUANTIZATION}) ...")
+            model = cls(name, backend="onnx")
+            model.save_pretrained(tmp)
+            if _quantized():
+                export_dynamic_quantized_onnx_model(model, ONNX_QUANTIZATION, tmp)
+        _publish(build, path)
+    return cls(path, backend="onnx", model_kwargs={"file_name": _sentence_transformers_file()})
+
+
+def _fallback(name: str, error: Exception):
+    failed.add(name)
+    logger.warning(f"ONNX export/load of {name} failed ({type(error).__name__}: {error}); using PyTorch")
+
+
+def load_sentence_transformer(name: str) -> Optional[Any]:
+    if not available():
+        return None
+    try:
+        from sentence_transformers import SentenceTransformer
+        return _load_st(SentenceTransformer, "sentence_transformer", name)
+    except Exception as e:
+        _fallback(name, e)
+        return None
+
+
+def load_cross_encoder(name: str) -> Optional[Any]:
+    if not available():
+        return None
+    try:
+        from sentence_transformers import CrossEncoder
+        return _load_st(CrossEncoder, "cross_encoder", name)
+    except Exception as e:
+        _fallback(name, e)
+        return None
+
+
+# ---------- TRANSFORMERS PIPELINES ----------
+def load_pipeline(task: str, model: str, **kwargs) -> Optional[Any]:
+    if task not in SEQUENCE_CLASSIFICATION_TASKS or not available():
+        return None
+    try:
+        return _load_pipeline(task, model, **kwargs)
+    except Exception as e:
+        _fallback(model, e)
+        return None
+
+
+def _load_pipeline(task: str, model: str, **kwargs):
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer, pipeline
+
+    path = _cache_path("pipeline", model)
+    if not os.path.isdir(path):
+        def build(tmp):
+            logger.info(f"Exporting {model} to ONNX ({ONNX_QUANTIZATION}) ...")
+            exported = ORTModelForSequenceClassification.from_pretrained(model, export=True)
+            exported.save_pretrained(tmp)
+            AutoTokenizer.from_pretrained(model).save_pretrained(tmp)
+            if _quantized():
+                config = getattr(AutoQuantizationConfig, ONNX_QUANTIZATION)(is_static=False, per_channel=False)
+                ORTQuantizer.from_pretrained(tmp).quantize(save_dir=tmp, quantization_config=config)
+        _publish(build, path)
+
+    file_name = "model_quantized.onnx" if _quantized() else "model.onnx"
+    ort_model = ORTModelForSequenceClassification.from_pretrained(path, file_name=file_name)
+    return pipeline(task, model=ort_model, tokenizer=AutoTokenizer.from_pretrained(path), **kwargs)
@@ -0,0 +1,171 @@
+# backend/utils/result_cache.py
+"""
+In-memory TTL cache with stale-while-revalidate and single-flight loading.
+
+- fresh entries are returned directly;
+- stale entries (past the TTL but inside the stale window) are returned
+  immediately while one background refresh recomputes them;
+- concurrent callers asking for the same missing key wait for the one
+  computation already in flight instead of starting their own.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger("result-cache")
+
+HIT = "hit"
+MISS = "miss"
+STALE = "stale"
+SHARED = "shared"
+
+
+class SingleFlightCache:
+    """
+    `should_cache(value)` decides whether a computed value is stored; values
+    it rejects (e.g. error reports) are still handed to every waiting caller.
+    """
+
+    def __init__(self, ttl_seconds: float = 900, stale_seconds: float = 3600,
+                 max_entries: int = 512, should_cache: Optional[Callable[[Any], bool]] = None,
+                 name: str = "cache"):
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.should_cache = should_cache or (lambda value: True)
+        self.name = name
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {HIT: 0, MISS: 0, STALE: 0, SHARED: 0, "refreshes": 0, "errors": 0}
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Return (value, info) where info = {"status": hit|miss|stale|shared, "age_seconds": ...}.
+        Exceptions raised by `compute` propagate to every caller waiting on it.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                age = now - stored_at
+                if age <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.stats[HIT] += 1
+                    return value, {"status": HIT, "age_seconds": round(age, 3)}
+                if age <= self.ttl_seconds + self.stale_seconds:
+                    self._entries.move_to_end(key)
+                    self.stats[STALE] += 1
+                    if key not in self._in_flight:
+                        self._start_refresh(key, compute)
+                    return value, {"status": STALE, "age_seconds": round(age, 3)}
+                del self._entries[key]
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.stats[SHARED] += 1
+                owner = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                self.stats[MISS] += 1
+                owner = True
+
+        if not owner:
+            return future.result(), {"status": SHARED, "age_seconds": 0.0}
+
+        self._run(key, compute, future)
+        return future.result(), {"status": MISS, "age_seconds": 0.0}
+
+    def _start_refresh(self, key: Hashable, compute: Callable[[], Any]):
+        # Called with the lock held
+        future = Future()
+        self._in_flight[key] = future
+        self.stats["refreshes"] += 1
+        threading.Thread(target=self._run, args=(key, compute, future),
+                         name=f"{self.name}-refresh", daemon=True).start()
+
+    def _run(self, key: Hashable, compute: Callable[[], Any], future: Future):
+        try:
+            value = compute()
+        except Exception as e:
+            self.finish(key, future, error=e)
+            return
+        self.finish(key, future, value)
+
+    def claim(self, key: Hashable) -> Tuple[Any, Dict[str, Any], Optional[Future]]:
+        """
+        For callers that compute the value themselves (e.g. while streaming it).
+
+        Returns (value, info, future):
+          - fresh entry: (value, {"status": "hit", ...}, None);
+          - already in flight: (None, {"status": "shared", ...}, future) to wait on;
+          - otherwise: (None, {"status": "miss", ...}, future), and the caller now
+            owns the computation and must call finish(key, future, ...) exactly once.
+        Stale entries are treated as misses since nothing else would refresh them.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                age = time.time() - stored_at
+                if age <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.stats[HIT] += 1
+                    return value, {"status": HIT, "age_seconds": round(age, 3)}, None
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.stats[SHARED] += 1
+                return None, {"status": SHARED, "age_seconds": 0.0}, future
+            future = Future()
+            self._in_flight[key] = future
+            self.stats[MISS] += 1
+            return None, {"status": MISS, "age_seconds": 0.0}, future
+
+    def finish(self, key: Hashable, future: Future, value: Any = None, error: Optional[BaseException] = None):
+        """Complete a computation claimed with claim(): store the value and wake every waiter."""
+        if error is not None:
+            logger.warning(f"{self.name}: computing {key!r} failed: {error}")
+            with self._lock:
+                self.stats["errors"] += 1
+                self._in_flight.pop(key, None)
+            future.set_exception(error)
+            return
+
+        with self._lock:
+            if self.should_cache(value):
+                self._store(key, value)
+            self._in_flight.pop(key, None)
+        future.set_result(value)
+
+    def _store(self, key: Hashable, value: Any):
+        # Called with the lock held
+        self._entries[key] = (time.time(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Size, in-flight count and hit/miss counters."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "in_flight": len(self._in_flight),
+                "ttl_seconds": self.ttl_seconds,
+                "stale_seconds": self.stale_seconds,
+                **self.stats,
+            }
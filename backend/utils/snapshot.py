@@ -0,0 +1,150 @@
+# backend/utils/snapshot.py
+"""
+Periodically rebuilt, in-memory snapshot of an expensive data source.
+
+A daemon thread calls `build()` every `interval_seconds`; readers get the
+last successful result straight from memory. Views derived from a snapshot
+(e.g. the formatted /api/trends payload) are memoised per snapshot version
+together with an ETag, so repeated requests return identical bytes and can
+be answered with 304 Not Modified.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("snapshot")
+
+
+def payload_etag(payload: Any) -> str:
+    """Strong ETag for a JSON-serialisable payload."""
+    body = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+class BackgroundSnapshot:
+    """
+    `keep_previous_if(value)` returning True means the freshly built value is
+    unusable (e.g. an empty list after an upstream error) and the previous
+    snapshot should keep being served.
+    """
+
+    def __init__(self, name: str, build: Callable[[], Any], interval_seconds: float = 900,
+                 keep_previous_if: Optional[Callable[[Any], bool]] = None):
+        self.name = name
+        self.build = build
+        self.interval_seconds = interval_seconds
+        self.keep_previous_if = keep_previous_if or (lambda value: False)
+        self._value = None
+        self._version = 0
+        self._updated_at = None
+        self._built_monotonic = None
+        self._last_attempt_at = None
+        self._last_error = None
+        self._derived: Dict[str, Tuple[int, Any, str]] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the refresher thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._loop, name=f"{self.name}-snapshot", daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        woken = False
+        while True:
+            # get() may already have built the first snapshot on this process
+            age = self.age_seconds()
+            if woken or age is None or age >= self.interval_seconds:
+                self.refresh()
+            woken = self._wake.wait(self.interval_seconds)
+            self._wake.clear()
+
+    def refresh(self) -> bool:
+        """Rebuild now. Concurrent callers wait for the build in progress instead of starting another."""
+        if not self._refresh_lock.acquire(blocking=False):
+            with self._refresh_lock:
+                return self._last_error is None
+
+        try:
+            start = time.perf_counter()
+            self._last_attempt_at = datetime.now().isoformat()
+            try:
+                value = self.build()
+            except Exception as e:
+                self._last_error = str(e)
+                logger.error(f"{self.name}: snapshot build failed: {e}")
+                return False
+
+            if self._version and self.keep_previous_if(value):
+                self._last_error = "build returned no usable data; serving previous snapshot"
+                logger.warning(f"{self.name}: {self._last_error}")
+                return False
+
+            with self._lock:
+                self._value = value
+                self._version += 1
+                self._updated_at = datetime.now().isoformat()
+                self._built_monotonic = time.monotonic()
+                self._derived.clear()
+            self._last_error = None
+            logger.info(f"{self.name}: snapshot v{self._version} built in {time.perf_counter() - start:.2f}s")
+            return True
+        finally:
+            self._refresh_lock.release()
+
+    def age_seconds(self) -> Optional[float]:
+        if self._built_monotonic is None:
+            return None
+        return time.monotonic() - self._built_monotonic
+
+    def request_refresh(self):
+        """Ask the refresher thread to rebuild early."""
+        self.start()
+        self._wake.set()
+
+    def get(self) -> Any:
+        """
+        Current snapshot value. Only the very first reader of a process ever
+        waits, for the initial build; afterwards this never blocks on upstream.
+        """
+        if not self._version:
+            self.start()
+            self.refresh()
+        return self._value
+
+    def derive(self, key: str, fn: Callable[[Any], Any]) -> Tuple[Any, str]:
+        """Return (fn(snapshot), etag), computed once per snapshot version."""
+        value = self.get()
+        with self._lock:
+            version = self._version
+            cached = self._derived.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1], cached[2]
+
+        payload = fn(value)
+        etag = payload_etag(payload)
+        with self._lock:
+            if self._version == version:
+                self._derived[key] = (version, payload, etag)
+        return payload, etag
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "version": self._version,
+            "updated_at": self._updated_at,
+            "age_seconds": None if self.age_seconds() is None else round(self.age_seconds(), 1),
+            "last_attempt_at": self._last_attempt_at,
+            "last_error": self._last_error,
+            "interval_seconds": self.interval_seconds,
+            "running": self._thread is not None and self._thread.is_alive(),
+        }
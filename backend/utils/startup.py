@@ -0,0 +1,126 @@
+# backend/utils/startup.py
+"""
+Startup bookkeeping for the API process.
+
+Records how long each module import takes, and runs the model warm-up that
+used to happen at import time so /healthz can answer as soon as the process
+is up while /readyz waits for the models.
+
+A step that still fails after WARMUP_RETRIES retries doesn't hold readiness
+back: models load lazily on first use anyway, so the process becomes ready
+with warm-up status "degraded" and the failure listed in /api/startup.
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+logger = logging.getLogger("startup")
+
+# "fast": serve immediately and warm models in a background thread.
+# "eager": warm models before the server accepts traffic.
+# "off": never warm up; models load on first use.
+STARTUP_MODE = os.getenv("STARTUP_MODE", "fast").lower()
+WARMUP_RETRIES = int(os.getenv("WARMUP_RETRIES", "2"))
+WARMUP_RETRY_DELAY = float(os.getenv("WARMUP_RETRY_DELAY", "5"))
+
+_process_start = time.perf_counter()
+_import_timings: List[Dict[str, Any]] = []
+_warmup_steps: List[Dict[str, Any]] = []
+_warmup_state = {
+    "status": "pending",  # pending | running | ready | degraded (a step failed; models load on first use)
+    "started_at": None,
+    "finished_at": None,
+    "seconds": None,
+}
+_warmup_lock = threading.Lock()
+
+
+@contextmanager
+def timed_import(module_name: str):
+    """Record the wall-clock time spent importing `module_name`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _import_timings.append({"module": module_name, "seconds": round(elapsed, 4)})
+        logger.info(f"Imported {module_name} in {elapsed:.3f}s")
+
+
+def _default_warmup_steps() -> List[Tuple[str, Callable[[], Any]]]:
+    """The models the /api/analyze path needs on its first request."""
+    from backend.utils.model_registry import get_sentence_transformer, get_spacy_model
+    from backend.agents.misinformation_agent_lite import agent_service
+
+    return [
+        ("sentence_transformer:all-MiniLM-L6-v2", lambda: get_sentence_transformer("all-MiniLM-L6-v2")),
+        ("spacy:en_core_web_sm", lambda: get_spacy_model("en_core_web_sm")),
+        ("misinformation_agent_lite.classifier", agent_service.warm_up),
+    ]
+
+
+def run_warmup(steps: List[Tuple[str, Callable[[], Any]]] = None):
+    """Run every warm-up step, retrying failures, recording per-step timings. Safe to call repeatedly."""
+    with _warmup_lock:
+        if _warmup_state["status"] in ("running", "ready", "degraded"):
+            return
+        _warmup_state["status"] = "running"
+        _warmup_state["started_at"] = datetime.now().isoformat()
+
+    start = time.perf_counter()
+    failed = False
+    for name, step in (steps if steps is not None else _default_warmup_steps()):
+        step_start = time.perf_counter()
+        entry = {"step": name, "status": "ok", "attempts": 0}
+        for attempt in range(WARMUP_RETRIES + 1):
+            entry["attempts"] = attempt + 1
+            try:
+                step()
+                entry.pop("error", None)
+                entry["status"] = "ok"
+                break
+            except Exception as e:
+                entry["status"] = "error"
+                entry["error"] = str(e)
+                logger.error(f"Warm-up step {name} failed (attempt {attempt + 1}/{WARMUP_RETRIES + 1}): {e}")
+                if attempt < WARMUP_RETRIES:
+                    time.sleep(WARMUP_RETRY_DELAY)
+        failed = failed or entry["status"] == "error"
+        entry["seconds"] = round(time.perf_counter() - step_start, 4)
+        _warmup_steps.append(entry)
+
+    _warmup_state["seconds"] = round(time.perf_counter() - start, 4)
+    _warmup_state["finished_at"] = datetime.now().isoformat()
+    _warmup_state["status"] = "degraded" if failed else "ready"
+    logger.info(f"Warm-up finished with status {_warmup_state['status']} in {_warmup_state['seconds']}s")
+
+
+def start_warmup():
+    """Kick off the warm-up according to STARTUP_MODE."""
+    if STARTUP_MODE == "off":
+        _warmup_state["status"] = "ready"
+        return
+    if STARTUP_MODE == "eager":
+        run_warmup()
+        return
+    threading.Thread(target=run_warmup, name="model-warmup", daemon=True).start()
+
+
+def is_ready() -> bool:
+    return _warmup_state["status"] in ("ready", "degraded")
+
+
+def startup_report() -> Dict[str, Any]:
+    """Per-module import times plus warm-up progress."""
+    return {
+        "mode": STARTUP_MODE,
+        "uptime_seconds": round(time.perf_counter() - _process_start, 3),
+        "imports": list(_import_timings),
+        "import_seconds_total": round(sum(t["seconds"] for t in _import_timings), 4),
+        "warmup": dict(_warmup_state),
+        "warmup_steps": list(_warmup_steps),
+    }
@@ -6,14 +6,17 @@ from datetime import datetime
 from collections import Counter
 import dotenv
 
+from backend.utils.snapshot import BackgroundSnapshot
+from backend.utils import http_client
+
 # Load environment variables from .env file
 dotenv.load_dotenv()
 
 
-def get_trending_topics(num_trends=5):
+def get_trending_topics(num_trends=5, save=True):
     """
     Get trending topics and associated news articles using News API
-    Returns a list of trend data dictionaries
+    Returns a list of trend data dictionaries; `save=False` skips the JSON dump
     """
     # Get API key from environment variable
     api_key = os.getenv("NEWS_API_KEY", None)
@@ -37,7 +40,7 @@ def get_trending_topics(num_trends=5):
 
         }
         
-        response = requests.get(base_url, params=params, timeout=10)
+        response = http_client.get(base_url, params=params, timeout=10, provider="newsapi", operation="top_headlines")
         response.raise_for_status()
         
         data = response.json()
@@ -165,7 +168,7 @@ def get_trending_topics(num_trends=5):
                         'pageSize': 10
                     }
                     
-                    search_response = requests.get(search_url, params=search_params, timeout=10)
+                    search_response = http_client.get(search_url, params=search_params, timeout=10, provider="newsapi", operation="everything")
                     search_response.raise_for_status()
                     search_data = search_response.json()
                     
@@ -210,16 +213,17 @@ def get_trending_topics(num_trends=5):
             print(f"Added topic {topics_created}/{num_trends}: {headline[:50]}... ({len(related_articles)} articles)")
         
         # Save to file
-        output_dir = os.path.join(os.path.dirname(__file__), "trend_data")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = os.path.join(output_dir, f"trending_topics_{timestamp}.json")
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(trend_data, f, indent=4, ensure_ascii=False)
-        
-        print(f"Data saved to {filename}")
+        if save:
+            output_dir = os.path.join(os.path.dirname(__file__), "trend_data")
+            os.makedirs(output_dir, exist_ok=True)
+            
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = os.path.join(output_dir, f"trending_topics_{timestamp}.json")
+            
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(trend_data, f, indent=4, ensure_ascii=False)
+            
+            print(f"Data saved to {filename}")
         print(f"Retrieved {len(trend_data)} topics with a total of {sum(len(t['articles']) for t in trend_data)} news articles")
         
         return trend_data
@@ -234,6 +238,16 @@ def get_trending_topics(num_trends=5):
         return []
 
 
+# Rebuilt in the background so /api/trends never calls NewsAPI on the request path
+TRENDS_REFRESH_SECONDS = int(os.getenv("TRENDS_REFRESH_SECONDS", "900"))
+trend_snapshot = BackgroundSnapshot(
+    "trends",
+    get_trending_topics,
+    interval_seconds=TRENDS_REFRESH_SECONDS,
+    keep_previous_if=lambda trends: not trends,
+)
+
+
 # Allow the file to be run as a script for testing
 if __name__ == "__main__":
     get_trending_topics()
\ No newline at end of file
@@ -0,0 +1,85 @@
+# backend/utils/upstream_redirect.py
+"""
+Send all outbound HTTP to one local server, for load tests against stub
+upstreams (backend/benchmarks/stub_upstreams.py).
+
+With UPSTREAM_REDIRECT_URL=http://127.0.0.1:8900 every request made through
+requests or httpx (NewsAPI, GNews, Serper, SerpAPI, NewsData, Google Fact
+Check, Gemini's REST transport, Groq, article downloads) keeps its path and
+query but goes to that server instead. The original host travels in the
+X-Upstream-Host header so the stub can answer as the right provider.
+
+Never set this in production: it is installed by http_client on import and
+affects the whole process.
+"""
+import logging
+import os
+import threading
+import urllib.parse
+
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("upstream-redirect")
+
+UPSTREAM_REDIRECT_URL = os.getenv("UPSTREAM_REDIRECT_URL", "")
+UPSTREAM_HOST_HEADER = "X-Upstream-Host"
+
+_installed = False
+_install_lock = threading.Lock()
+
+
+def redirect(url: str, target: str = None):
+    """(rewritten URL, original host) for `url`."""
+    target = urllib.parse.urlsplit(target or UPSTREAM_REDIRECT_URL)
+    parts = urllib.parse.urlsplit(url)
+    rewritten = urllib.parse.urlunsplit((target.scheme, target.netloc, parts.path, parts.query, ""))
+    return rewritten, (parts.hostname or "").lower()
+
+
+def _install_httpx():
+    try:
+        import httpx
+    except ImportError:
+        return
+    original_sync = httpx.HTTPTransport.handle_request
+    original_async = httpx.AsyncHTTPTransport.handle_async_request
+
+    def _rewrite(request):
+        url, host = redirect(str(request.url))
+        request.url = httpx.URL(url)
+        request.headers[UPSTREAM_HOST_HEADER] = host
+        request.headers["Host"] = request.url.netloc.decode("ascii")
+
+    def handle_request(self, request):
+        _rewrite(request)
+        return original_sync(self, request)
+
+    async def handle_async_request(self, request):
+        _rewrite(request)
+        return await original_async(self, request)
+
+    httpx.HTTPTransport.handle_request = handle_request
+    httpx.AsyncHTTPTransport.handle_async_request = handle_async_request
+
+
+def install(target: str = UPSTREAM_REDIRECT_URL) -> bool:
+    """Redirect every request to `target` (no-op when empty). Returns True if installed."""
+    global _installed, UPSTREAM_REDIRECT_URL
+    if not target:
+        return False
+    with _install_lock:
+        UPSTREAM_REDIRECT_URL = target
+        if _installed:
+            return True
+        original_send = HTTPAdapter.send
+
+        def send(self, request, **kwargs):
+            request.url, host = redirect(request.url)
+            request.headers[UPSTREAM_HOST_HEADER] = host
+            return original_send(self, request, **kwargs)
+
+        HTTPAdapter.send = send
+        _install_httpx()
+        _installed = True
+    logger.warning(f"All outbound HTTP is redirected to {target}")
+    return True
@@ -0,0 +1,103 @@
+# backend/utils/urls.py
+"""URL helpers shared by the caches and fetchers."""
+import hashlib
+import re
+import urllib.parse
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref", "ref_src", "cmpid", "ito", "ncid", "ocid", "_ga",
+}
+TRACKING_PREFIXES = ("utm_",)
+# Query parameters (and the values) that only select the AMP rendering of a page
+AMP_PARAMS = {"amp": ("", "1", "true"), "outputtype": ("amp",)}
+# Subdomains serving the mobile/AMP copy of the main site
+MIRROR_SUBDOMAINS = ("www.", "m.", "mobile.", "amp.")
+AMP_CACHE_SUFFIX = ".cdn.ampproject.org"
+
+
+def _unwrap_amp_cache(parts: urllib.parse.SplitResult) -> urllib.parse.SplitResult:
+    """
+    https://www-example-com.cdn.ampproject.org/c/s/www.example.com/story
+    and https://www.google.com/amp/s/www.example.com/story both point at
+    https://www.example.com/story.
+    """
+    host = (parts.hostname or "").lower()
+    path = parts.path
+    if host.endswith(AMP_CACHE_SUFFIX):
+        # /c/, /v/, /i/ ... prefixes, then an optional s/ for https
+        segments = path.lstrip("/").split("/", 1)
+        path = segments[1] if len(segments) == 2 and len(segments[0]) == 1 else path.lstrip("/")
+    elif host.split(".", 1)[-1].startswith("google.") and path.startswith("/amp/"):
+        path = path[len("/amp/"):]
+    else:
+        return parts
+    scheme = "http"
+    if path.startswith("s/"):
+        scheme, path = "https", path[2:]
+    return urllib.parse.urlsplit(f"{scheme}://{path}" + (f"?{parts.query}" if parts.query else ""))
+
+
+def _strip_amp_path(path: str) -> str:
+    # /some-story-123/amp, /story.amp, /story.amp.html. Only a final segment after
+    # an article-like slug (with a digit or hyphen): /amp/story or /reviews/amp
+    # can be pages of their own, and merging them would serve one page for the other.
+    parent, _, last = path.rstrip("/").rpartition("/")
+    if last.lower() == "amp" and re.search(r"[\d-]", parent.rpartition("/")[2]):
+        return parent
+    for suffix in (".amp.html", ".amp.htm"):
+        if path.lower().endswith(suffix):
+            return path[: -len(suffix)] + ".html"
+    if path.lower().endswith(".amp"):
+        return path[: -len(".amp")]
+    return path
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalise a URL so trivially different links to the same page compare equal:
+    lower-case scheme and host, drop default ports, fragments and tracking
+    parameters, sort the remaining query and strip a trailing slash.
+
+    AMP and mobile copies map to the main article too: AMP cache URLs are
+    unwrapped, www./m./mobile./amp. subdomains, a trailing /amp after an
+    article slug, .amp suffixes and ?amp=1 / ?outputType=amp are removed,
+    and http/https compare equal. The result is a lookup key, not a URL to
+    fetch.
+    """
+    url = (url or "").strip()
+    if "://" not in url:
+        url = "http://" + url
+    parts = _unwrap_amp_cache(urllib.parse.urlsplit(url))
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    for prefix in MIRROR_SUBDOMAINS:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix):]
+            break
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    if scheme == "https":
+        scheme = "http"
+
+    query = [
+        (k, v) for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+        and v.lower() not in AMP_PARAMS.get(k.lower(), ())
+    ]
+    query.sort()
+
+    path = _strip_amp_path(parts.path or "/")
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/")
+
+    return urllib.parse.urlunsplit((scheme, host, path, urllib.parse.urlencode(query), ""))
+
+
+def text_fingerprint(text: str) -> str:
+    """Stable hash of whitespace-normalised text, used as a cache key."""
+    normalized = " ".join((text or "").split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
@@ -0,0 +1,227 @@
+# backend/utils/vector_store.py
+"""
+Vector stores for the agents' retrieval steps.
+
+Every store speaks the subset of Chroma's Collection API the agents use:
+
+    add(ids, embeddings, documents=None, metadatas=None)
+    query(query_embeddings, n_results=10, where=None, include=...)
+        -> {"ids": [[...]], "distances": [[...]], "documents": [[...]], "metadatas": [[...]]}
+    get(ids=None, where=None, include=...) -> {"ids": [...], "documents": [...], "metadatas": [...]}
+    count()
+    delete(ids=None, where=None)
+
+so open_store() can hand out either backend:
+  - "memory": InMemoryVectorStore, unit-normalized float32 rows in a numpy
+    matrix with exact dot-product top-k. For per-job stores of a few thousand
+    chunks it avoids Chroma's SQLite writes, HNSW build and directory cleanup.
+  - "chroma": a persistent Chroma collection, for large stores kept across runs.
+
+Distances follow Chroma's conventions for the collection's space: "l2" (the
+default, squared euclidean), "cosine" and "ip" are 1 - similarity, so
+thresholds tuned on Chroma keep their meaning. `where` filters support
+equality, $eq, $ne, $gt, $gte, $lt, $lte, $in, $nin, $and and $or.
+
+Unlike Chroma, the memory store does not embed documents itself: callers pass
+embeddings.
+"""
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger("vector-store")
+
+BACKENDS = ("memory", "chroma")
+DEFAULT_INCLUDE = ("metadatas", "documents", "distances")
+
+_COMPARISONS = {
+    "$eq": lambda a, b: a == b,
+    "$ne": lambda a, b: a != b,
+    "$gt": lambda a, b: a is not None and a > b,
+    "$gte": lambda a, b: a is not None and a >= b,
+    "$lt": lambda a, b: a is not None and a < b,
+    "$lte": lambda a, b: a is not None and a <= b,
+    "$in": lambda a, b: a in b,
+    "$nin": lambda a, b: a not in b,
+}
+
+
+def matches(metadata: Optional[Dict[str, Any]], where: Optional[Dict[str, Any]]) -> bool:
+    """True if `metadata` satisfies a Chroma-style `where` filter."""
+    if not where:
+        return True
+    metadata = metadata or {}
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for op, operand in condition.items():
+                if op not in _COMPARISONS:
+                    raise ValueError(f"Unsupported where operator: {op}")
+                if not _COMPARISONS[op](value, operand):
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+class InMemoryVectorStore:
+    """Exact-search store held in process memory; Chroma Collection-compatible."""
+
+    def __init__(self, name: str = "default", space: str = "l2", initial_capacity: int = 256):
+        if space not in ("l2", "cosine", "ip"):
+            raise ValueError(f"Unknown space: {space}")
+        self.name = name
+        self.space = space
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None
+        self._initial_capacity = initial_capacity
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._documents: List[Optional[str]] = []
+        self._metadatas: List[Optional[Dict[str, Any]]] = []
+
+    def count(self) -> int:
+        return len(self._ids)
+
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+    def _reserve(self, rows: int, dim: int):
+        # Called with the lock held
+        if self._matrix is None:
+            self._matrix = np.empty((max(self._initial_capacity, rows), dim), dtype=np.float32)
+        elif self._matrix.shape[1] != dim:
+            raise ValueError(f"Embedding dimension {dim} does not match the store's {self._matrix.shape[1]}")
+        elif len(self._ids) + rows > len(self._matrix):
+            grown = np.empty((max(2 * len(self._matrix), len(self._ids) + rows), dim), dtype=np.float32)
+            grown[:len(self._ids)] = self._matrix[:len(self._ids)]
+            self._matrix = grown
+
+    def add(self, ids: Sequence[str], embeddings, documents: Optional[Sequence[str]] = None,
+            metadatas: Optional[Sequence[Dict[str, Any]]] = None, **_):
+        """Add records; ids already present are skipped, as Chroma does."""
+        if embeddings is None:
+            raise ValueError("InMemoryVectorStore needs embeddings; it does not embed documents itself")
+        ids = list(ids)
+        vectors = self._normalize(embeddings)
+        if len(vectors) != len(ids):
+            raise ValueError(f"Got {len(vectors)} embeddings for {len(ids)} ids")
+        documents = list(documents) if documents is not None else [None] * len(ids)
+        metadatas = list(metadatas) if metadatas is not None else [None] * len(ids)
+        with self._lock:
+            seen = set()
+            new = [i for i, record_id in enumerate(ids)
+                   if record_id not in self._rows and not (record_id in seen or seen.add(record_id))]
+            if len(new) < len(ids):
+                logger.debug(f"{self.name}: skipped {len(ids) - len(new)} existing ids")
+            if not new:
+                return
+            self._reserve(len(new), vectors.shape[1])
+            start = len(self._ids)
+            self._matrix[start:start + len(new)] = vectors[new]
+            for offset, i in enumerate(new):
+                self._rows[ids[i]] = start + offset
+                self._ids.append(ids[i])
+                self._documents.append(documents[i])
+                self._metadatas.append(metadatas[i])
+
+    def _distances(self, similarities: np.ndarray) -> np.ndarray:
+        if self.space == "l2":
+            return np.maximum(2.0 - 2.0 * similarities, 0.0)
+        return 1.0 - similarities
+
+    def _filtered_rows(self, where) -> Optional[np.ndarray]:
+        # Called with the lock held; None means every row
+        if not where:
+            return None
+        return np.array([row for row, metadata in enumerate(self._metadatas) if matches(metadata, where)],
+                        dtype=np.int64)
+
+    def query(self, query_embeddings, n_results: int = 10, where: Optional[Dict[str, Any]] = None,
+              include: Sequence[str] = DEFAULT_INCLUDE, **_) -> Dict[str, List[List[Any]]]:
+        """Exact top-`n_results` per query embedding, nearest first."""
+        queries = self._normalize(query_embeddings)
+        result = {"ids": []}
+        for field in include:
+            result[field] = []
+        with self._lock:
+            rows = self._filtered_rows(where)
+            count = len(self._ids) if rows is None else len(rows)
+            if count:
+                matrix = self._matrix[:len(self._ids)] if rows is None else self._matrix[rows]
+                similarities = queries @ matrix.T
+            k = min(n_results, count)
+            for q in range(len(queries)):
+                if not k:
+                    top = np.empty(0, dtype=np.int64)
+                elif k < count:
+                    top = np.argpartition(-similarities[q], k - 1)[:k]
+                    top = top[np.argsort(-similarities[q][top], kind="stable")]
+                else:
+                    top = np.argsort(-similarities[q], kind="stable")
+                hits = top if rows is None else rows[top]
+                result["ids"].append([self._ids[r] for r in hits])
+                if "distances" in result:
+                    result["distances"].append(self._distances(similarities[q][top]).tolist() if k else [])
+                if "documents" in result:
+                    result["documents"].append([self._documents[r] for r in hits])
+                if "metadatas" in result:
+                    result["metadatas"].append([self._metadatas[r] for r in hits])
+                if "embeddings" in result:
+                    result["embeddings"].append(self._matrix[hits].tolist())
+        return result
+
+    def get(self, ids: Optional[Sequence[str]] = None, where: Optional[Dict[str, Any]] = None,
+            include: Sequence[str] = ("metadatas", "documents"), **_) -> Dict[str, List[Any]]:
+        """Records by id and/or filter, in insertion order (all of them when neither is given)."""
+        with self._lock:
+            if ids is not None:
+                rows = [self._rows[i] for i in ids if i in self._rows]
+            else:
+                rows = range(len(self._ids))
+            rows = [r for r in rows if matches(self._metadatas[r], where)]
+            result = {"ids": [self._ids[r] for r in rows]}
+            if "documents" in include:
+                result["documents"] = [self._documents[r] for r in rows]
+            if "metadatas" in include:
+                result["metadatas"] = [self._metadatas[r] for r in rows]
+            if "embeddings" in include:
+                result["embeddings"] = [self._matrix[r].tolist() for r in rows]
+        return result
+
+    def delete(self, ids: Optional[Sequence[str]] = None, where: Optional[Dict[str, Any]] = None, **_):
+        with self._lock:
+            drop = set(self._rows[i] for i in ids if i in self._rows) if ids is not None else set(range(len(self._ids)))
+            if where:
+                drop = {r for r in drop if matches(self._metadatas[r], where)}
+            if not drop:
+                return
+            keep = [r for r in range(len(self._ids)) if r not in drop]
+            if self._matrix is not None:
+                self._matrix[:len(keep)] = self._matrix[keep]
+            self._ids = [self._ids[r] for r in keep]
+            self._documents = [self._documents[r] for r in keep]
+            self._metadatas = [self._metadatas[r] for r in keep]
+            self._rows = {record_id: row for row, record_id in enumerate(self._ids)}
+
+
+def open_store(name: str, backend: str = "memory", path: Optional[str] = None, space: str = "l2"):
+    """A store named `name`: in memory, or a persistent Chroma collection under `path`."""
+    if backend == "memory":
+        return InMemoryVectorStore(name, space=space)
+    if backend == "chroma":
+        import chromadb
+        client = chromadb.PersistentClient(path=path)
+        # Chroma defaults to l2; only pass the space when it differs so existing collections open unchanged
+        return client.get_or_create_collection(name=name, metadata=None if space == "l2" else {"hnsw:space": space})
+    raise ValueError(f"Unknown vector store backend {backend!r}; expected one of {', '.join(BACKENDS)}")